@@ -10,24 +10,37 @@ from app.schemas.behavioral_prep import (
 from app.utils.behavioral_prep import (
     generate_behavioral_questions,
     generate_behavioral_feedback,
+    stream_behavioral_feedback,
+    normalize_behavioral_feedback,
 )
+from app.core.sse import stream_generation
 from app.utils.speech_to_text import transcribe_audio
 router = APIRouter()
 
 @router.post("/behavioral-prep/questions", response_model=BehavioralQuestionsResponse)
 async def get_behavioral_questions(req: BehavioralQuestionsRequest):
-    questions = generate_behavioral_questions(
+    questions = await generate_behavioral_questions(
         req.target_role, req.seniority, req.company, req.num_questions, req.difficulty
     )
     return BehavioralQuestionsResponse(questions=questions)
 
 @router.post("/behavioral-prep/feedback", response_model=BehavioralFeedbackResponse)
 async def get_behavioral_feedback(req: BehavioralFeedbackRequest):
-    feedback = generate_behavioral_feedback(
+    feedback = await generate_behavioral_feedback(
         req.target_role, req.seniority, req.company, req.question, req.answer, req.difficulty, req.pause_analysis
     )
     return BehavioralFeedbackResponse(feedback=feedback)
 
+@router.post("/behavioral-prep/feedback/stream")
+async def stream_behavioral_feedback_endpoint(req: BehavioralFeedbackRequest):
+    deltas = stream_behavioral_feedback(
+        req.target_role, req.seniority, req.company, req.question, req.answer, req.difficulty, req.pause_analysis
+    )
+    return stream_generation(
+        deltas,
+        lambda text: BehavioralFeedbackResponse(feedback=normalize_behavioral_feedback(text))
+    )
+
 @router.post("/behavioral-prep/transcribe")
 async def transcribe_audio_endpoint(audio: UploadFile = File(...)):    
     # Create a temporary file with proper cross-platform path
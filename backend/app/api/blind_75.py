@@ -1,13 +1,18 @@
-import random
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.http_cache import cached_json_response
+from app.core.problem_index import problem_bank, problem_index
 from app.schemas.blind_75_problem import (
     Problem,
-    Line,
+    ProblemBankResponse,
     WrongSubmission,
+    RunRequest,
+    TestRunResult,
+    ComplexityEstimate,
 )
+from app.crud.problem_test_case import estimate_problem_complexity, run_problem_tests
 from app.models.blind75_problem import Blind75Problem         
 from app.models.user import User
 
@@ -21,34 +26,70 @@ def get_db():
 
 router = APIRouter(prefix="/blind75", tags=["Blind75"])
 
+def _pick_problem(db: Session, difficulty: str, problem_type: str, user_id: int, no_repeat: bool):
+    if no_repeat:
+        problem_id = problem_index.next_unseen_id(user_id, difficulty, problem_type, db=db)
+    else:
+        problem_id = problem_index.random_id(difficulty, problem_type, db=db)
+    return problem_id and problem_bank.problem_body(problem_id, db)
+
 @router.get("/random", response_model=Problem)
-def get_random_problem(difficulty: str = None, db: Session = Depends(get_db)):
-    query = db.query(Blind75Problem)
-    
-    if difficulty and difficulty.lower() != "all":
-        query = query.filter(Blind75Problem.difficulty.ilike(f"%{difficulty}%"))
-    
-    count = query.count()
-    if count == 0:
+def get_random_problem(
+    difficulty: str = None,
+    problem_type: str = None,
+    user_id: int = None,
+    no_repeat: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Pick a random problem. With no_repeat, a user sees every matching problem once before any repeats."""
+    if no_repeat and user_id is None:
+        raise HTTPException(status_code=400, detail="user_id is required for no_repeat")
+
+    entry = _pick_problem(db, difficulty, problem_type, user_id, no_repeat)
+    if entry is None and problem_index.ids(difficulty, problem_type, db=db):
+        # The index and the snapshot were loaded at different times and disagree; reload both
+        problem_index.load(db)
+        problem_bank.load(db)
+        entry = _pick_problem(db, difficulty, problem_type, user_id, no_repeat)
+    if entry is None:
         raise HTTPException(
             status_code=500,
             detail="Problem bank not initialised or no problems found for the specified difficulty.",
         )
 
-    row = (
-        query
-        .offset(random.randint(0, count - 1))
-        .limit(1)
-        .one()
+    body, _ = entry
+    return Response(content=body, media_type="application/json")
+
+@router.get("/problems", response_model=ProblemBankResponse)
+def list_problems(request: Request, db: Session = Depends(get_db)):
+    """The whole problem bank, served from a pre-serialized snapshot. The ETag is the bank version."""
+    body, etag = problem_bank.list_body(db)
+    return cached_json_response(
+        request, body, etag, settings.BLIND75_CACHE_MAX_AGE, {"X-Problem-Bank-Version": problem_bank.version}
     )
 
-    return Problem(
-        title=row.title,
-        type=row.problem_type,
-        difficulty=row.difficulty,
-        space=row.space_complexity,
-        time=row.time_complexity,
-        prompt=row.prompt,
-        solution=[Line(**line) for line in row.solution],
+@router.get("/problems/{problem_id}", response_model=Problem)
+def get_problem(problem_id: str, request: Request, db: Session = Depends(get_db)):
+    entry = problem_bank.problem_body(problem_id, db)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Problem not found")
+    body, etag = entry
+    return cached_json_response(
+        request, body, etag, settings.BLIND75_CACHE_MAX_AGE, {"X-Problem-Bank-Version": problem_bank.version}
     )
 
+@router.post("/{problem_id}/run", response_model=TestRunResult)
+async def run_problem_test_cases(problem_id: str, req: RunRequest, db: Session = Depends(get_db)):
+    """Run a Python solution against the problem's stored test cases in the sandbox."""
+    result = await run_problem_tests(db, problem_id, req.code)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No test cases found for this problem")
+    return result
+
+@router.post("/{problem_id}/complexity", response_model=ComplexityEstimate)
+async def estimate_solution_complexity(problem_id: str, req: RunRequest, db: Session = Depends(get_db)):
+    """Time a Python solution on growing generated inputs and fit its time complexity."""
+    result = await estimate_problem_complexity(db, problem_id, req.code)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No test cases with a supported input shape for this problem")
+    return result
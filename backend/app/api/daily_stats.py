@@ -7,7 +7,8 @@ from app.crud.daily_stats import (
     get_daily_stats_by_user,
     update_daily_stat,
     get_or_create_daily_stat,
-    calculate_current_streak,
+    get_stored_streak,
+    ensure_user_streak,
     _refresh_streak
 )
 from app.crud.user import get_user
@@ -106,8 +107,7 @@ def get_today_stats(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
     
     today = date.today()
-    db_stat = get_or_create_daily_stat(db, user_id, today)
-    return _refresh_streak(db, user_id, today)
+    return get_or_create_daily_stat(db, user_id, today)
 
 @router.get("/daily-practice/{user_id}/streak")
 def get_current_streak(user_id: int, db: Session = Depends(get_db)):
@@ -116,24 +116,15 @@ def get_current_streak(user_id: int, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    current_streak = calculate_current_streak(db, user_id)
+    current_streak = get_stored_streak(db, user_id)
     return {"user_id": user_id, "current_streak": current_streak}
 
 @router.get("/daily-practice/{user_id}/history", response_model=List[DailyStatResponse])
 def get_practice_history(user_id: int, limit: int = 30, db: Session = Depends(get_db)):
     """Get practice history for a user (last 30 days by default)"""
-    stats = get_daily_stats_by_user(db, user_id, limit)
-    
-    updated_stats = []
-    for stat in stats:
-        current_streak = calculate_current_streak(db, user_id, stat.date)
-        if stat.streak != current_streak:
-            stat.streak = current_streak
-            db.commit()
-            db.refresh(stat)
-        updated_stats.append(stat)
-    
-    return updated_stats
+    # Stored streaks are kept current on every write, so history is a plain read
+    ensure_user_streak(db, user_id)
+    return get_daily_stats_by_user(db, user_id, limit)
 
 @router.get("/daily-practice/{user_id}/{stat_date}", response_model=DailyStatResponse)
 def get_stats_by_date(user_id: int, stat_date: date, db: Session = Depends(get_db)):
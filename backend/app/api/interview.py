@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
@@ -7,20 +9,25 @@ from app.schemas.interview import (
     LeetCodeQuestion,
     UserAnswer,
     AnswerFeedback,
+    BatchEvaluationRequest,
+    BatchEvaluationResponse,
+    AnswerEvaluationResult,
     HintRequest,
     HintResponse,
     ExplanationRequest,
     ExplanationResponse
 )
+from app.core.config import settings
+from app.core.jobs import enqueue, job_handler
+from app.crud.job import set_job_progress
+from app.crud.question_pool import add_pool_questions, pool_size, refill_question_pool, take_unseen_questions
+from app.crud.problem_test_case import estimate_loaded_complexity, load_problem_tests, run_loaded_tests, summarize_complexity, summarize_test_run
 from app.crud.questionnaire import get_questionnaire
-from app.utils.technical_interview import generate_leetcode_questions, evaluate_answer,generate_explanation, generate_single_hint
-import os
-from google import genai
+from app.utils.technical_interview import generate_leetcode_questions, evaluate_answer, request_answer_evaluation, generate_explanation, generate_single_hint
 
+MAX_BATCH_ANSWERS = 20
 
 router = APIRouter()
-genai.api_key = os.getenv('GEMINI_API_KEY')
-client = genai.Client(api_key=genai.api_key)
 
 def get_db():
     db = SessionLocal()
@@ -30,7 +37,7 @@ def get_db():
         db.close()
 
 @router.post("/interview/technical/generate", response_model=TechnicalInterviewResponse)
-def generate_technical_interview(
+async def generate_technical_interview(
     request: TechnicalInterviewRequest,
     db: Session = Depends(get_db)
 ):
@@ -41,13 +48,35 @@ def generate_technical_interview(
         if not questionnaire:
             raise HTTPException(status_code=404, detail="Questionnaire not found")
         
-        # Generate questions using Gemini
-        questions = generate_leetcode_questions(
-            user_profile=questionnaire,
-            target_company=request.target_company,
-            difficulty=request.difficulty,
-            num_questions=request.num_questions
+        # Serve from the pre-generated pool, skipping questions this user has already seen
+        questions = take_unseen_questions(
+            db, request.user_id, request.target_company, request.difficulty, request.num_questions, request.category
         )
+
+        # Generate the shortfall with Gemini and keep it for other users
+        missing = request.num_questions - len(questions)
+        if missing > 0:
+            generated = await generate_leetcode_questions(
+                user_profile=questionnaire,
+                target_company=request.target_company,
+                difficulty=request.difficulty,
+                num_questions=missing,
+                category=request.category
+            )
+            # The hardcoded fallback set is never pooled
+            if not any(str(q["id"] if isinstance(q, dict) else q.id).startswith("fallback_") for q in generated):
+                generated = add_pool_questions(
+                    db, request.target_company, request.difficulty, generated, request.user_id, request.category
+                )
+            questions += generated
+
+        # Top the bucket back up in the background
+        if pool_size(db, request.target_company, request.difficulty, request.category) < settings.QUESTION_POOL_WATERMARK:
+            enqueue(db, "question_pool_refill", {
+                "company": request.target_company.strip().lower(),
+                "difficulty": request.difficulty.value,
+                "category": request.category.strip().lower() if request.category else None
+            })
         
         return TechnicalInterviewResponse(
             questions=questions,
@@ -56,36 +85,123 @@ def generate_technical_interview(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
 
+@job_handler("question_pool_refill")
+async def run_question_pool_refill_job(db: Session, job):
+    added = await refill_question_pool(
+        db, job.payload["company"], job.payload["difficulty"], job.payload["category"],
+        on_progress=lambda text: set_job_progress(db, job, text)
+    )
+    return {"added": added}
+
+def build_answer_feedback(question_id: str, feedback: dict, test_run: dict = None, estimate: dict = None) -> AnswerFeedback:
+    return AnswerFeedback(
+        question_id=question_id,
+        feedback=feedback["feedback"],
+        score=feedback["score"],
+        suggestions=feedback["suggestions"],
+        time_complexity=feedback["time_complexity"],
+        space_complexity=feedback["space_complexity"],
+        tests_passed=test_run["passed"] if test_run else None,
+        tests_total=test_run["total"] if test_run else None,
+        measured_time_complexity=estimate["complexity"] if estimate else None,
+        complexity_confidence=estimate["confidence"] if estimate else None
+    )
+
+def _load_tests(db: Session, question_id: str):
+    try:
+        return load_problem_tests(db, question_id)
+    except Exception as e:
+        db.rollback()
+        logging.error(f"Failed to load test cases for {question_id}: {e}")
+        return None
+
+async def _run_stored_tests(tests: dict, answer: UserAnswer):
+    """Execute the answer against the question's test cases from _load_tests, if any.
+
+    Returns (test run, complexity estimate, summary for the grading prompt);
+    the complexity is only measured when the answer asks for it and every
+    test passes, since it runs the solution dozens more times.
+    """
+    if tests is None:
+        return None, None, None
+    try:
+        test_run = await run_loaded_tests(tests, answer.user_answer)
+        summary = summarize_test_run(test_run)
+        estimate = None
+        if answer.measure_complexity and test_run["total"] and test_run["passed"] == test_run["total"]:
+            estimate = await estimate_loaded_complexity(tests, answer.user_answer)
+            if estimate and estimate["complexity"]:
+                summary = f"{summary}; {summarize_complexity(estimate)}"
+            else:
+                estimate = None
+        return test_run, estimate, summary
+    except Exception as e:
+        logging.error(f"Failed to run test cases for {answer.question_id}: {e}")
+        return None, None, None
+
 @router.post("/interview/technical/evaluate", response_model=AnswerFeedback)
-def evaluate_technical_answer(answer: UserAnswer):
+async def evaluate_technical_answer(answer: UserAnswer, db: Session = Depends(get_db)):
     """Evaluate user's answer to a LeetCode question"""
     try:
-        feedback = evaluate_answer(
+        test_run, estimate, test_summary = await _run_stored_tests(_load_tests(db, answer.question_id), answer)
+        feedback = await evaluate_answer(
             question=answer.question,
             user_answer=answer.user_answer,
             target_company=answer.target_company,
-            difficulty=answer.difficulty
+            difficulty=answer.difficulty,
+            test_summary=test_summary
         )
         
-        return AnswerFeedback(
-            question_id=answer.question_id,
-            feedback=feedback["feedback"],
-            score=feedback["score"],
-            suggestions=feedback["suggestions"],
-            time_complexity=feedback["time_complexity"],
-            space_complexity=feedback["space_complexity"]
-        )
+        return build_answer_feedback(answer.question_id, feedback, test_run, estimate)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to evaluate answer: {str(e)}") 
+
+async def _evaluate_batch_item(answer: UserAnswer, tests: dict) -> AnswerEvaluationResult:
+    # Each answer is graded on its own so one failure only affects its own result
+    try:
+        test_run, estimate, test_summary = await _run_stored_tests(tests, answer)
+        feedback = await request_answer_evaluation(
+            question=answer.question,
+            user_answer=answer.user_answer,
+            target_company=answer.target_company,
+            difficulty=answer.difficulty,
+            test_summary=test_summary
+        )
+        return AnswerEvaluationResult(question_id=answer.question_id, feedback=build_answer_feedback(answer.question_id, feedback, test_run, estimate))
+    except Exception as e:
+        logging.error(f"Failed to evaluate answer {answer.question_id}: {e}")
+        return AnswerEvaluationResult(question_id=answer.question_id, error=f"Failed to evaluate answer: {str(e)}")
+
+@router.post("/interview/technical/evaluate/batch", response_model=BatchEvaluationResponse)
+async def evaluate_technical_answers(request: BatchEvaluationRequest, db: Session = Depends(get_db)):
+    """Evaluate every answer from an interview session concurrently"""
+    if len(request.answers) > MAX_BATCH_ANSWERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_ANSWERS} answers can be evaluated at once")
+
+    # Read from the session one question at a time up front; only the sandbox and LLM calls run concurrently
+    tests = {}
+    for answer in request.answers:
+        if answer.question_id not in tests:
+            tests[answer.question_id] = _load_tests(db, answer.question_id)
+    results = await asyncio.gather(*(_evaluate_batch_item(answer, tests[answer.question_id]) for answer in request.answers))
+
+    scores = [result.feedback.score for result in results if result.feedback]
+    return BatchEvaluationResponse(
+        session_id=request.session_id,
+        results=results,
+        average_score=round(sum(scores) / len(scores), 2) if scores else None,
+        evaluated=len(scores),
+        failed=len(results) - len(scores)
+    )
     
 @router.post("/interview/technical/hint", response_model=HintResponse)
-def get_technical_hint(req: HintRequest):
+async def get_technical_hint(req: HintRequest):
     """
     Return ONE constructive hint for the user's current attempt.
     No full solution is revealed.
     """
     try:
-        hint_obj = generate_single_hint(
+        hint_obj = await generate_single_hint(
             question       = req.question,
             user_answer    = req.user_answer,
             target_company = req.target_company,
@@ -99,7 +215,7 @@ def get_technical_hint(req: HintRequest):
         )
 
 @router.post("/interview/technical/explanation", response_model=ExplanationResponse)
-def get_technical_explanation(req: ExplanationRequest):
+async def get_technical_explanation(req: ExplanationRequest):
     """
     Return ONE concise explanation (≤ 80 words) of why the specified
     answer / code is correct. Never reveals the full solution.
@@ -109,7 +225,7 @@ def get_technical_explanation(req: ExplanationRequest):
             raise ValueError("correct_answer must be provided")
         answer = req.correct_answer
 
-        exp_obj = generate_explanation(
+        exp_obj = await generate_explanation(
             question       = req.question,
             correct_answer = answer,
             answer_type    = req.answer_type,
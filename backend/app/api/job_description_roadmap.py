@@ -8,12 +8,18 @@ from app.schemas.job_description_roadmap import (
 )
 from app.crud.job_description_roadmap import (
     create_job_description_roadmap,
+    stream_job_description_roadmap_for,
+    save_job_description_roadmap,
     get_job_description_roadmaps_by_user,
     get_job_description_roadmap,
     update_job_description_roadmap_title,
     delete_job_description_roadmap
 )
 from app.core.database import SessionLocal
+from app.core.sse import stream_generation
+from app.core.jobs import enqueue, job_handler
+from app.schemas.job import JobResponse
+from app.utils.get_job_description_roadmap import parse_job_description_roadmap
 
 router = APIRouter()
 
@@ -25,8 +31,25 @@ def get_db():
         db.close()
 
 @router.post("/roadmap/jobdesc/generate", response_model=JobDescriptionRoadmapOut)
-def create_job_description_roadmap_endpoint(data: JobDescriptionRoadmapCreate, db: Session = Depends(get_db)):
-    return create_job_description_roadmap(db, data)
+async def create_job_description_roadmap_endpoint(data: JobDescriptionRoadmapCreate, db: Session = Depends(get_db)):
+    return await create_job_description_roadmap(db, data)
+
+@job_handler("job_description_roadmap")
+async def run_job_description_roadmap_job(db: Session, job):
+    roadmap = await create_job_description_roadmap(db, JobDescriptionRoadmapCreate(**job.payload))
+    return JobDescriptionRoadmapOut.from_orm(roadmap)
+
+@router.post("/roadmap/jobdesc/generate/jobs", response_model=JobResponse, status_code=202)
+def enqueue_job_description_roadmap(data: JobDescriptionRoadmapCreate, db: Session = Depends(get_db)):
+    return enqueue(db, "job_description_roadmap", data.dict(), user_id=data.user_id)
+
+@router.post("/roadmap/jobdesc/generate/stream")
+async def stream_job_description_roadmap_endpoint(data: JobDescriptionRoadmapCreate, db: Session = Depends(get_db)):
+    def finalize(text):
+        roadmap = save_job_description_roadmap(db, data, parse_job_description_roadmap(text))
+        return JobDescriptionRoadmapOut.from_orm(roadmap)
+
+    return stream_generation(stream_job_description_roadmap_for(db, data), finalize, on_close=db.close)
 
 @router.get("/roadmap/jobdesc/{user_id}", response_model=List[JobDescriptionRoadmapOut])
 def list_job_description_roadmaps_endpoint(user_id: int, db: Session = Depends(get_db)):
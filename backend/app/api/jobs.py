@@ -0,0 +1,42 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.responses import FileResponse
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.crud.job import get_job
+from app.schemas.job import JobResponse
+
+router = APIRouter()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_job_or_404(job_id: str, db: Session):
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job_status(job_id: str, db: Session = Depends(get_db)):
+    return get_job_or_404(job_id, db)
+
+@router.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str, db: Session = Depends(get_db)):
+    job = get_job_or_404(job_id, db)
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is still {job.status}")
+
+    # File-producing jobs return the path of the file they wrote
+    result = job.result or {}
+    if isinstance(result, dict) and result.get("file_path"):
+        if not os.path.exists(result["file_path"]):
+            raise HTTPException(status_code=410, detail="Job result file is no longer available")
+        return FileResponse(result["file_path"], filename=result.get("file_name"))
+    return result
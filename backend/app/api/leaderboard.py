@@ -1,12 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
-from app.crud.daily_stats import calculate_current_streak
+from app.crud.daily_stats import calculate_streaks_bulk
 from app.crud.user import get_user
 from app.models.user import User
 from app.models.daily_stats import DailyStat
-from typing import List
-from sqlalchemy import func, desc
+from app.models.friendship import Friendship
+from app.models.user_streak import UserStreak
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import func, desc, or_, select
 
 router = APIRouter()
 
@@ -18,26 +21,65 @@ def get_db():
         db.close()
 
 @router.get("/leaderboards/streaks", response_model=List[dict])
-def get_leaderboard_by_streaks(limit: int = 10, db: Session = Depends(get_db)):
-    """Get top users by current streaks"""
-    # Get all users with their current streaks
-    users_with_streaks = []
-    
-    users = db.query(User).all()
-    for user in users:
-        current_streak = calculate_current_streak(db, user.id)
-        if current_streak > 0:  # Only include users with active streaks
-            users_with_streaks.append({
-                "user_id": user.id,
-                "username": user.username,
-                "avatar": user.avatar,
-                "career_goal": user.career_goal,
-                "streak": current_streak
-            })
-    
-    # Sort by streak (descending) and limit results
-    users_with_streaks.sort(key=lambda x: x["streak"], reverse=True)
-    return users_with_streaks[:limit]
+def get_leaderboard_by_streaks(
+    limit: int = 10,
+    career_goal: Optional[str] = None,
+    friends_of: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Get top users by current streaks, optionally among one career goal or a user's friends"""
+    # Streaks are materialized in user_streaks on every DailyStat write
+    query = db.query(
+        User.id,
+        User.username,
+        User.avatar,
+        User.career_goal,
+        UserStreak.current_streak
+    ).join(UserStreak, User.id == UserStreak.user_id)\
+     .filter(UserStreak.current_streak > 0)  # Only include users with active streaks
+
+    if career_goal:
+        query = query.filter(User.career_goal == career_goal)
+
+    if friends_of is not None:
+        following = select(Friendship.following_id).where(Friendship.follower_id == friends_of)
+        query = query.filter(or_(User.id == friends_of, User.id.in_(following)))
+
+    top_users = query.order_by(desc(UserStreak.current_streak), User.id)\
+        .limit(limit)\
+        .all()
+
+    return [
+        {
+            "user_id": user.id,
+            "username": user.username,
+            "avatar": user.avatar,
+            "career_goal": user.career_goal,
+            "streak": user.current_streak
+        }
+        for user in top_users
+    ]
+
+@router.get("/leaderboards/streaks/export", response_model=List[dict])
+def export_streaks(target_date: Optional[date] = None, career_goal: Optional[str] = None, db: Session = Depends(get_db)):
+    """Export every user's streak as of a given date (defaults to today)"""
+    query = db.query(User.id, User.username, User.career_goal)
+    if career_goal:
+        query = query.filter(User.career_goal == career_goal)
+
+    # One set-based statement for all users instead of a streak query per user
+    streaks = calculate_streaks_bulk(db, target_date=target_date)
+    rows = [
+        {
+            "user_id": user.id,
+            "username": user.username,
+            "career_goal": user.career_goal,
+            "streak": streaks.get(user.id, 0)
+        }
+        for user in query.all()
+    ]
+    rows.sort(key=lambda row: row["streak"], reverse=True)
+    return rows
 
 @router.get("/leaderboards/points", response_model=List[dict])
 def get_leaderboard_by_points(limit: int = 10, db: Session = Depends(get_db)):
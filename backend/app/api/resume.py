@@ -3,25 +3,35 @@ from starlette.responses import FileResponse
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.schemas.resume import ResumeImproveResponse, ResumeFeedbackResponse, ResumeCreate, ResumeResponse, ResumeTailorRequest, ResumeTailorResponse
-from app.crud.resume import upsert_resume, get_resume
-from app.core.prompts import improve_resume_prompt, feedback_resume_prompt, parse_resume_prompt, tailor_resume_prompt
+from app.crud.resume import upsert_resume, get_resume, save_extracted_text, load_resume_file
+from app.crud.job import set_job_progress
+from app.core.prompts import improve_resume_prompt, feedback_resume_prompt, feedback_resume_json_prompt, parse_resume_prompt, tailor_resume_prompt
 from app.utils.save_resume import save_text_as_pdf, save_text_as_docx
-from app.utils.resume_parser import parse_feedback_response
+from app.utils.resume_parser import parse_feedback_response, format_feedback_items
+from pydantic import ValidationError
 from PyPDF2 import PdfReader
-import os
+import asyncio
 import tempfile
+import hashlib
+import io
 import json
-from google import genai
-from google.genai import types
+from app.core.config import settings
+from app.core.llm import generate_text, stream_text
+from app.core.sse import stream_generation
+from app.core.jobs import enqueue, job_handler
+from app.schemas.job import JobResponse
+import os
 
 # Constants
 MAX_TEXT_LENGTH = 30000
 DEFAULT_TEMPERATURE = 0.3
 MAX_TOKENS = 8000
 GEMINI_MODEL = "gemini-2.5-flash"
-
-genai.api_key = os.getenv('GEMINI_API_KEY')
-client = genai.Client(api_key=genai.api_key)
+RESUME_CACHE_TTL = 24 * 60 * 60
+PARSE_CACHE_TTL = 30 * 24 * 60 * 60
+UPLOAD_CHUNK_SIZE = 64 * 1024
+PDF_MAGIC = b"%PDF-"
+FEEDBACK_JSON_SCHEMA = ResumeFeedbackResponse.model_json_schema()
 
 router = APIRouter()
 
@@ -32,29 +42,60 @@ def get_db():
     finally:
         db.close()
 
-def extract_text_from_pdf_file(file: UploadFile) -> str:
-    """Extract text from uploaded PDF file."""
-    reader = PdfReader(file.file)
-    text = ""
-    for page in reader.pages:
-        text += (page.extract_text() or "") + "\n"
-    return text
+async def read_pdf_upload(file: UploadFile) -> tuple:
+    """Read an upload in chunks, rejecting non-PDFs and files over RESUME_MAX_UPLOAD_BYTES. Returns (bytes, sha256).
 
-def extract_text_from_stored_pdf(file_data: bytes) -> str:
-    """Extract text from stored PDF data."""
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(file_data)
-        tmp.flush()
-        tmp_path = tmp.name
+    By now the request body has already been spooled; BodyLimitMiddleware is
+    what bounds that. This cap only limits what is parsed and stored.
+    """
+    max_bytes = settings.RESUME_MAX_UPLOAD_BYTES
+    data = bytearray()
+    digest = hashlib.sha256()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if not data and not chunk.startswith(PDF_MAGIC):
+            raise HTTPException(status_code=415, detail="Resume must be a PDF file.")
+        if len(data) + len(chunk) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Resume exceeds the {max_bytes // (1024 * 1024)} MB upload limit.")
+        data.extend(chunk)
+        digest.update(chunk)
+    if not data:
+        raise HTTPException(status_code=400, detail="Uploaded resume is empty.")
+    return bytes(data), digest.hexdigest()
+
+def extract_text_from_pdf_bytes(file_data: bytes, max_pages: int = None) -> str:
+    """Extract text from PDF bytes in memory, page by page, up to `max_pages` pages."""
+    if max_pages is None:
+        max_pages = settings.RESUME_MAX_PAGES
     try:
-        reader = PdfReader(tmp_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text
-    except Exception as e:
+        reader = PdfReader(io.BytesIO(file_data))
+        pages = []
+        for index, page in enumerate(reader.pages):
+            if index >= max_pages:
+                break
+            pages.append((page.extract_text() or "") + "\n")
+        return "".join(pages)
+    except Exception:
         raise HTTPException(status_code=400, detail="Resume file is corrupted or not a valid PDF. Please re-upload.")
 
+async def extract_resume_text(file_data: bytes) -> str:
+    # PDF parsing is CPU-bound, so keep it off the event loop
+    return await asyncio.to_thread(extract_text_from_pdf_bytes, file_data)
+
+def hash_resume_file(file_data: bytes) -> str:
+    return hashlib.sha256(file_data).hexdigest()
+
+async def get_resume_text(db: Session, db_obj) -> str:
+    """Return the text extracted at upload, extracting it once for resumes stored before it was cached."""
+    if db_obj.extracted_text is not None and db_obj.content_hash:
+        return db_obj.extracted_text
+    file_data = load_resume_file(db_obj)
+    text = await extract_resume_text(file_data)
+    save_extracted_text(db, db_obj, text, hash_resume_file(file_data))
+    return text
+
 def get_resume_or_404(user_id: int, db: Session):
     """Get resume from database or raise 404 if not found."""
     db_obj = get_resume(db, user_id)
@@ -62,18 +103,27 @@ def get_resume_or_404(user_id: int, db: Session):
         raise HTTPException(status_code=404, detail="Resume not found")
     return db_obj
 
-def call_gemini_api(prompt: str, temperature: float = DEFAULT_TEMPERATURE, max_tokens: int = None) -> str:
+async def call_gemini_api(prompt: str, temperature: float = DEFAULT_TEMPERATURE, max_tokens: int = None,
+                          cache_ttl: float = RESUME_CACHE_TTL) -> str:
     """Call Gemini API with consistent configuration."""
-    config = types.GenerateContentConfig(temperature=temperature)
-    if max_tokens:
-        config.max_output_tokens = max_tokens
-    
-    response = client.models.generate_content(
-        model=GEMINI_MODEL,
-        config=config,
-        contents=prompt
+    return await generate_text(
+        GEMINI_MODEL,
+        prompt,
+        cache_ttl=cache_ttl,
+        temperature=temperature,
+        max_output_tokens=max_tokens
+    )
+
+def stream_gemini_api(prompt: str, temperature: float = DEFAULT_TEMPERATURE, max_tokens: int = None,
+                      cache_ttl: float = RESUME_CACHE_TTL):
+    """Streaming counterpart of call_gemini_api; shares its cache entries."""
+    return stream_text(
+        GEMINI_MODEL,
+        prompt,
+        cache_ttl=cache_ttl,
+        temperature=temperature,
+        max_output_tokens=max_tokens
     )
-    return response.text
 
 def parse_json_response(response_text: str, error_message: str = "Failed to parse response") -> dict:
     """Parse JSON response from Gemini with fallback cleaning."""
@@ -100,23 +150,32 @@ async def upload_and_parse_resume(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    # Extract text from PDF
-    text = extract_text_from_pdf_file(file)
-    file.file.seek(0)  # Reset pointer so the full file is saved
-    
-    # Parse with Gemini
-    prompt = parse_resume_prompt(text)
-    response_text = call_gemini_api(prompt, temperature=0.0)
-    
-    parsed_data = parse_json_response(response_text, "Failed to parse resume")
+    file_data, content_hash = await read_pdf_upload(file)
+
+    # Re-uploading the same file reuses the stored text and parse
+    existing = get_resume(db, user_id)
+    if existing and existing.content_hash == content_hash and existing.extracted_text is not None:
+        text = existing.extracted_text
+        parsed_data = existing.parsed_data
+    else:
+        # Extract text from PDF
+        text = await extract_resume_text(file_data)
+
+        # Parse with Gemini
+        prompt = parse_resume_prompt(text)
+        response_text = await call_gemini_api(prompt, temperature=0.0, cache_ttl=PARSE_CACHE_TTL)
+
+        parsed_data = parse_json_response(response_text, "Failed to parse resume")
     
     # Store in DB
     db_obj = upsert_resume(
         db=db,
         user_id=user_id,
         file_name=file.filename,
-        file_data=await file.read(),
-        parsed_data=parsed_data
+        file_data=file_data,
+        parsed_data=parsed_data,
+        extracted_text=text,
+        content_hash=content_hash
     )
     return db_obj
 
@@ -128,72 +187,141 @@ async def get_my_resume(user_id: int, db: Session = Depends(get_db)):
 async def improve_resume(user_id: int, db: Session = Depends(get_db)):
     db_obj = get_resume_or_404(user_id, db)
     
-    text = extract_text_from_stored_pdf(db_obj.file_data)
+    text = await get_resume_text(db, db_obj)
     prompt = improve_resume_prompt(text)
-    response_text = call_gemini_api(prompt)
+    response_text = await call_gemini_api(prompt)
     
     return {"improved_resume": response_text}
 
+@router.get("/resume/improve/stream")
+async def stream_improve_resume(user_id: int, db: Session = Depends(get_db)):
+    db_obj = get_resume_or_404(user_id, db)
+
+    text = await get_resume_text(db, db_obj)
+    prompt = improve_resume_prompt(text)
+
+    return stream_generation(
+        stream_gemini_api(prompt),
+        lambda response_text: ResumeImproveResponse(improved_resume=response_text)
+    )
+
 @router.get("/resume/feedback", response_model=ResumeFeedbackResponse)
 async def feedback_resume(user_id: int, db: Session = Depends(get_db)):
     db_obj = get_resume_or_404(user_id, db)
     
-    text = extract_text_from_stored_pdf(db_obj.file_data)
+    text = await get_resume_text(db, db_obj)
     
     # Truncate text if too long
     if len(text) > MAX_TEXT_LENGTH:
         text = text[:MAX_TEXT_LENGTH]
     
+    if settings.RESUME_FEEDBACK_JSON_MODE:
+        return await structured_feedback_resume(text)
+
     prompt = feedback_resume_prompt(text)
-    response_text = call_gemini_api(prompt, max_tokens=MAX_TOKENS)
+    response_text = await call_gemini_api(prompt, max_tokens=MAX_TOKENS)
     
     # Parse the feedback to extract structured data using centralized parser
     structured_feedback = parse_feedback_response(response_text)
     
-    # Add debugging info
-    print(f"Raw feedback length: {len(response_text)}")
-    print(f"Structured feedback items: {len(structured_feedback)}")
-    print(f"First few lines of raw feedback: {response_text[:500]}")
-    
-    # Debug: Print the structured feedback items
-    for i, item in enumerate(structured_feedback):
-        print(f"Item {i}: {item}")
-    
     return {
         "feedback": response_text or "",
         "structured_feedback": structured_feedback
     }
 
+async def structured_feedback_resume(text: str) -> ResumeFeedbackResponse:
+    """Feedback generated as JSON under the ResumeFeedbackResponse schema, so every item is complete."""
+    response_text = await generate_text(
+        GEMINI_MODEL,
+        feedback_resume_json_prompt(text),
+        cache_ttl=RESUME_CACHE_TTL,
+        temperature=DEFAULT_TEMPERATURE,
+        max_output_tokens=MAX_TOKENS,
+        response_mime_type="application/json",
+        response_json_schema=FEEDBACK_JSON_SCHEMA
+    )
+    try:
+        result = ResumeFeedbackResponse.model_validate_json(response_text or "")
+    except ValidationError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse resume feedback: {e.errors()[0]['msg']}")
+    if not result.feedback.strip():
+        # Clients show the text when there are no items, so it is never left empty
+        result.feedback = format_feedback_items(result.structured_feedback)
+    return result
+
 @router.post("/resume/tailor", response_model=ResumeTailorResponse)
 async def tailor_resume(request: ResumeTailorRequest, db: Session = Depends(get_db)):
     db_obj = get_resume_or_404(request.user_id, db)
     
-    text = extract_text_from_stored_pdf(db_obj.file_data)
+    text = await get_resume_text(db, db_obj)
     prompt = tailor_resume_prompt(text, request.job_description)
-    response_text = call_gemini_api(prompt, temperature=0.2)
+    response_text = await call_gemini_api(prompt, temperature=0.2)
     
     parsed_data = parse_json_response(response_text, "Failed to parse tailored resume")
     
     return {"tailored_resume": json.dumps(parsed_data)}
 
-@router.get("/resume/export")
-async def export_resume(user_id: int, format: str = "pdf", db: Session = Depends(get_db)):
+@router.post("/resume/tailor/stream")
+async def stream_tailor_resume(request: ResumeTailorRequest, db: Session = Depends(get_db)):
+    db_obj = get_resume_or_404(request.user_id, db)
+
+    text = await get_resume_text(db, db_obj)
+    prompt = tailor_resume_prompt(text, request.job_description)
+
+    def finalize(response_text):
+        parsed_data = parse_json_response(response_text, "Failed to parse tailored resume")
+        return ResumeTailorResponse(tailored_resume=json.dumps(parsed_data))
+
+    return stream_generation(stream_gemini_api(prompt, temperature=0.2), finalize)
+
+EXPORT_FORMATS = ("pdf", "docx")
+
+async def improve_and_save(db: Session, user_id: int, format: str, output_path: str, on_progress=None):
+    """Improve the stored resume with Gemini and write it to `output_path` as pdf or docx.
+
+    `on_progress(text)` is called as each step starts.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format")
     db_obj = get_resume_or_404(user_id, db)
-    
+    report = on_progress or (lambda text: None)
+
     # Extract text and improve it
-    text = extract_text_from_stored_pdf(db_obj.file_data)
-    improved_text = call_gemini_api(improve_resume_prompt(text))
-    
+    report("extracting text")
+    text = await get_resume_text(db, db_obj)
+    report("improving resume")
+    improved_text = await call_gemini_api(improve_resume_prompt(text))
+
     # Export to requested format
+    report(f"writing {format}")
+    if format == "pdf":
+        save_text_as_pdf(improved_text, output_path)
+    else:
+        save_text_as_docx(improved_text, output_path)
+
+@router.get("/resume/export")
+async def export_resume(user_id: int, format: str = "pdf", db: Session = Depends(get_db)):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format")
     with tempfile.NamedTemporaryFile(delete=False, suffix=f".{format}") as out_tmp:
-        if format == "pdf":
-            save_text_as_pdf(improved_text, out_tmp.name)
-        elif format == "docx":
-            save_text_as_docx(improved_text, out_tmp.name)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid format")
+        await improve_and_save(db, user_id, format, out_tmp.name)
         return FileResponse(out_tmp.name, filename=f"improved_resume.{format}")
 
+@job_handler("resume_export")
+async def run_resume_export_job(db: Session, job):
+    format = job.payload["format"]
+    os.makedirs(settings.JOB_RESULT_DIR, exist_ok=True)
+    output_path = os.path.join(settings.JOB_RESULT_DIR, f"{job.id}.{format}")
+    await improve_and_save(db, job.payload["user_id"], format, output_path, on_progress=lambda text: set_job_progress(db, job, text))
+    return {"file_path": output_path, "file_name": f"improved_resume.{format}"}
+
+@router.post("/resume/export/jobs", response_model=JobResponse, status_code=202)
+def enqueue_resume_export(user_id: int, format: str = "pdf", db: Session = Depends(get_db)):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format")
+    get_resume_or_404(user_id, db)
+    return enqueue(db, "resume_export", {"user_id": user_id, "format": format}, user_id=user_id)
+
 @router.post("/resume/export-tailored")
 async def export_tailored_resume(user_id: int = Form(...), format: str = Form("pdf"), tailored_resume: str = Form(...), db: Session = Depends(get_db)):
     # Parse the tailored resume JSON
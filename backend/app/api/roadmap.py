@@ -2,9 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.schemas.roadmap import RoadmapResponse, RoadmapError
-from app.crud.roadmap import upsert_roadmap, get_roadmap
+from app.crud.roadmap import (
+    find_memoized_roadmap,
+    get_or_generate_roadmap,
+    get_roadmap,
+    questionnaire_fingerprint,
+    roadmap_profile,
+    store_roadmap,
+)
 from app.crud.questionnaire import get_questionnaire
-from app.utils.get_roadmap import get_roadmap as genai_get_roadmap
+from app.utils.get_roadmap import stream_roadmap, parse_roadmap
+from app.core.sse import stream_generation
+from app.core.jobs import enqueue, job_handler
+from app.schemas.job import JobResponse
 import json
 
 router = APIRouter()
@@ -17,17 +27,48 @@ def get_db():
         db.close()
 
 @router.post("/roadmap/{user_id}", response_model=RoadmapResponse, responses={404: {"model": RoadmapError}})
-def generate_and_store_roadmap(user_id: int, db: Session = Depends(get_db)):
+async def generate_and_store_roadmap(user_id: int, force: bool = False, db: Session = Depends(get_db)):
+    """Generate the user's roadmap. Unless `force` is set, an unchanged questionnaire reuses the stored roadmap."""
     questionnaire = get_questionnaire(db, user_id)
     if not questionnaire:
         raise HTTPException(status_code=404, detail="Questionnaire not found")
-    # Convert questionnaire ORM to dict
-    questionnaire_dict = {c.name: getattr(questionnaire, c.name) for c in questionnaire.__table__.columns}
-    # Generate roadmap text from GenAI
-    roadmap_json = genai_get_roadmap(questionnaire_dict)
-    db_obj = upsert_roadmap(db, user_id, roadmap_json)
+    db_obj = await get_or_generate_roadmap(db, questionnaire, force=force)
     return RoadmapResponse(roadmap_json=db_obj.roadmap_json)
 
+@job_handler("roadmap")
+async def run_roadmap_job(db: Session, job):
+    return await generate_and_store_roadmap(job.payload["user_id"], force=job.payload.get("force", False), db=db)
+
+@router.post("/roadmap/{user_id}/jobs", response_model=JobResponse, status_code=202, responses={404: {"model": RoadmapError}})
+def enqueue_roadmap(user_id: int, force: bool = False, db: Session = Depends(get_db)):
+    if not get_questionnaire(db, user_id):
+        raise HTTPException(status_code=404, detail="Questionnaire not found")
+    payload = {"user_id": user_id, "force": True} if force else {"user_id": user_id}
+    return enqueue(db, "roadmap", payload, user_id=user_id)
+
+async def _no_deltas():
+    return
+    yield
+
+@router.post("/roadmap/{user_id}/stream", responses={404: {"model": RoadmapError}})
+async def stream_and_store_roadmap(user_id: int, force: bool = False, db: Session = Depends(get_db)):
+    questionnaire = get_questionnaire(db, user_id)
+    if not questionnaire:
+        raise HTTPException(status_code=404, detail="Questionnaire not found")
+    fingerprint = questionnaire_fingerprint(questionnaire)
+
+    memoized = None if force else find_memoized_roadmap(db, user_id, fingerprint)
+    if memoized:
+        # Nothing to generate: the stream is just the done event
+        roadmap_json = memoized.roadmap_json
+        return stream_generation(_no_deltas(), lambda _: RoadmapResponse(roadmap_json=roadmap_json), on_close=db.close)
+
+    def finalize(text):
+        db_obj = store_roadmap(db, user_id, parse_roadmap(text), fingerprint)
+        return RoadmapResponse(roadmap_json=db_obj.roadmap_json)
+
+    return stream_generation(stream_roadmap(roadmap_profile(questionnaire)), finalize, on_close=db.close)
+
 @router.get("/roadmap/{user_id}", response_model=RoadmapResponse, responses={404: {"model": RoadmapError}})
 def get_roadmap_endpoint(user_id: int, db: Session = Depends(get_db)):
     db_obj = get_roadmap(db, user_id)
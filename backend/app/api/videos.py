@@ -33,25 +33,26 @@ def get_videos_endpoint(
         raise HTTPException(status_code=400, detail=f"Duration must be one of: {valid_durations}")
     
     # Call CRUD function
-    videos = get_videos_by_query(query, duration, language, num_videos)
+    videos = get_videos_by_query(db, query, duration, language, num_videos)
     
     return VideoResponse(videos=videos)
 
 @router.get("/videos/roadmap/{user_id}", response_model=RoadmapVideoResponse)
-def get_roadmap_videos_endpoint(
-    user_id: str,
+async def get_roadmap_videos_endpoint(
+    user_id: int,
     db: Session = Depends(get_db)
 ):
     """
     Get videos based on user's roadmap
     
-    Returns relevant videos based on the user's career roadmap and questionnaire responses.
+    Returns videos for every search term indexed from the user's stored career roadmap,
+    merged across terms and grouped by roadmap phase.
     """
-    videos, search_terms, selected_term, error_message = get_roadmap_videos(db, user_id)
+    videos, search_terms, selected_term, phases, error_message = await get_roadmap_videos(db, user_id)
     
     if error_message:
-        if error_message == "Questionnaire not found":
-            raise HTTPException(status_code=404, detail="Questionnaire not found")
+        if error_message == "Roadmap not found":
+            raise HTTPException(status_code=404, detail="Roadmap not found")
         return RoadmapVideoResponse(
             videos=[],
             search_terms=[],
@@ -62,5 +63,6 @@ def get_roadmap_videos_endpoint(
     return RoadmapVideoResponse(
         videos=videos,
         search_terms=search_terms,
-        selected_term=selected_term
+        selected_term=selected_term,
+        phases=phases
     ) 
\ No newline at end of file
@@ -0,0 +1,61 @@
+import os
+import tempfile
+from app.core.config import settings
+
+DATABASE_BACKEND = "database"
+
+class BlobStore:
+    """Content-addressed byte storage. Keys are sha256 hex digests of the stored bytes."""
+    name = None
+
+    def put(self, key: str, data: bytes):
+        raise NotImplementedError
+
+    def get(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+class LocalBlobStore(BlobStore):
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+def get_blob_store(name: str = None):
+    """Return the blob store called `name` (the configured one by default), or None for the database column."""
+    name = name or settings.RESUME_BLOB_BACKEND
+    if name == LocalBlobStore.name:
+        return LocalBlobStore(settings.RESUME_BLOB_DIR)
+    if name == DATABASE_BACKEND:
+        return None
+    raise ValueError(f"Unknown blob storage backend: {name}")
@@ -0,0 +1,46 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+class BodyLimitMiddleware:
+    """Reject request bodies over `max_bytes` before the app reads (or spools) them.
+
+    A Content-Length over the limit is answered with 413 without reading
+    anything; a chunked body is counted as it arrives and aborted with 413
+    once it crosses the limit.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large(self):
+        return f"Request body exceeds the {self.max_bytes // (1024 * 1024)} MB limit."
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = None
+            if declared is None or declared > self.max_bytes:
+                status = 400 if declared is None else 413
+                detail = "Invalid Content-Length header." if declared is None else self._too_large()
+                return await JSONResponse({"detail": detail}, status_code=status)(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Surfaces through the body parser and the app's exception handling as a 413
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
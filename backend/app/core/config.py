@@ -10,4 +10,72 @@ GOOGLE_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL")
 
-settings = Settings()
\ No newline at end of file
+    # Shared Gemini gateway (app/core/llm.py)
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+    LLM_MAX_CONCURRENCY_PER_MODEL: int = int(os.getenv("LLM_MAX_CONCURRENCY_PER_MODEL", "16"))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BASE_SECONDS: float = float(os.getenv("LLM_RETRY_BASE_SECONDS", "1"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    LLM_CACHE_PERSISTENT: bool = os.getenv("LLM_CACHE_PERSISTENT", "false").lower() == "true"
+
+    # Largest request body accepted at all (app/core/body_limit.py); leaves room for the multipart framing around a resume
+    MAX_REQUEST_BODY_BYTES: int = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(6 * 1024 * 1024)))
+
+    # Resume uploads (app/api/resume.py)
+    RESUME_MAX_UPLOAD_BYTES: int = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+    RESUME_MAX_PAGES: int = int(os.getenv("RESUME_MAX_PAGES", "10"))
+    RESUME_BLOB_BACKEND: str = os.getenv("RESUME_BLOB_BACKEND", "database")  # "database" or "local"
+    RESUME_BLOB_DIR: str = os.getenv("RESUME_BLOB_DIR", "resume_blobs")
+    RESUME_FEEDBACK_JSON_MODE: bool = os.getenv("RESUME_FEEDBACK_JSON_MODE", "true").lower() == "true"  # false: scrape free text
+
+    # Background jobs (app/core/jobs.py)
+    JOB_WORKER_CONCURRENCY: int = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+    JOB_WORKERS_IN_PROCESS: bool = os.getenv("JOB_WORKERS_IN_PROCESS", "true").lower() == "true"
+    JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", "2"))
+    JOB_RESULT_DIR: str = os.getenv("JOB_RESULT_DIR", "job_results")
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))  # running jobs with an older heartbeat are requeued
+    JOB_HEARTBEAT_SECONDS: float = float(os.getenv("JOB_HEARTBEAT_SECONDS", "60"))
+    JOB_RETENTION_HOURS: int = int(os.getenv("JOB_RETENTION_HOURS", "72"))  # finished jobs and their result files
+
+    # Technical interview question pool (app/crud/question_pool.py)
+    QUESTION_POOL_WATERMARK: int = int(os.getenv("QUESTION_POOL_WATERMARK", "30"))
+    QUESTION_POOL_BATCH_SIZE: int = int(os.getenv("QUESTION_POOL_BATCH_SIZE", "10"))
+
+    # Roadmaps shared between users with the same normalized questionnaire
+    ROADMAP_SHARED_CACHE_DAYS: int = int(os.getenv("ROADMAP_SHARED_CACHE_DAYS", "7"))
+
+    # Sandboxed test-case runner (app/utils/code_runner.py)
+    SANDBOX_MAX_WORKERS: int = int(os.getenv("SANDBOX_MAX_WORKERS", "4"))
+    SANDBOX_TIMEOUT_SECONDS: float = float(os.getenv("SANDBOX_TIMEOUT_SECONDS", "10"))
+    SANDBOX_CPU_SECONDS: int = int(os.getenv("SANDBOX_CPU_SECONDS", "5"))
+    SANDBOX_MEMORY_MB: int = int(os.getenv("SANDBOX_MEMORY_MB", "256"))
+    SANDBOX_MAX_PROCESSES: int = int(os.getenv("SANDBOX_MAX_PROCESSES", "32"))  # RLIMIT_NPROC, shared by every run as SANDBOX_UID
+    SANDBOX_ISOLATION: bool = os.getenv("SANDBOX_ISOLATION", "true").lower() == "true"  # false only for local development
+    SANDBOX_UID: int = int(os.getenv("SANDBOX_UID", "65534"))  # unprivileged user submissions run as
+    SANDBOX_GID: int = int(os.getenv("SANDBOX_GID", "65534"))
+
+    # In-memory Blind 75 index (app/core/problem_index.py)
+    BLIND75_INDEX_REFRESH_SECONDS: float = float(os.getenv("BLIND75_INDEX_REFRESH_SECONDS", "300"))
+    BLIND75_VERSION_CHECK_SECONDS: float = float(os.getenv("BLIND75_VERSION_CHECK_SECONDS", "5"))  # how often to look for imports by other processes
+    BLIND75_MAX_SHUFFLES: int = int(os.getenv("BLIND75_MAX_SHUFFLES", "10000"))  # per-user no-repeat decks kept
+    BLIND75_CACHE_MAX_AGE: int = int(os.getenv("BLIND75_CACHE_MAX_AGE", "300"))  # Cache-Control max-age for the bank API
+
+    # YouTube search client (app/core/youtube.py)
+    YOUTUBE_API_KEY: str = os.getenv("YOUTUBE_API_KEY")
+    YOUTUBE_API_BASE_URL: str = os.getenv("YOUTUBE_API_BASE_URL", "https://www.googleapis.com/youtube/v3")
+    YOUTUBE_TIMEOUT_SECONDS: float = float(os.getenv("YOUTUBE_TIMEOUT_SECONDS", "10"))
+    YOUTUBE_POOL_SIZE: int = int(os.getenv("YOUTUBE_POOL_SIZE", "10"))
+    YOUTUBE_CACHE_TTL_SECONDS: float = float(os.getenv("YOUTUBE_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+    YOUTUBE_CACHE_MAX_ENTRIES: int = int(os.getenv("YOUTUBE_CACHE_MAX_ENTRIES", "2048"))
+    YOUTUBE_DAILY_QUOTA: int = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))  # units; a search costs 100
+
+    # Roadmap video playlists (app/crud/videos.py)
+    VIDEO_SEARCH_CONCURRENCY: int = int(os.getenv("VIDEO_SEARCH_CONCURRENCY", "5"))  # searches in flight per request
+    ROADMAP_VIDEOS_PER_TERM: int = int(os.getenv("ROADMAP_VIDEOS_PER_TERM", "5"))
+
+    # Local catalog of past search results (app/crud/video_catalog.py)
+    VIDEO_CATALOG_ENABLED: bool = os.getenv("VIDEO_CATALOG_ENABLED", "true").lower() == "true"
+    VIDEO_CATALOG_MAX_AGE_DAYS: int = int(os.getenv("VIDEO_CATALOG_MAX_AGE_DAYS", "30"))  # older entries are not served
+
+settings = Settings()
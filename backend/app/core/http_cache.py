@@ -0,0 +1,18 @@
+from fastapi import Request, Response
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match covers `etag` (weak comparison, as for GET)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in header.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+def cached_json_response(request: Request, body: bytes, etag: str, max_age: int, headers: dict = None) -> Response:
+    """Serve pre-serialized JSON with validators, answering 304 when the client's copy is current."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}", **(headers or {})}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.crud.job import claim_next_job, create_or_get_job, finish_job, purge_finished_jobs, requeue_stale_jobs, touch_job
+from app.crud.llm_cache_entry import purge_expired_cache_entries
+
+_handlers = {}
+_worker = None
+
+def job_handler(kind: str):
+    """Register `async def handler(db, job)` to run jobs of `kind`. Its return value becomes the job result."""
+    def register(func):
+        _handlers[kind] = func
+        return func
+    return register
+
+def enqueue(db, kind: str, payload: dict, user_id: int = None):
+    """Queue a job (de-duplicated against identical in-flight jobs) and wake the local worker."""
+    if kind not in _handlers:
+        raise ValueError(f"No handler registered for job kind: {kind}")
+    job = create_or_get_job(db, kind, payload, user_id)
+    if _worker:
+        _worker.notify()
+    return job
+
+class JobWorker:
+    """Drains the jobs table with a fixed number of concurrent tasks.
+
+    A running job holds a lease that its worker renews every heartbeat; a
+    maintenance task requeues jobs whose lease expired and deletes finished
+    jobs past their retention, along with expired LLM cache entries.
+    """
+
+    def __init__(self, concurrency: int = None, session_factory=SessionLocal, poll_seconds: float = None,
+                 heartbeat_seconds: float = None):
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.session_factory = session_factory
+        self.poll_seconds = settings.JOB_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.heartbeat_seconds = settings.JOB_HEARTBEAT_SECONDS if heartbeat_seconds is None else heartbeat_seconds
+        self._tasks = []
+        self._loop = None
+        self._wakeup = None
+
+    def _claim(self):
+        db = self.session_factory()
+        try:
+            job = claim_next_job(db)
+            if job:
+                db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _finish(self, job_id, result=None, error=None):
+        db = self.session_factory()
+        try:
+            finish_job(db, job_id, result=result, error=error)
+        finally:
+            db.close()
+
+    def _touch(self, job_id):
+        db = self.session_factory()
+        try:
+            return touch_job(db, job_id)
+        finally:
+            db.close()
+
+    async def _heartbeat(self, job_id):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            if not await asyncio.to_thread(self._touch, job_id):
+                logging.warning(f"Job {job_id} lost its lease while running")
+
+    def _maintain_once(self):
+        db = self.session_factory()
+        try:
+            requeued = requeue_stale_jobs(db)
+            if requeued:
+                logging.warning(f"Requeued {requeued} jobs whose worker stopped renewing their lease")
+            purge_finished_jobs(db)
+            purge_expired_cache_entries(db)
+        finally:
+            db.close()
+
+    async def _maintain(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._maintain_once)
+            except Exception:
+                logging.exception("Job queue maintenance failed")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def run_next(self) -> bool:
+        """Run one queued job. Returns False when the queue is empty."""
+        job = await asyncio.to_thread(self._claim)
+        if job is None:
+            return False
+        job_id, kind = job.id, job.kind
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        db = self.session_factory()
+        try:
+            db.add(job)
+            result = await _handlers[kind](db, job)
+            await asyncio.to_thread(self._finish, job_id, jsonable_encoder(result))
+        except HTTPException as e:
+            await asyncio.to_thread(self._finish, job_id, error=str(e.detail))
+        except Exception as e:
+            logging.exception(f"Job {job_id} ({kind}) failed")
+            await asyncio.to_thread(self._finish, job_id, error=str(e) or e.__class__.__name__)
+        finally:
+            heartbeat.cancel()
+            db.close()
+        return True
+
+    async def drain(self):
+        while await self.run_next():
+            pass
+
+    async def _run(self):
+        while True:
+            if await self.run_next():
+                continue
+            # Wait for a local enqueue, or poll for jobs queued by other processes
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def notify(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._maintain()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+async def start_worker():
+    global _worker
+    _worker = JobWorker()
+    _worker.start()
+    return _worker
+
+async def stop_worker():
+    global _worker
+    if _worker:
+        await _worker.stop()
+        _worker = None
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+import random
+import weakref
+import httpx
+from dotenv import load_dotenv
+from google import genai
+from google.genai import errors, types
+from app.core import llm_cache
+from app.core.config import settings
+
+load_dotenv()
+
+RETRYABLE_STATUS_CODES = {429, 503}
+
+_client = None
+# Semaphores belong to the event loop that created them, so keep one set per loop
+_limits = weakref.WeakKeyDictionary()
+
+def get_client() -> genai.Client:
+    """Return the process-wide Gemini client, whose HTTP connection pool is reused by every call."""
+    global _client
+    if _client is None:
+        pool = httpx.Limits(
+            max_connections=settings.LLM_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.LLM_MAX_CONCURRENCY
+        )
+        _client = genai.Client(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            http_options=types.HttpOptions(
+                timeout=int(settings.LLM_TIMEOUT_SECONDS * 1000),
+                client_args={"limits": pool},
+                async_client_args={"limits": pool}
+            )
+        )
+    return _client
+
+def _semaphores(model: str):
+    loop = asyncio.get_running_loop()
+    limits = _limits.get(loop)
+    if limits is None:
+        limits = _limits[loop] = (asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY), {})
+    global_limit, model_limits = limits
+    if model not in model_limits:
+        model_limits[model] = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY_PER_MODEL)
+    return global_limit, model_limits[model]
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, settings.LLM_RETRY_BASE_SECONDS * (2 ** attempt))
+
+def build_config(system_instruction=None, temperature=None, max_output_tokens=None, **kwargs) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        system_instruction=system_instruction,
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        **kwargs
+    )
+
+async def generate_content(model: str, contents, config: types.GenerateContentConfig = None,
+                           timeout: float = None, cache_ttl: float = None):
+    """Run one Gemini generation without blocking the event loop.
+
+    With `cache_ttl` (seconds) an identical earlier request is answered from
+    the response cache; leave it unset for calls that are meant to vary.
+    """
+    if cache_ttl is None:
+        llm_cache.record_bypass()
+        return await _generate_uncached(model, contents, config, timeout)
+
+    key = llm_cache.cache_key(model, contents, config)
+    cached = await llm_cache.lookup(key)
+    if cached is not None:
+        return cached
+    response = await _generate_uncached(model, contents, config, timeout)
+    if response.text:
+        await llm_cache.store(key, model, response, cache_ttl)
+    return response
+
+def _should_retry(error: errors.APIError, attempt: int) -> bool:
+    return error.code in RETRYABLE_STATUS_CODES and attempt < settings.LLM_MAX_RETRIES
+
+async def _generate_uncached(model: str, contents, config: types.GenerateContentConfig, timeout: float):
+    # Calls wait for a per-model slot and then a global slot, are cut off after
+    # `timeout` seconds, and are retried with jittered backoff on 429 and 503
+    if timeout is None:
+        timeout = settings.LLM_TIMEOUT_SECONDS
+    global_limit, model_limit = _semaphores(model)
+
+    attempt = 0
+    while True:
+        try:
+            async with model_limit, global_limit:
+                return await asyncio.wait_for(
+                    get_client().aio.models.generate_content(model=model, contents=contents, config=config),
+                    timeout
+                )
+        except errors.APIError as e:
+            if not _should_retry(e, attempt):
+                raise
+            delay = _backoff_delay(attempt)
+            logging.warning(f"Gemini returned {e.code} for {model}, retrying in {delay:.2f}s")
+        attempt += 1
+        await asyncio.sleep(delay)
+
+async def generate_text(model: str, contents, timeout: float = None, cache_ttl: float = None, **config) -> str:
+    """Generate and return only the response text. Keyword arguments build the GenerateContentConfig."""
+    response = await generate_content(model, contents, build_config(**config), timeout=timeout, cache_ttl=cache_ttl)
+    return response.text
+
+async def stream_text(model: str, contents, timeout: float = None, cache_ttl: float = None, **config):
+    """Yield response text as Gemini produces it, under the same limits as generate_content.
+
+    A cached response is replayed as a single chunk, and a completed stream is
+    cached under the same key as the equivalent non-streaming call. Retries
+    only happen before the first chunk has been yielded.
+    """
+    config = build_config(**config)
+    key = None
+    if cache_ttl is None:
+        llm_cache.record_bypass()
+    else:
+        key = llm_cache.cache_key(model, contents, config)
+        cached = await llm_cache.lookup(key)
+        if cached is not None:
+            if cached.text:
+                yield cached.text
+            return
+
+    if timeout is None:
+        timeout = settings.LLM_TIMEOUT_SECONDS
+    global_limit, model_limit = _semaphores(model)
+    loop = asyncio.get_running_loop()
+    parts = []
+    usage = None
+
+    attempt = 0
+    while True:
+        try:
+            async with model_limit, global_limit:
+                deadline = loop.time() + timeout
+                stream = await get_client().aio.models.generate_content_stream(
+                    model=model, contents=contents, config=config
+                )
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    usage = chunk.usage_metadata or usage
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        yield chunk.text
+            break
+        except errors.APIError as e:
+            if parts or not _should_retry(e, attempt):
+                raise
+            delay = _backoff_delay(attempt)
+            logging.warning(f"Gemini returned {e.code} for {model}, retrying in {delay:.2f}s")
+        attempt += 1
+        await asyncio.sleep(delay)
+
+    if key and parts:
+        response = types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text="".join(parts))]))],
+            usage_metadata=usage
+        )
+        await llm_cache.store(key, model, response, cache_ttl)
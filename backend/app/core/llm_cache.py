@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from google.genai import types
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.llm_cache_entry import LLMCacheEntry
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after their own TTL."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+_memory = TTLCache(settings.LLM_CACHE_MAX_ENTRIES)
+_stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "bypassed": 0, "tokens_saved": 0}
+_stats_lock = threading.Lock()
+
+def _record(counter: str, tokens: int = 0):
+    with _stats_lock:
+        _stats[counter] += 1
+        _stats["tokens_saved"] += tokens
+
+def record_bypass():
+    _record("bypassed")
+
+def stats() -> dict:
+    """Hit/miss counters and the tokens the cache has saved since startup."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    lookups = snapshot["memory_hits"] + snapshot["persistent_hits"] + snapshot["misses"]
+    hits = snapshot["memory_hits"] + snapshot["persistent_hits"]
+    snapshot["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+    snapshot["entries"] = len(_memory)
+    snapshot["persistent"] = settings.LLM_CACHE_PERSISTENT
+    return snapshot
+
+def cache_key(model: str, contents, config: types.GenerateContentConfig = None) -> str:
+    """Hash of (model, system_instruction, prompt, temperature, max_tokens) plus any other config."""
+    options = config.model_dump(mode="json", exclude_none=True) if config else {}
+    payload = {
+        "model": model,
+        "system_instruction": options.pop("system_instruction", None),
+        "prompt": contents,
+        "temperature": options.pop("temperature", None),
+        "max_tokens": options.pop("max_output_tokens", None),
+        "config": options,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+def _token_count(response) -> int:
+    usage = getattr(response, "usage_metadata", None)
+    return (usage.total_token_count or 0) if usage else 0
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back without their timezone
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def _load_persistent(key: str):
+    db = SessionLocal()
+    try:
+        row = db.get(LLMCacheEntry, key)
+        if row is None:
+            return None
+        expires_at = _utc(row.expires_at)
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining <= 0:
+            db.delete(row)
+            db.commit()
+            return None
+        return types.GenerateContentResponse.model_validate_json(row.response), row.token_count, remaining
+    finally:
+        db.close()
+
+def _save_persistent(key: str, model: str, response, token_count: int, ttl: float):
+    db = SessionLocal()
+    try:
+        db.merge(LLMCacheEntry(
+            key=key,
+            model=model,
+            response=response.model_dump_json(exclude_none=True),
+            token_count=token_count,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+async def lookup(key: str):
+    """Return a cached GenerateContentResponse, checking memory before the persistent tier."""
+    entry = _memory.get(key)
+    if entry is not None:
+        response, token_count = entry
+        _record("memory_hits", token_count)
+        return response
+
+    if settings.LLM_CACHE_PERSISTENT:
+        stored = await asyncio.to_thread(_load_persistent, key)
+        if stored is not None:
+            response, token_count, remaining = stored
+            _memory.set(key, (response, token_count), remaining)
+            _record("persistent_hits", token_count)
+            return response
+
+    _record("misses")
+    return None
+
+async def store(key: str, model: str, response, ttl: float):
+    token_count = _token_count(response)
+    _memory.set(key, (response, token_count), ttl)
+    if settings.LLM_CACHE_PERSISTENT:
+        await asyncio.to_thread(_save_persistent, key, model, response, token_count, ttl)
+
+def clear():
+    _memory.clear()
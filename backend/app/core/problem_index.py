@@ -0,0 +1,209 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.blind75_problem import Blind75Problem
+from app.models.problem_bank_version import ProblemBankVersion
+from app.schemas.blind_75_problem import Line, Problem
+
+def normalize(value) -> str:
+    value = (value or "").strip().lower()
+    return "" if value == "all" else value
+
+def current_bank_version(db: Session) -> int:
+    """Latest recorded import version, or 0 before the first import."""
+    return db.query(func.max(ProblemBankVersion.version)).scalar() or 0
+
+class _BankView:
+    """Base for in-memory views of the Blind 75 table.
+
+    A view reloads lazily after a commit touches the table, when another
+    process records a new bank version (checked at most every
+    BLIND75_VERSION_CHECK_SECONDS), and every BLIND75_INDEX_REFRESH_SECONDS.
+    """
+
+    def __init__(self, session_factory=SessionLocal, refresh_seconds: float = None, version_check_seconds: float = None):
+        self.session_factory = session_factory
+        self.refresh_seconds = settings.BLIND75_INDEX_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self.version_check_seconds = settings.BLIND75_VERSION_CHECK_SECONDS if version_check_seconds is None else version_check_seconds
+        self._loaded_at = None
+        self._checked_at = None
+        self._bank_version = None
+        self._lock = threading.Lock()
+
+    def _build(self, db: Session):
+        raise NotImplementedError
+
+    def load(self, db: Session = None):
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            bank_version = current_bank_version(db)
+            built = self._build(db)
+        finally:
+            if own_session:
+                db.close()
+        with self._lock:
+            self._bank_version = bank_version
+            self._loaded_at = self._checked_at = time.monotonic()
+        return built
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _is_stale(self, db: Session = None) -> bool:
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > self.refresh_seconds:
+            return True
+        if now - self._checked_at < self.version_check_seconds:
+            return False
+        self._checked_at = now
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            return current_bank_version(db) != self._bank_version
+        finally:
+            if own_session:
+                db.close()
+
+    def _ensure_loaded(self, db: Session = None):
+        if self._is_stale(db):
+            self.load(db)
+
+class ProblemIndex(_BankView):
+    """In-memory index of Blind 75 problem ids by normalized difficulty and type.
+
+    Picking a random problem is a list lookup plus one primary-key fetch.
+    """
+
+    def __init__(self, session_factory=SessionLocal, refresh_seconds: float = None, version_check_seconds: float = None, max_shuffles: int = None):
+        super().__init__(session_factory, refresh_seconds, version_check_seconds)
+        self.max_shuffles = settings.BLIND75_MAX_SHUFFLES if max_shuffles is None else max_shuffles
+        self._buckets = {}
+        self._generation = 0
+        self._shuffles = OrderedDict()
+
+    def _build(self, db: Session):
+        """One query over three columns."""
+        rows = db.query(Blind75Problem.id, Blind75Problem.difficulty, Blind75Problem.problem_type).order_by(Blind75Problem.id).all()
+        buckets = {}
+        for problem_id, difficulty, problem_type in rows:
+            difficulty, problem_type = normalize(difficulty), normalize(problem_type)
+            # Every row is reachable with or without each filter
+            for key in {("", ""), (difficulty, ""), ("", problem_type), (difficulty, problem_type)}:
+                buckets.setdefault(key, []).append(problem_id)
+        with self._lock:
+            self._buckets = buckets
+            self._generation += 1
+        return buckets
+
+    def ids(self, difficulty: str = None, problem_type: str = None, db: Session = None):
+        self._ensure_loaded(db)
+        return self._buckets.get((normalize(difficulty), normalize(problem_type)), [])
+
+    def random_id(self, difficulty: str = None, problem_type: str = None, db: Session = None):
+        ids = self.ids(difficulty, problem_type, db)
+        return random.choice(ids) if ids else None
+
+    def next_unseen_id(self, user_id: int, difficulty: str = None, problem_type: str = None, db: Session = None):
+        """Serve the user's bucket as a shuffled deck: no repeats until every problem has been served."""
+        ids = self.ids(difficulty, problem_type, db)
+        if not ids:
+            return None
+        key = (user_id, normalize(difficulty), normalize(problem_type))
+        with self._lock:
+            generation, known, deck = self._shuffles.pop(key, (None, frozenset(), []))
+            if generation != self._generation:
+                # The bank changed: drop removed problems and shuffle new ones into the rest of the deck
+                available = set(ids)
+                deck = [problem_id for problem_id in deck if problem_id in available]
+                deck += [problem_id for problem_id in ids if problem_id not in known]
+                random.shuffle(deck)
+                known = frozenset(ids)
+            if not deck:
+                deck = random.sample(ids, len(ids))
+            problem_id = deck.pop()
+            self._shuffles[key] = (self._generation, known, deck)
+            while len(self._shuffles) > self.max_shuffles:
+                self._shuffles.popitem(last=False)
+        return problem_id
+
+def to_problem(row: Blind75Problem) -> Problem:
+    return Problem(
+        id=row.id,
+        title=row.title,
+        type=row.problem_type,
+        difficulty=row.difficulty,
+        space=row.space_complexity,
+        time=row.time_complexity,
+        prompt=row.prompt,
+        solution=[Line(**line) for line in row.solution],
+    )
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+class ProblemBank(_BankView):
+    """Pre-serialized JSON snapshot of the whole Blind 75 bank.
+
+    The version is a hash of the serialized bank, so it changes whenever a
+    reseed changes any problem and doubles as the list ETag.
+    """
+
+    def __init__(self, session_factory=SessionLocal, refresh_seconds: float = None, version_check_seconds: float = None):
+        super().__init__(session_factory, refresh_seconds, version_check_seconds)
+        self._snapshot = None
+
+    def _build(self, db: Session):
+        rows = db.query(Blind75Problem).order_by(Blind75Problem.title).all()
+        bodies = {}
+        for row in rows:
+            body = json.dumps(to_problem(row).dict(), separators=(",", ":")).encode()
+            bodies[row.id] = (body, _etag(body))
+        problems_body = b"[" + b",".join(body for body, _ in bodies.values()) + b"]"
+        version = _etag(problems_body).strip('"')
+        snapshot = {
+            "version": version,
+            "list": (b'{"version":"' + version.encode() + b'","problems":' + problems_body + b"}", f'"{version}"'),
+            "problems": bodies,
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self, db: Session = None) -> dict:
+        self._ensure_loaded(db)
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot["version"] if self._snapshot else None
+
+    def list_body(self, db: Session = None):
+        """(JSON body, ETag) for the whole bank."""
+        return self.snapshot(db)["list"]
+
+    def problem_body(self, problem_id: str, db: Session = None):
+        """(JSON body, ETag) for one problem, or None."""
+        return self.snapshot(db)["problems"].get(problem_id)
+
+problem_index = ProblemIndex()
+problem_bank = ProblemBank()
+
+@event.listens_for(Session, "after_flush")
+def _track_problem_changes(session, flush_context):
+    if any(isinstance(obj, Blind75Problem) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["blind75_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("blind75_changed", False):
+        problem_index.invalidate()
+        problem_bank.invalidate()
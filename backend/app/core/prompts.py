@@ -186,26 +186,8 @@ def improve_resume_prompt(resume_text: str) -> str:
     {resume_text}
     """
 
-def feedback_resume_prompt(resume_text: str) -> str:
-    return f"""
-    You are a resume feedback assistant. Analyze this resume and provide feedback for INDIVIDUAL bullet points within experience, projects, and leadership sections.
-
-    CRITICAL INSTRUCTIONS:
-    - You MUST analyze EACH INDIVIDUAL bullet point separately
-    - Look for bullet points that start with •, -, *, ▪, or similar symbols
-    - For each bullet point, provide separate feedback
-    - Do NOT group multiple bullet points together
-    - Do NOT analyze section headers, job titles, company names, or dates
-    - When showing the "Original:" text, REMOVE all bullet point symbols (•, -, *, ▪, etc.) and show only the actual content
-
-    FORMAT FOR EACH BULLET POINT:
-    Original: [bullet point text WITHOUT bullet symbols (•, -, *, ▪, etc.)]
-    Grade: [score out of 10] (e.g., "Grade: 7/10")
-    Feedback: [brief evaluation of this specific bullet point]
-    - Option 1: [complete improved version of this bullet point]
-    - Option 2: [complete improved version of this bullet point]
-
-    STRICT GRADING CRITERIA (out of 10):
+# Shared by the text and JSON resume feedback prompts
+RESUME_FEEDBACK_CRITERIA = """    STRICT GRADING CRITERIA (out of 10):
     - 10: Perfect - Quantified achievements with specific metrics, strong action verbs, clear measurable impact, industry-relevant keywords
     - 9: Exceptional - Quantified achievements, strong action verbs, clear impact, some specific metrics
     - 8: Excellent - Quantified achievements, strong action verbs, clear outcomes, good use of keywords
@@ -238,7 +220,28 @@ def feedback_resume_prompt(resume_text: str) -> str:
     - Contact information
     - Simple statements without achievements
 
-    IMPORTANT:
+"""
+
+def feedback_resume_prompt(resume_text: str) -> str:
+    return f"""
+    You are a resume feedback assistant. Analyze this resume and provide feedback for INDIVIDUAL bullet points within experience, projects, and leadership sections.
+
+    CRITICAL INSTRUCTIONS:
+    - You MUST analyze EACH INDIVIDUAL bullet point separately
+    - Look for bullet points that start with •, -, *, ▪, or similar symbols
+    - For each bullet point, provide separate feedback
+    - Do NOT group multiple bullet points together
+    - Do NOT analyze section headers, job titles, company names, or dates
+    - When showing the "Original:" text, REMOVE all bullet point symbols (•, -, *, ▪, etc.) and show only the actual content
+
+    FORMAT FOR EACH BULLET POINT:
+    Original: [bullet point text WITHOUT bullet symbols (•, -, *, ▪, etc.)]
+    Grade: [score out of 10] (e.g., "Grade: 7/10")
+    Feedback: [brief evaluation of this specific bullet point]
+    - Option 1: [complete improved version of this bullet point]
+    - Option 2: [complete improved version of this bullet point]
+
+{RESUME_FEEDBACK_CRITERIA}    IMPORTANT:
     - Each option must be a complete, standalone bullet point
     - Do not cut off mid-sentence
     - Provide exactly 2 options for each bullet point
@@ -251,6 +254,34 @@ def feedback_resume_prompt(resume_text: str) -> str:
     {resume_text}
     """
 
+def feedback_resume_json_prompt(resume_text: str) -> str:
+    return f"""
+    You are a resume feedback assistant. Analyze this resume and provide feedback for INDIVIDUAL bullet points within experience, projects, and leadership sections.
+
+    CRITICAL INSTRUCTIONS:
+    - You MUST analyze EACH INDIVIDUAL bullet point separately
+    - Look for bullet points that start with •, -, *, ▪, or similar symbols
+    - Do NOT group multiple bullet points together
+    - Do NOT analyze section headers, job titles, company names, or dates
+
+    Respond with a JSON object matching the response schema:
+    - "feedback": a 2-3 sentence overall assessment of the resume's bullet points
+    - "structured_feedback": one object per bullet point with
+      - "original": the bullet point text WITHOUT bullet symbols (•, -, *, ▪, etc.)
+      - "grade": the score out of 10 (e.g., "7/10")
+      - "feedback": a brief evaluation of this specific bullet point
+      - "options": exactly 2 complete improved versions of this bullet point
+
+{RESUME_FEEDBACK_CRITERIA}    IMPORTANT:
+    - Each option must be a complete, standalone bullet point
+    - Do not cut off mid-sentence
+    - Be specific and actionable in feedback
+    - Be harsh but fair - most bullet points should score 4-7, with 8+ being truly exceptional
+
+    Resume text:
+    {resume_text}
+    """
+
 def tailor_resume_prompt(resume_text: str, job_description: str) -> str:
     return f"""
 You are a professional resume optimization assistant. Your task is to rewrite the user's resume so it is tailored to the following job description, but you must strictly follow these rules:
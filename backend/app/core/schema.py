@@ -0,0 +1,89 @@
+"""In-place upgrades for tables that predate the current models.
+
+`Base.metadata.create_all` creates missing tables but never alters existing
+ones, so columns added to an existing model are listed here and added at
+startup, as are NOT NULL constraints that were relaxed. Every step checks the
+live schema first, which makes `upgrade_schema` safe to run on every boot and
+from several workers at once.
+"""
+import logging
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.exc import DBAPIError
+from app.core.database import Base
+
+# Columns added to tables that already existed; all nullable, so no backfill is needed
+ADDED_COLUMNS = {
+    "resume": ["content_hash", "extracted_text", "file_size", "storage_backend"],
+    "roadmap": ["questionnaire_fingerprint"],
+}
+
+# Columns that became nullable
+NULLABLE_COLUMNS = {
+    "resume": ["file_data"],  # empty when the PDF lives in the blob store
+}
+
+def _columns(conn, table_name):
+    return {column["name"]: column for column in inspect(conn).get_columns(table_name)}
+
+def _add_column(engine, table_name, column_name):
+    column = Base.metadata.tables[table_name].c[column_name]
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column.type.compile(engine.dialect)}"
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(ddl))
+    except DBAPIError:
+        # Another worker may have added it first
+        with engine.connect() as conn:
+            if column_name not in _columns(conn, table_name):
+                raise
+    logging.warning(f"Added column {table_name}.{column_name}")
+
+def _rebuild_sqlite_table(conn, table_name):
+    # SQLite cannot alter a column, so recreate the table from the model and copy the rows over
+    table = Base.metadata.tables[table_name]
+    metadata = MetaData()
+    for foreign_key in table.foreign_keys:  # so the copy's foreign keys resolve
+        foreign_key.column.table.to_metadata(metadata)
+    staging = table.to_metadata(metadata, name=f"_new_{table_name}")
+    staging.indexes.clear()
+    staging.create(conn)
+    shared = ", ".join(name for name in _columns(conn, table_name) if name in table.c)
+    conn.execute(text(f"INSERT INTO {staging.name} ({shared}) SELECT {shared} FROM {table_name}"))
+    conn.execute(text(f"DROP TABLE {table_name}"))
+    conn.execute(text(f"ALTER TABLE {staging.name} RENAME TO {table_name}"))
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+def _drop_not_null(engine, table_name, column_name):
+    try:
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                _rebuild_sqlite_table(conn, table_name)
+            else:
+                conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} DROP NOT NULL"))
+    except DBAPIError:
+        with engine.connect() as conn:
+            if not _columns(conn, table_name)[column_name]["nullable"]:
+                raise
+    logging.warning(f"Made {table_name}.{column_name} nullable")
+
+def upgrade_schema(engine):
+    """Apply ADDED_COLUMNS and NULLABLE_COLUMNS to tables that predate them. Run before create_all."""
+    with engine.connect() as conn:
+        tables = set(inspect(conn).get_table_names())
+        missing = [
+            (table_name, column_name)
+            for table_name, column_names in ADDED_COLUMNS.items() if table_name in tables
+            for column_name in column_names if column_name not in _columns(conn, table_name)
+        ]
+    for table_name, column_name in missing:
+        _add_column(engine, table_name, column_name)
+
+    with engine.connect() as conn:
+        required = [
+            (table_name, column_name)
+            for table_name, column_names in NULLABLE_COLUMNS.items() if table_name in tables
+            for column_name in column_names if not _columns(conn, table_name)[column_name]["nullable"]
+        ]
+    for table_name, column_name in required:
+        _drop_not_null(engine, table_name, column_name)
@@ -0,0 +1,42 @@
+import inspect
+import json
+import logging
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import StreamingResponse
+
+def format_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+async def _events(deltas, finalize, on_close):
+    parts = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield format_event("token", {"text": delta})
+        # The full text is validated (and persisted) only once the stream has finished
+        result = finalize("".join(parts))
+        if inspect.isawaitable(result):
+            result = await result
+        yield format_event("done", result)
+    except HTTPException as e:
+        yield format_event("error", {"detail": e.detail})
+    except Exception as e:
+        logging.exception("Streaming generation failed")
+        yield format_event("error", {"detail": str(e) or "Generation failed"})
+    finally:
+        if on_close:
+            on_close()
+
+def stream_generation(deltas, finalize, on_close=None) -> StreamingResponse:
+    """Relay text deltas as Server-Sent Events.
+
+    Each delta is sent as a `token` event. When the stream ends, `finalize(text)`
+    (sync or async) validates the full text and its result is sent as `done`.
+    Failures are reported as an `error` event, since the 200 status is already sent.
+    """
+    return StreamingResponse(
+        _events(deltas, finalize, on_close),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import requests
+from requests.adapters import HTTPAdapter
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COST = 100  # quota units the YouTube Data API charges per search.list call
+# The API's daily quota resets at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+def search_key(query: str, duration: str, language: str, max_results: int) -> tuple:
+    """Cache key for a search; queries differing only in case or spacing share it."""
+    return (" ".join(query.split()).lower(), duration.lower(), language.lower(), int(max_results))
+
+class QuotaBudget:
+    """Units spent today against a daily budget, reset when the Pacific-time date changes."""
+
+    def __init__(self, daily_units: int, clock=None):
+        self.daily_units = daily_units
+        self._clock = clock or (lambda: datetime.now(QUOTA_TIMEZONE))
+        self._day = None
+        self._spent = 0
+        self._lock = threading.Lock()
+
+    def _roll(self):
+        today = self._clock().date()
+        if today != self._day:
+            self._day, self._spent = today, 0
+
+    def try_spend(self, units: int) -> bool:
+        with self._lock:
+            self._roll()
+            if self._spent + units > self.daily_units:
+                return False
+            self._spent += units
+            return True
+
+    def exhaust(self):
+        """Stop spending for the rest of the day, e.g. after the API reports quotaExceeded."""
+        with self._lock:
+            self._roll()
+            self._spent = self.daily_units
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll()
+            return self.daily_units - self._spent
+
+class YouTubeClient:
+    """
+    Pooled, cached YouTube search.
+
+    Results are cached per normalized (query, duration, language, maxResults)
+    and are fresh for `cache_ttl` seconds. Expired entries are kept (up to
+    `max_entries`, least recently used dropped first) and served when the
+    daily quota budget is spent or the API call fails.
+    """
+
+    def __init__(self, api_key: str = None, base_url: str = None, cache_ttl: float = None, max_entries: int = None,
+                 daily_quota: int = None, timeout: float = None, pool_size: int = None):
+        self.api_key = api_key if api_key is not None else settings.YOUTUBE_API_KEY
+        self.base_url = (base_url or settings.YOUTUBE_API_BASE_URL).rstrip("/")
+        self.cache_ttl = cache_ttl if cache_ttl is not None else settings.YOUTUBE_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.YOUTUBE_CACHE_MAX_ENTRIES
+        self.timeout = timeout or settings.YOUTUBE_TIMEOUT_SECONDS
+        self.budget = QuotaBudget(daily_quota if daily_quota is not None else settings.YOUTUBE_DAILY_QUOTA)
+        pool_size = pool_size or settings.YOUTUBE_POOL_SIZE
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "over_budget": 0, "errors": 0}
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+            fetched_at, videos = entry
+            return videos, time.monotonic() - fetched_at < self.cache_ttl
+
+    def _store(self, key, videos):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), videos)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _fallback(self, stale, counter: str) -> list:
+        self._count(counter)
+        if stale is not None:
+            self._count("stale_hits")
+            return stale
+        return []
+
+    def search(self, query: str, duration: str = "any", language: str = "en", max_results: int = 1) -> list:
+        key = search_key(query, duration, language, max_results)
+        cached, fresh = self._lookup(key)
+        if fresh:
+            self._count("hits")
+            return cached
+        if not self.budget.try_spend(SEARCH_COST):
+            return self._fallback(cached, "over_budget")
+
+        self._count("misses")
+        params = {
+            'part': 'snippet',
+            'q': query,
+            'type': 'video',
+            'safeSearch': 'moderate',
+            'videoDuration': duration,
+            'relevanceLanguage': language,
+            'maxResults': max_results,
+            'key': self.api_key
+        }
+        try:
+            response = self.session.get(f"{self.base_url}/search", params=params, timeout=self.timeout)
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("YouTube search for %r failed: %s", query, e)
+            return self._fallback(cached, "errors")
+        if response.status_code != 200:
+            reasons = {error.get("reason") for error in data.get("error", {}).get("errors", [])}
+            if reasons & {"quotaExceeded", "dailyLimitExceeded"}:
+                self.budget.exhaust()
+            logger.warning("YouTube search for %r returned %s: %s", query, response.status_code, reasons)
+            return self._fallback(cached, "errors")
+
+        videos = [_to_video(item) for item in data.get('items', []) if item.get('id', {}).get('videoId')]
+        self._store(key, videos)
+        return videos
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+        snapshot["quota_remaining"] = self.budget.remaining
+        return snapshot
+
+def _to_video(item: dict) -> dict:
+    return {
+        "title": item['snippet']['title'],
+        "video_id": item['id']['videoId'],
+        "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+        "description": item['snippet']['description'],
+        "thumbnail": item['snippet']['thumbnails']['default']['url']
+    }
+
+youtube_client = YouTubeClient()
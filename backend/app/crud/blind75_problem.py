@@ -0,0 +1,128 @@
+import json
+import uuid
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+from app.core.problem_index import current_bank_version, problem_bank, problem_index
+from app.models.blind75_problem import Blind75Problem
+from app.models.problem_bank_version import ProblemBankVersion
+from app.models.problem_test_case import ProblemTestCase
+from app.schemas.blind_75_problem import Line
+
+IMPORT_BATCH_SIZE = 500
+PROBLEM_FIELDS = ("problem_type", "difficulty", "time_complexity", "space_complexity", "prompt", "solution")
+TEST_CASE_FIELDS = ("entry_point", "args", "expected", "compare", "size")
+# The API's Problem field names are accepted too, so an exported bank can be re-imported
+FIELD_ALIASES = {"type": "problem_type", "time": "time_complexity", "space": "space_complexity"}
+
+def load_problem_records(path: str) -> list:
+    """Read problems from a JSON file (a list, or {"problems": [...]}) or a JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return data["problems"] if isinstance(data, dict) else data
+
+def _normalize_record(record: dict, position: int) -> dict:
+    record = {FIELD_ALIASES.get(key, key): value for key, value in record.items()}
+    missing = [field for field in ("title", *PROBLEM_FIELDS) if field != "solution" and not record.get(field)]
+    if not isinstance(record.get("solution"), list):
+        missing.append("solution")
+    if missing:
+        raise ValueError(f"Problem #{position + 1} ({record.get('title', 'untitled')}): missing {', '.join(missing)}")
+    problem = {field: record[field] for field in PROBLEM_FIELDS}
+    problem["title"] = record["title"].strip()
+    problem["solution"] = [Line(**line).dict() for line in record["solution"]]
+    problem["id"] = record.get("id")
+    if "test_cases" in record:
+        problem["test_cases"] = [
+            {"entry_point": case["entry_point"], "args": case["args"], "expected": case.get("expected"),
+             "compare": case.get("compare", "exact"), "size": case.get("size")}
+            for case in record["test_cases"]
+        ]
+    return problem
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _current_test_cases(db: Session, problem_ids) -> dict:
+    cases = {}
+    for batch in _batches(list(problem_ids), IMPORT_BATCH_SIZE):
+        rows = db.query(ProblemTestCase).filter(ProblemTestCase.problem_id.in_(batch)).order_by(
+            ProblemTestCase.problem_id, ProblemTestCase.position, ProblemTestCase.id
+        )
+        for row in rows:
+            cases.setdefault(row.problem_id, []).append({field: getattr(row, field) for field in TEST_CASE_FIELDS})
+    return cases
+
+def import_problems(db: Session, records: list, prune: bool = False, dry_run: bool = False, source: str = None,
+                    batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """Bulk-upsert Blind 75 problems keyed on title.
+
+    Only new or changed problems are written, in batches of executemany
+    statements inside one transaction. Records with a `test_cases` list also
+    replace that problem's test cases when they differ. With `prune`, problems
+    missing from the records are deleted. A change records a new bank version,
+    which in-memory views in every process pick up.
+    """
+    problems = {}
+    for position, record in enumerate(records):
+        problem = _normalize_record(record, position)
+        problems[problem["title"]] = problem  # the last record for a title wins
+
+    existing = {row.title: row for row in db.query(Blind75Problem)}
+    inserts, updates, case_updates = [], [], {}
+    for title, problem in problems.items():
+        row = existing.get(title)
+        values = {field: problem[field] for field in PROBLEM_FIELDS}
+        if row is None:
+            problem_id = problem["id"] or str(uuid.uuid4())
+            inserts.append({"id": problem_id, "title": title, **values})
+        else:
+            problem_id = row.id
+            if any(getattr(row, field) != value for field, value in values.items()):
+                updates.append({"id": problem_id, **values})
+        if "test_cases" in problem:
+            case_updates[problem_id] = problem["test_cases"]
+
+    stored_cases = _current_test_cases(db, case_updates)
+    case_updates = {problem_id: cases for problem_id, cases in case_updates.items() if stored_cases.get(problem_id, []) != cases}
+    removed = [row.id for title, row in existing.items() if title not in problems] if prune else []
+
+    stats = {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "unchanged": len(problems) - len(inserts) - len(updates),
+        "deleted": len(removed),
+        "test_cases_replaced": len(case_updates),
+        "version": current_bank_version(db),
+    }
+    if dry_run or not (inserts or updates or removed or case_updates):
+        db.rollback()
+        return stats
+
+    for batch in _batches(inserts, batch_size):
+        db.execute(insert(Blind75Problem), batch)
+    for batch in _batches(updates, batch_size):
+        db.execute(update(Blind75Problem), batch)
+    for batch in _batches(list(case_updates) + removed, batch_size):
+        db.execute(delete(ProblemTestCase).where(ProblemTestCase.problem_id.in_(batch)))
+    case_rows = [
+        {"problem_id": problem_id, "position": position, **case}
+        for problem_id, cases in case_updates.items() for position, case in enumerate(cases)
+    ]
+    for batch in _batches(case_rows, batch_size):
+        db.execute(insert(ProblemTestCase), batch)
+    for batch in _batches(removed, batch_size):
+        db.execute(delete(Blind75Problem).where(Blind75Problem.id.in_(batch)))
+
+    stats["version"] += 1
+    db.add(ProblemBankVersion(
+        version=stats["version"], source=source,
+        inserted=stats["inserted"], updated=stats["updated"], deleted=stats["deleted"]
+    ))
+    db.commit()
+    # Bulk statements bypass the ORM flush events, so this process's views are refreshed directly
+    problem_index.invalidate()
+    problem_bank.invalidate()
+    return stats
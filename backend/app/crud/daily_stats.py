@@ -1,5 +1,8 @@
+import sqlite3
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import Session
 from app.models.daily_stats import DailyStat
+from app.models.user_streak import UserStreak
 from app.schemas.daily_stats import DailyStatCreate, DailyStatUpdate
 from datetime import date
 
@@ -44,6 +47,7 @@ def get_or_create_daily_stat(db: Session, user_id: int, stat_date: date):
             goal=previous_goal if previous_goal > 0 else 0
         )
         db_stat = create_daily_stat(db, daily_stat_data)
+        db_stat = _refresh_streak(db, user_id, stat_date)
     return db_stat
 
 def get_user_latest_goal(db: Session, user_id: int):
@@ -56,72 +60,258 @@ def get_user_latest_goal(db: Session, user_id: int):
     return latest_stat.goal if latest_stat else 0
 
 def calculate_current_streak(db: Session, user_id: int, target_date: date = None):
+    """Recompute the streak for target_date from the user's full history.
+
+    This is the reference implementation; request paths read the streak
+    maintained by the incremental engine below instead.
+    """
     if target_date is None:
         target_date = date.today()
-    
+
     stats = db.query(DailyStat).filter(
         DailyStat.user_id == user_id,
         DailyStat.date <= target_date,
-        DailyStat.goal > 0  
+        DailyStat.goal > 0
     ).order_by(DailyStat.date.desc()).all()
-    
-    if not stats:
-        return 0
-    
-    stats_by_date = {}
-    for stat in stats:
-        if stat.date not in stats_by_date:
-            stats_by_date[stat.date] = stat
-    
-    sorted_dates = sorted(stats_by_date.keys(), reverse=True)
-    
-    if not sorted_dates:
-        return 0
-    
-    target_stat = stats_by_date.get(target_date)
-    target_goal_completed = (target_stat and 
-                           target_stat.answered >= target_stat.goal and 
-                           target_stat.goal > 0)
-    
-    if not target_goal_completed:
-        previous_dates = [d for d in sorted_dates if d < target_date]
-        if not previous_dates:
-            return 0
-        
-        most_recent_previous = max(previous_dates)
-        return calculate_current_streak(db, user_id, most_recent_previous)
-    
+
+    # The streak ends at the most recent completed day on or before target_date
     streak = 0
-    for stat_date in sorted_dates:
-        stat = stats_by_date[stat_date]
-        goal_met = stat.answered >= stat.goal and stat.goal > 0
-        if goal_met:
+    for stat in stats:
+        if _goal_met(stat):
             streak += 1
-        else:
-            break  
-    
+        elif streak > 0:
+            break
+
     return streak
 
+def _supports_window_functions(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    if dialect.name == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 25, 0)
+    return True
+
+def _bulk_streaks_windowed(db: Session, user_ids, target_date: date):
+    # Gaps and islands: every missed day starts a new island, so the completed days
+    # sharing an island number form one unbroken run
+    missed = case((DailyStat.answered >= DailyStat.goal, 0), else_=1)
+    days = select(
+        DailyStat.user_id,
+        DailyStat.date,
+        missed.label("missed"),
+        func.sum(missed).over(partition_by=DailyStat.user_id, order_by=DailyStat.date).label("island")
+    ).where(DailyStat.goal > 0, DailyStat.date <= target_date)
+    if user_ids is not None:
+        days = days.where(DailyStat.user_id.in_(user_ids))
+    days = days.subquery()
+
+    runs = select(
+        days.c.user_id,
+        func.count().label("length"),
+        func.max(days.c.date).label("ended_on")
+    ).where(days.c.missed == 0).group_by(days.c.user_id, days.c.island).subquery()
+
+    latest = select(
+        runs.c.user_id,
+        runs.c.length,
+        func.row_number().over(partition_by=runs.c.user_id, order_by=runs.c.ended_on.desc()).label("rank")
+    ).subquery()
+
+    rows = db.execute(select(latest.c.user_id, latest.c.length).where(latest.c.rank == 1))
+    return {user_id: length for user_id, length in rows}
+
+def _bulk_streaks_ordered_scan(db: Session, user_ids, target_date: date):
+    query = db.query(DailyStat.user_id, DailyStat.goal, DailyStat.answered).filter(
+        DailyStat.goal > 0,
+        DailyStat.date <= target_date
+    )
+    if user_ids is not None:
+        query = query.filter(DailyStat.user_id.in_(user_ids))
+
+    streaks = {}
+    finished = set()
+    for user_id, goal, answered in query.order_by(DailyStat.user_id, DailyStat.date.desc()):
+        if user_id in finished:
+            continue
+        streak = streaks.get(user_id, 0)
+        if answered >= goal:
+            streaks[user_id] = streak + 1
+        elif streak > 0:
+            finished.add(user_id)
+    return streaks
+
+def calculate_streaks_bulk(db: Session, user_ids=None, target_date: date = None, use_window_functions: bool = None):
+    """Compute the streak on target_date for many users in one statement.
+
+    Returns {user_id: streak}. With user_ids every requested user is present;
+    otherwise only users with a streak above zero are returned. Databases
+    without window functions fall back to a single ordered scan.
+    """
+    if target_date is None:
+        target_date = date.today()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+    if use_window_functions is None:
+        use_window_functions = _supports_window_functions(db)
+
+    if use_window_functions:
+        streaks = _bulk_streaks_windowed(db, user_ids, target_date)
+    else:
+        streaks = _bulk_streaks_ordered_scan(db, user_ids, target_date)
+
+    if user_ids is None:
+        return {user_id: streak for user_id, streak in streaks.items() if streak > 0}
+    return {user_id: streaks.get(user_id, 0) for user_id in user_ids}
+
+def _goal_met(stat: DailyStat) -> bool:
+    return stat.goal > 0 and stat.answered >= stat.goal
+
+def _next_streak(previous: DailyStat, stat: DailyStat) -> int:
+    """Streak for `stat` given the closest earlier day that had a goal."""
+    carried = previous.streak if previous else 0
+    if not _goal_met(stat):
+        return carried
+    if previous is not None and _goal_met(previous):
+        return carried + 1
+    return 1
+
+def _previous_goal_stat(db: Session, user_id: int, stat_date: date):
+    return db.query(DailyStat).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.date < stat_date,
+        DailyStat.goal > 0
+    ).order_by(DailyStat.date.desc()).first()
+
+def _last_completed_date(db: Session, user_id: int, before: date = None):
+    query = db.query(DailyStat.date).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.goal > 0,
+        DailyStat.answered >= DailyStat.goal
+    )
+    if before is not None:
+        query = query.filter(DailyStat.date < before)
+    row = query.order_by(DailyStat.date.desc()).first()
+    return row[0] if row else None
+
+def rebuild_user_streaks(db: Session, user_id: int):
+    """Recompute every stored streak for a user in one pass and persist the running state."""
+    previous = None
+    last = None
+    last_completed = None
+    for stat in db.query(DailyStat).filter(DailyStat.user_id == user_id).order_by(DailyStat.date.asc()):
+        stat.streak = _next_streak(previous, stat)
+        if stat.goal > 0:
+            previous = stat
+        if _goal_met(stat):
+            last_completed = stat.date
+        last = stat
+
+    user_streak = db.get(UserStreak, user_id)
+    if not user_streak:
+        user_streak = UserStreak(user_id=user_id)
+        db.add(user_streak)
+    user_streak.current_streak = last.streak if last else 0
+    user_streak.last_stat_date = last.date if last else None
+    user_streak.last_completed_date = last_completed
+    db.commit()
+    return user_streak
+
+def ensure_user_streak(db: Session, user_id: int):
+    """Return the persisted streak state, building it from history the first time."""
+    user_streak = db.get(UserStreak, user_id)
+    if not user_streak:
+        user_streak = rebuild_user_streaks(db, user_id)
+    return user_streak
+
+def apply_streak_update(db: Session, user_id: int, stat_date: date):
+    """Bring stored streaks up to date after the DailyStat for stat_date changed.
+
+    Editing the latest day costs a single row update. A backdated edit walks
+    forward only until a later day's streak comes out unchanged.
+    """
+    user_streak = ensure_user_streak(db, user_id)
+    previous = _previous_goal_stat(db, user_id, stat_date)
+    later = db.query(DailyStat).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.date >= stat_date
+    ).order_by(DailyStat.date.asc()).all()
+
+    edited = None
+    last = None
+    for stat in later:
+        streak = _next_streak(previous, stat)
+        if stat.date > stat_date and stat.goal > 0 and streak == stat.streak:
+            # Everything after this day depends only on values that did not change
+            last = None
+            break
+        stat.streak = streak
+        if stat.date == stat_date:
+            edited = stat
+        if stat.goal > 0:
+            previous = stat
+        last = stat
+
+    if last is not None:
+        user_streak.current_streak = last.streak
+        user_streak.last_stat_date = last.date
+
+    # The last completed day only moves if the edited day was, or now is, that day
+    last_completed = user_streak.last_completed_date
+    if edited is not None and _goal_met(edited):
+        if last_completed is None or stat_date > last_completed:
+            user_streak.last_completed_date = stat_date
+    elif last_completed == stat_date:
+        user_streak.last_completed_date = _last_completed_date(db, user_id, before=stat_date)
+    db.commit()
+    return user_streak
+
+def get_stored_streak(db: Session, user_id: int, target_date: date = None):
+    """Read the stored streak for target_date (defaults to today)."""
+    if target_date is None:
+        target_date = date.today()
+
+    user_streak = ensure_user_streak(db, user_id)
+    if user_streak.last_stat_date is None:
+        return 0
+    if user_streak.last_stat_date <= target_date:
+        return user_streak.current_streak
+
+    stat = db.query(DailyStat).filter(
+        DailyStat.user_id == user_id,
+        DailyStat.date <= target_date
+    ).order_by(DailyStat.date.desc()).first()
+    return stat.streak if stat else 0
+
 def update_streak_for_user(db: Session, user_id: int, stat_date: date = None):
     """Update the streak field for a specific date"""
     if stat_date is None:
         stat_date = date.today()
-    
-    current_streak = calculate_current_streak(db, user_id, stat_date)
+
+    apply_streak_update(db, user_id, stat_date)
     db_stat = get_daily_stat(db, user_id, stat_date)
-    if db_stat:
-        db_stat.streak = current_streak
-        db.commit()
-        db.refresh(db_stat)
-    
-    return current_streak
+    return db_stat.streak if db_stat else get_stored_streak(db, user_id, stat_date)
 
 def _refresh_streak(db: Session, user_id: int, stat_date: date):
-    """Re‑calculate the current streak and persist it on the *same* DailyStat row."""
-    streak = calculate_current_streak(db, user_id, stat_date)
+    """Propagate a change on stat_date through the stored streaks and return that day's row."""
+    apply_streak_update(db, user_id, stat_date)
     db_stat = get_daily_stat(db, user_id, stat_date)
-    if db_stat and db_stat.streak != streak:
-        db_stat.streak = streak
-        db.commit()
+    if db_stat:
         db.refresh(db_stat)
-    return db_stat
\ No newline at end of file
+    return db_stat
+
+def _users_missing_streaks(db: Session):
+    return db.query(DailyStat.user_id).outerjoin(
+        UserStreak, UserStreak.user_id == DailyStat.user_id
+    ).filter(UserStreak.user_id.is_(None))
+
+def user_streaks_behind(db: Session) -> bool:
+    """True when some user with practice history has no user_streaks row (e.g. the table is new and empty)."""
+    return db.query(_users_missing_streaks(db).exists()).scalar()
+
+def backfill_user_streaks(db: Session):
+    """Build streak state for every user with practice history but no user_streaks row."""
+    missing = _users_missing_streaks(db).distinct().all()
+    for (user_id,) in missing:
+        rebuild_user_streaks(db, user_id)
+    return len(missing)
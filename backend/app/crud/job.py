@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.job import Job
+import hashlib
+import json
+import logging
+import os
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("succeeded", "failed")
+
+def job_dedup_key(kind: str, payload: dict) -> str:
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True, default=str).encode()).hexdigest()
+
+def create_or_get_job(db: Session, kind: str, payload: dict, user_id: int = None):
+    """Queue a job, or return the identical one that is already queued or running."""
+    dedup_key = job_dedup_key(kind, payload)
+    existing = db.query(Job).filter(
+        Job.dedup_key == dedup_key,
+        Job.status.in_(ACTIVE_STATUSES)
+    ).order_by(Job.created_at).first()
+    if existing:
+        return existing
+    job = Job(kind=kind, dedup_key=dedup_key, user_id=user_id, payload=payload, status="queued", progress="queued")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def get_job(db: Session, job_id: str):
+    return db.query(Job).filter(Job.id == job_id).first()
+
+def claim_next_job(db: Session):
+    """Move the oldest queued job to running. The conditional update lets several workers share the table."""
+    while True:
+        candidate = db.query(Job.id).filter(Job.status == "queued").order_by(Job.created_at, Job.id).first()
+        if not candidate:
+            return None
+        now = datetime.now(timezone.utc)
+        claimed = db.query(Job).filter(Job.id == candidate.id, Job.status == "queued").update(
+            {"status": "running", "progress": "running", "started_at": now, "heartbeat_at": now},
+            synchronize_session=False
+        )
+        db.commit()
+        if claimed:
+            return get_job(db, candidate.id)
+
+def set_job_progress(db: Session, job: Job, progress: str):
+    job.progress = progress
+    db.commit()
+
+def finish_job(db: Session, job_id: str, result=None, error: str = None):
+    job = get_job(db, job_id)
+    job.status = "failed" if error is not None else "succeeded"
+    job.progress = job.status
+    job.result = result
+    job.error = error
+    job.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return job
+
+def touch_job(db: Session, job_id: str) -> bool:
+    """Renew a running job's lease. False if it is no longer running (e.g. it was requeued)."""
+    touched = db.query(Job).filter(Job.id == job_id, Job.status == "running").update(
+        {"heartbeat_at": datetime.now(timezone.utc)}, synchronize_session=False
+    )
+    db.commit()
+    return bool(touched)
+
+def requeue_stale_jobs(db: Session, lease_seconds: float = None):
+    """Put running jobs whose lease expired (their worker stopped heartbeating) back on the queue."""
+    if lease_seconds is None:
+        lease_seconds = settings.JOB_LEASE_SECONDS
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+    count = db.query(Job).filter(
+        Job.status == "running",
+        or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < cutoff)
+    ).update(
+        {"status": "queued", "progress": "queued", "started_at": None, "heartbeat_at": None},
+        synchronize_session=False
+    )
+    db.commit()
+    return count
+
+def _remove_result_file(result):
+    # Only files the job wrote into JOB_RESULT_DIR belong to it
+    path = result.get("file_path") if isinstance(result, dict) else None
+    if not path:
+        return
+    if os.path.dirname(os.path.abspath(path)) != os.path.abspath(settings.JOB_RESULT_DIR):
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Could not remove job result {path}: {e}")
+
+def purge_finished_jobs(db: Session, retention_hours: float = None) -> int:
+    """Delete jobs that finished more than `retention_hours` ago, with their result files."""
+    if retention_hours is None:
+        retention_hours = settings.JOB_RETENTION_HOURS
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    expired = db.query(Job).filter(Job.status.in_(FINISHED_STATUSES), Job.finished_at < cutoff).all()
+    for job in expired:
+        _remove_result_file(job.result)
+        db.delete(job)
+    db.commit()
+    return len(expired)
@@ -3,9 +3,10 @@ from app.models.user import User
 from app.models.resume import Resume
 from app.models.questionnaire import Questionnaire
 from app.models.job_description_roadmap import JobDescriptionRoadmap
-from app.utils.get_job_description_roadmap import generate_job_description_roadmap
+from app.utils.get_job_description_roadmap import generate_job_description_roadmap, stream_job_description_roadmap
 
-def create_job_description_roadmap(db: Session, data):
+def _roadmap_inputs(db: Session, data):
+    """Collect the profile, education and skills that feed the roadmap prompt."""
     questionnaire = db.query(Questionnaire).filter(Questionnaire.user_id == data.user_id).first()
     profile = ""
     if questionnaire:
@@ -53,8 +54,9 @@ def create_job_description_roadmap(db: Session, data):
         elif isinstance(skills, str):
             skills_str = skills
 
-    job_description_roadmap_json = generate_job_description_roadmap(profile, education_info, skills_str, data.job_description)
+    return profile, education_info, skills_str
 
+def save_job_description_roadmap(db: Session, data, job_description_roadmap_json):
     existing_count = db.query(JobDescriptionRoadmap).filter(JobDescriptionRoadmap.user_id == data.user_id).count()
 
     title = getattr(data, "title", None)
@@ -72,6 +74,16 @@ def create_job_description_roadmap(db: Session, data):
     db.refresh(job_description_roadmap)
     return job_description_roadmap
 
+async def create_job_description_roadmap(db: Session, data):
+    profile, education_info, skills_str = _roadmap_inputs(db, data)
+    job_description_roadmap_json = await generate_job_description_roadmap(profile, education_info, skills_str, data.job_description)
+    return save_job_description_roadmap(db, data, job_description_roadmap_json)
+
+def stream_job_description_roadmap_for(db: Session, data):
+    """Text deltas for the roadmap; parse the joined text and pass it to save_job_description_roadmap."""
+    profile, education_info, skills_str = _roadmap_inputs(db, data)
+    return stream_job_description_roadmap(profile, education_info, skills_str, data.job_description)
+
 def get_job_description_roadmaps_by_user(db: Session, user_id: int):
     return db.query(JobDescriptionRoadmap).filter(JobDescriptionRoadmap.user_id == user_id).order_by(
         JobDescriptionRoadmap.created_at.desc()).all()
@@ -0,0 +1,9 @@
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+from app.models.llm_cache_entry import LLMCacheEntry
+
+def purge_expired_cache_entries(db: Session) -> int:
+    """Delete persistent LLM cache entries past their expiry; lookups only remove the key they read."""
+    purged = db.query(LLMCacheEntry).filter(LLMCacheEntry.expires_at < datetime.now(timezone.utc)).delete(synchronize_session=False)
+    db.commit()
+    return purged
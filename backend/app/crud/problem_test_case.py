@@ -0,0 +1,70 @@
+from sqlalchemy.orm import Session
+from app.models.blind75_problem import Blind75Problem
+from app.models.problem_test_case import ProblemTestCase
+from app.utils.code_runner import run_test_cases_async
+from app.utils.complexity_estimator import estimate_time_complexity, infer_category
+
+def get_test_cases(db: Session, problem_id: str):
+    return db.query(ProblemTestCase).filter(ProblemTestCase.problem_id == problem_id).order_by(
+        ProblemTestCase.position, ProblemTestCase.id
+    ).all()
+
+def replace_test_cases(db: Session, problem_id: str, cases: list):
+    db.query(ProblemTestCase).filter(ProblemTestCase.problem_id == problem_id).delete()
+    for position, case in enumerate(cases):
+        db.add(ProblemTestCase(problem_id=problem_id, position=position, **case))
+    db.commit()
+    return get_test_cases(db, problem_id)
+
+def load_problem_tests(db: Session, problem_id: str):
+    """Everything needed to run a submission against the problem, as plain data, or None if it has no test cases.
+
+    Detached from the session, so several runs can proceed concurrently without sharing it.
+    """
+    cases = get_test_cases(db, problem_id)
+    if not cases:
+        return None
+    problem = db.get(Blind75Problem, problem_id)
+    return {
+        "entry_point": cases[0].entry_point,
+        "cases": [
+            {"args": case.args, "expected": case.expected, "compare": case.compare, "size": case.size}
+            for case in cases
+        ],
+        "time_complexity": problem.time_complexity if problem else None,
+    }
+
+async def run_loaded_tests(tests: dict, code: str):
+    """Run a submission against test cases from load_problem_tests."""
+    return await run_test_cases_async(code, tests["entry_point"], tests["cases"])
+
+async def estimate_loaded_complexity(tests: dict, code: str):
+    """Measure a submission's time complexity on generated inputs shaped like the loaded test cases.
+
+    Returns None when their arguments are not an array, string or graph
+    shape. Blind 75 problems are compared with their stored time complexity.
+    """
+    category = infer_category(tests["cases"][0]["args"])
+    if category is None:
+        return None
+    return await estimate_time_complexity(code, tests["entry_point"], category, expected=tests["time_complexity"])
+
+async def run_problem_tests(db: Session, problem_id: str, code: str):
+    """Run a submission against the problem's stored test cases, or return None if it has none."""
+    tests = load_problem_tests(db, problem_id)
+    return await run_loaded_tests(tests, code) if tests else None
+
+async def estimate_problem_complexity(db: Session, problem_id: str, code: str):
+    """estimate_loaded_complexity for a stored problem; None when it has no test cases."""
+    tests = load_problem_tests(db, problem_id)
+    return await estimate_loaded_complexity(tests, code) if tests else None
+
+def summarize_test_run(run: dict) -> str:
+    summary = f"{run['passed']}/{run['total']} test cases passed"
+    if run["error"]:
+        return f"{summary}; {run['error']}"
+    first_error = next((case["error"] for case in run["cases"] if case["error"]), None)
+    return f"{summary}; first error: {first_error}" if first_error else summary
+
+def summarize_complexity(estimate: dict) -> str:
+    return f"measured time complexity {estimate['complexity']} (fit confidence {estimate['confidence']:.2f})"
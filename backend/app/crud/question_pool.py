@@ -0,0 +1,105 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.pooled_question import PooledQuestion
+from app.models.seen_question import SeenQuestion
+from app.utils.technical_interview import request_leetcode_questions
+
+# Refill gives up after this many batches that add nothing new
+MAX_EMPTY_REFILL_BATCHES = 2
+
+def _key(value) -> str:
+    return (value or "").strip().lower()
+
+def _difficulty(value) -> str:
+    return getattr(value, "value", value)
+
+def _bucket(query, company: str, difficulty: str, category: str = None):
+    query = query.filter(PooledQuestion.company == _key(company), PooledQuestion.difficulty == _difficulty(difficulty))
+    if category:
+        query = query.filter(PooledQuestion.category == _key(category))
+    return query
+
+def _as_question(row: PooledQuestion) -> dict:
+    return {**row.question, "id": row.id}
+
+def pool_size(db: Session, company: str, difficulty: str, category: str = None) -> int:
+    return _bucket(db.query(func.count(PooledQuestion.id)), company, difficulty, category).scalar()
+
+def _mark_seen(db: Session, user_id: int, question_ids):
+    seen = {
+        question_id for (question_id,) in db.query(SeenQuestion.question_id).filter(
+            SeenQuestion.user_id == user_id, SeenQuestion.question_id.in_(question_ids)
+        )
+    }
+    db.add_all(SeenQuestion(user_id=user_id, question_id=question_id) for question_id in question_ids if question_id not in seen)
+
+def take_unseen_questions(db: Session, user_id: int, company: str, difficulty: str, limit: int, category: str = None):
+    """Return up to `limit` random pooled questions the user has not been served, and mark them seen."""
+    seen = select(SeenQuestion.question_id).where(SeenQuestion.user_id == user_id)
+    rows = _bucket(db.query(PooledQuestion), company, difficulty, category).filter(
+        PooledQuestion.id.not_in(seen)
+    ).order_by(func.random()).limit(limit).all()
+    questions = [_as_question(row) for row in rows]
+    _mark_seen(db, user_id, [row.id for row in rows])
+    db.commit()
+    return questions
+
+def add_pool_questions(db: Session, company: str, difficulty: str, questions, user_id: int = None, category: str = None):
+    """Store generated questions in the pool, skipping titles it already holds.
+
+    Returns the questions with pool ids, in the order given. When `user_id` is
+    set they are also marked as seen by that user. `category` files them under
+    the requested category rather than the one the model reported.
+    """
+    questions = [q.dict() if hasattr(q, "dict") else dict(q) for q in questions]
+    existing = {
+        row.title_key: row for row in _bucket(db.query(PooledQuestion), company, difficulty).filter(
+            PooledQuestion.title_key.in_([_key(q.get("title")) for q in questions])
+        )
+    }
+    rows = []
+    for question in questions:
+        title_key = _key(question.get("title"))
+        if not title_key:
+            continue
+        row = existing.get(title_key)
+        if row is None:
+            question["difficulty"] = _difficulty(question.get("difficulty")) or _difficulty(difficulty)
+            row = PooledQuestion(
+                company=_key(company),
+                difficulty=_difficulty(difficulty),
+                category=_key(category or question.get("category")) or "general",
+                title_key=title_key,
+                question=question
+            )
+            db.add(row)
+            existing[title_key] = row
+        rows.append(row)
+    db.flush()
+    pooled = [_as_question(row) for row in rows]
+    if user_id is not None:
+        _mark_seen(db, user_id, [row.id for row in rows])
+    db.commit()
+    return pooled
+
+async def refill_question_pool(db: Session, company: str, difficulty: str, category: str = None, on_progress=None) -> int:
+    """Generate questions until the bucket reaches QUESTION_POOL_WATERMARK. Returns how many were added.
+
+    `on_progress(text)` is called after each batch with the bucket's fill level.
+    """
+    added = 0
+    empty_batches = 0
+    while empty_batches < MAX_EMPTY_REFILL_BATCHES:
+        size = pool_size(db, company, difficulty, category)
+        if size >= settings.QUESTION_POOL_WATERMARK:
+            break
+        batch = min(settings.QUESTION_POOL_BATCH_SIZE, settings.QUESTION_POOL_WATERMARK - size)
+        questions = await request_leetcode_questions(company, _difficulty(difficulty), batch, category)
+        add_pool_questions(db, company, difficulty, questions, category=category)
+        new_size = pool_size(db, company, difficulty, category)
+        added += new_size - size
+        empty_batches = empty_batches + 1 if new_size == size else 0
+        if on_progress:
+            on_progress(f"{new_size}/{settings.QUESTION_POOL_WATERMARK} questions pooled")
+    return added
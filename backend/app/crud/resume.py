@@ -1,36 +1,87 @@
 from sqlalchemy.orm import Session
+from app.core.blob_store import DATABASE_BACKEND, get_blob_store
 from app.models.resume import Resume
 from app.schemas.resume import ResumeCreate, ResumeUpdate
+import hashlib
 import json
 
-def upsert_resume(db: Session, user_id: int, file_name: str, file_data: bytes, parsed_data: dict):
+def _store_file(db_obj: Resume, file_data: bytes, content_hash: str = None):
+    """Write the PDF to the configured blob store, or to the file_data column as a fallback."""
+    store = get_blob_store()
+    db_obj.content_hash = content_hash or hashlib.sha256(file_data).hexdigest()
+    db_obj.file_size = len(file_data)
+    if store:
+        store.put(db_obj.content_hash, file_data)
+        db_obj.storage_backend = store.name
+        db_obj.file_data = None
+    else:
+        db_obj.storage_backend = DATABASE_BACKEND
+        db_obj.file_data = file_data
+
+def release_resume_file(db: Session, storage_backend: str, content_hash: str):
+    # Blobs are content-addressed, so only drop one that no other resume points at
+    store = get_blob_store(storage_backend) if storage_backend else None
+    if not store or not content_hash:
+        return
+    in_use = db.query(Resume.id).filter(
+        Resume.storage_backend == storage_backend,
+        Resume.content_hash == content_hash
+    ).first()
+    if not in_use:
+        store.delete(content_hash)
+
+def load_resume_file(db_obj: Resume) -> bytes:
+    """Return the PDF bytes, reading them from wherever the resume was stored."""
+    store = get_blob_store(db_obj.storage_backend) if db_obj.storage_backend else None
+    if store:
+        return store.get(db_obj.content_hash)
+    return db_obj.file_data
+
+def upsert_resume(db: Session, user_id: int, file_name: str, file_data: bytes, parsed_data: dict,
+                  extracted_text: str = None, content_hash: str = None):
     db_obj = db.query(Resume).filter(Resume.user_id == user_id).first()
+    previous = (db_obj.storage_backend, db_obj.content_hash) if db_obj else None
     if db_obj:
         db_obj.file_name = file_name
-        db_obj.file_data = file_data
         db_obj.parsed_data = parsed_data
     else:
         db_obj = Resume(
             user_id=user_id,
             file_name=file_name,
-            file_data=file_data,
             parsed_data=parsed_data
         )
         db.add(db_obj)
+    _store_file(db_obj, file_data, content_hash)
+    db_obj.extracted_text = extracted_text
     db.commit()
+    if previous and previous != (db_obj.storage_backend, db_obj.content_hash):
+        release_resume_file(db, *previous)
     db.refresh(db_obj)
     return db_obj
 
 def get_resume(db: Session, user_id: int):
     return db.query(Resume).filter(Resume.user_id == user_id).first()
 
+def save_extracted_text(db: Session, db_obj: Resume, extracted_text: str, content_hash: str):
+    db_obj.extracted_text = extracted_text
+    db_obj.content_hash = content_hash
+    db.commit()
+    return db_obj
+
 def update_resume(db: Session, user_id: int, data: ResumeUpdate):
     db_obj = db.query(Resume).filter(Resume.user_id == user_id).first()
     if not db_obj:
         return None
+    previous = (db_obj.storage_backend, db_obj.content_hash)
     for field, value in data.dict(exclude_unset=True).items():
-        setattr(db_obj, field, value)
+        if field == "file_data":
+            _store_file(db_obj, value)
+            db_obj.extracted_text = None
+        else:
+            setattr(db_obj, field, value)
     db.commit()
+    if previous != (db_obj.storage_backend, db_obj.content_hash):
+        release_resume_file(db, *previous)
     db.refresh(db_obj)
     return db_obj
 
@@ -38,6 +89,8 @@ def delete_resume(db: Session, user_id: int):
     db_obj = db.query(Resume).filter(Resume.user_id == user_id).first()
     if not db_obj:
         return False
+    previous = (db_obj.storage_backend, db_obj.content_hash)
     db.delete(db_obj)
     db.commit()
-    return True 
\ No newline at end of file
+    release_resume_file(db, *previous)
+    return True
@@ -1,17 +1,96 @@
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.roadmap import Roadmap
+from app.models.roadmap_cache_entry import RoadmapCacheEntry
+from app.models.roadmap_search_term import RoadmapSearchTerm
+from app.utils.get_roadmap import get_roadmap as genai_get_roadmap
+from app.utils.get_relevant_videos import extract_roadmap_search_terms
+import hashlib
 import json
 
-def upsert_roadmap(db: Session, user_id: int, roadmap_json: dict):
+# Bump when the roadmap prompt or output format changes so memoized roadmaps are regenerated
+ROADMAP_FINGERPRINT_VERSION = 1
+# Questionnaire columns stored as ", "-joined lists; their order does not change the roadmap
+LIST_FIELDS = {"major", "minor", "interests", "target_companies", "skills", "certifications", "projects", "experience"}
+
+def upsert_roadmap(db: Session, user_id: int, roadmap_json: dict, fingerprint: str = None):
     db_obj = db.query(Roadmap).filter(Roadmap.user_id == user_id).first()
     if db_obj:
         db_obj.roadmap_json = roadmap_json
+        db_obj.questionnaire_fingerprint = fingerprint
     else:
-        db_obj = Roadmap(user_id=user_id, roadmap_json=roadmap_json)
+        db_obj = Roadmap(user_id=user_id, roadmap_json=roadmap_json, questionnaire_fingerprint=fingerprint)
         db.add(db_obj)
+    index_search_terms(db, user_id, roadmap_json)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 def get_roadmap(db: Session, user_id: int):
-    return db.query(Roadmap).filter(Roadmap.user_id == user_id).first()
\ No newline at end of file
+    return db.query(Roadmap).filter(Roadmap.user_id == user_id).first()
+
+def index_search_terms(db: Session, user_id: int, roadmap_json):
+    """Replace the user's video search terms with the ones in roadmap_json; the caller commits."""
+    db.query(RoadmapSearchTerm).filter(RoadmapSearchTerm.user_id == user_id).delete()
+    terms = extract_roadmap_search_terms(roadmap_json)
+    db.add_all(
+        RoadmapSearchTerm(user_id=user_id, position=position, phase=phase, term=term)
+        for position, (phase, term) in enumerate(terms)
+    )
+    return terms
+
+def get_search_terms(db: Session, user_id: int):
+    return db.query(RoadmapSearchTerm).filter(RoadmapSearchTerm.user_id == user_id).order_by(RoadmapSearchTerm.position).all()
+
+def roadmap_profile(questionnaire) -> dict:
+    """The questionnaire fields that shape a roadmap (everything but ids)."""
+    return {
+        column.name: getattr(questionnaire, column.name)
+        for column in questionnaire.__table__.columns if column.name not in ("id", "user_id")
+    }
+
+def _canonical(field: str, value) -> str:
+    value = " ".join((value or "").split()).lower()
+    if field in LIST_FIELDS:
+        return ", ".join(sorted(item.strip() for item in value.split(",") if item.strip()))
+    return value
+
+def questionnaire_fingerprint(questionnaire) -> str:
+    """sha256 of the normalized profile; equal for questionnaires that would produce the same roadmap."""
+    canonical = {field: _canonical(field, value) for field, value in roadmap_profile(questionnaire).items()}
+    canonical["_version"] = ROADMAP_FINGERPRINT_VERSION
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+def find_memoized_roadmap(db: Session, user_id: int, fingerprint: str):
+    """The user's roadmap if it was generated from this profile, else a fresh shared one copied to the user."""
+    db_obj = get_roadmap(db, user_id)
+    if db_obj and db_obj.questionnaire_fingerprint == fingerprint:
+        return db_obj
+    shared = db.get(RoadmapCacheEntry, fingerprint)
+    if shared is None:
+        return None
+    created_at = shared.created_at if shared.created_at.tzinfo else shared.created_at.replace(tzinfo=timezone.utc)
+    if created_at < datetime.now(timezone.utc) - timedelta(days=settings.ROADMAP_SHARED_CACHE_DAYS):
+        return None
+    return upsert_roadmap(db, user_id, shared.roadmap_json, fingerprint)
+
+def store_roadmap(db: Session, user_id: int, roadmap_json: dict, fingerprint: str):
+    """Save a newly generated roadmap for the user and share it with identical profiles."""
+    shared = db.get(RoadmapCacheEntry, fingerprint)
+    if shared is None:
+        db.add(RoadmapCacheEntry(fingerprint=fingerprint, roadmap_json=roadmap_json))
+    else:
+        shared.roadmap_json = roadmap_json
+        shared.created_at = datetime.now(timezone.utc)
+    return upsert_roadmap(db, user_id, roadmap_json, fingerprint)
+
+async def get_or_generate_roadmap(db: Session, questionnaire, force: bool = False):
+    """Return the user's roadmap, calling the LLM only when no memoized roadmap matches the questionnaire."""
+    fingerprint = questionnaire_fingerprint(questionnaire)
+    if not force:
+        db_obj = find_memoized_roadmap(db, questionnaire.user_id, fingerprint)
+        if db_obj:
+            return db_obj
+    roadmap_json = await genai_get_roadmap(roadmap_profile(questionnaire))
+    return store_roadmap(db, questionnaire.user_id, roadmap_json, fingerprint)
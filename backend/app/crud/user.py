@@ -1,12 +1,16 @@
 from firebase_admin import auth
 from sqlalchemy.orm import Session
+from app.crud.resume import release_resume_file
 from app.models.daily_stats import DailyStat
 from app.models.job_application import JobApplication
 from app.models.job_description_roadmap import JobDescriptionRoadmap
 from app.models.questionnaire import Questionnaire
 from app.models.resume import Resume
 from app.models.roadmap import Roadmap
+from app.models.roadmap_search_term import RoadmapSearchTerm
+from app.models.seen_question import SeenQuestion
 from app.models.user import User
+from app.models.user_streak import UserStreak
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 
 def create_user(db: Session, user: UserCreate):
@@ -56,12 +60,21 @@ def delete_user(db: Session, id: int, firebase_id: str):
         return False
 
     db.query(DailyStat).filter(DailyStat.user_id == id).delete()
+    db.query(UserStreak).filter(UserStreak.user_id == id).delete()
     db.query(JobApplication).filter(JobApplication.user_id == id).delete()
     db.query(JobDescriptionRoadmap).filter(JobDescriptionRoadmap.user_id == id).delete()
     db.query(Questionnaire).filter(Questionnaire.user_id == id).delete()
-    db.query(Resume).filter(Resume.user_id == id).delete()
     db.query(Roadmap).filter(Roadmap.user_id == id).delete()
+    db.query(RoadmapSearchTerm).filter(RoadmapSearchTerm.user_id == id).delete()
+    db.query(SeenQuestion).filter(SeenQuestion.user_id == id).delete()
+
+    resume = db.query(Resume).filter(Resume.user_id == id).first()
+    if resume:
+        released = (resume.storage_backend, resume.content_hash)
+        db.delete(resume)
 
     db.delete(db_user)
     db.commit()
+    if resume:
+        release_resume_file(db, *released)
     return True
\ No newline at end of file
@@ -0,0 +1,96 @@
+import re
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, column, func, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.youtube import search_key
+from app.models.video_catalog_entry import FTS_TABLE, TSVECTOR, VideoCatalogEntry
+
+MAX_QUERY_TERMS = 8
+MAX_PROVENANCE = 20  # searches remembered per video
+
+fts = table(FTS_TABLE, column("video_id"), column("rank"))
+
+def _terms(query: str) -> list:
+    return re.findall(r"\w+", query.lower())[:MAX_QUERY_TERMS]
+
+def _to_video(entry: VideoCatalogEntry) -> dict:
+    return {
+        "title": entry.title,
+        "video_id": entry.video_id,
+        "url": entry.url,
+        "description": entry.description,
+        "thumbnail": entry.thumbnail
+    }
+
+def _full_text_search(db: Session, terms: list):
+    """Select catalog entries matching every term, best match first, for the database in use."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"' for term in terms)
+        return (
+            select(VideoCatalogEntry)
+            .join(fts, fts.c.video_id == VideoCatalogEntry.video_id)
+            .where(literal_column(FTS_TABLE).op("MATCH")(match))
+            .order_by(fts.c.rank)
+        )
+    if dialect == "postgresql":
+        tsvector = literal_column(TSVECTOR)  # the indexed expression, verbatim, so the GIN index is used
+        tsquery = func.plainto_tsquery(literal_column("'english'"), " ".join(terms))
+        return select(VideoCatalogEntry).where(tsvector.op("@@")(tsquery)).order_by(func.ts_rank(tsvector, tsquery).desc())
+    return select(VideoCatalogEntry).where(and_(*(
+        or_(VideoCatalogEntry.title.ilike(f"%{term}%"), VideoCatalogEntry.description.ilike(f"%{term}%"))
+        for term in terms
+    ))).order_by(VideoCatalogEntry.last_seen_at.desc())
+
+def search_catalog(db: Session, query: str, duration: str = "any", language: str = "en", limit: int = 1) -> list:
+    """Catalog videos whose title or description matches every word of the query."""
+    terms = _terms(query)
+    if not terms:
+        return []
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.VIDEO_CATALOG_MAX_AGE_DAYS)
+    statement = _full_text_search(db, terms).where(
+        VideoCatalogEntry.language == language.lower(),
+        VideoCatalogEntry.last_seen_at >= cutoff
+    )
+    if duration != "any":
+        statement = statement.where(VideoCatalogEntry.duration == duration.lower())
+    return [_to_video(entry) for entry in db.scalars(statement.limit(limit))]
+
+def add_to_catalog(db: Session, query: str, duration: str, language: str, videos: list):
+    """Record search results in the catalog, along with the search that found them."""
+    if not videos:
+        return
+    normalized_query, duration, language, _ = search_key(query, duration, language, len(videos))
+    now = datetime.now(timezone.utc)
+    existing = {
+        entry.video_id: entry
+        for entry in db.query(VideoCatalogEntry).filter(VideoCatalogEntry.video_id.in_([video["video_id"] for video in videos]))
+    }
+    reindex = []
+    for video in videos:
+        entry = existing.get(video["video_id"])
+        if entry is None:
+            entry = VideoCatalogEntry(video_id=video["video_id"], language=language, queries=[])
+            existing[entry.video_id] = entry
+            db.add(entry)
+        if entry.title != video["title"] or entry.description != (video["description"] or ""):
+            reindex.append(entry)
+        entry.title = video["title"]
+        entry.description = video["description"] or ""
+        entry.thumbnail = video["thumbnail"]
+        entry.url = video["url"]
+        if duration != "any":
+            entry.duration = duration
+        if normalized_query not in entry.queries:
+            entry.queries = (entry.queries + [normalized_query])[-MAX_PROVENANCE:]
+        entry.last_seen_at = now
+
+    if reindex and db.get_bind().dialect.name == "sqlite":
+        ids = [{"video_id": entry.video_id} for entry in reindex]
+        db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE video_id = :video_id"), ids)
+        db.execute(
+            text(f"INSERT INTO {FTS_TABLE} (video_id, title, description) VALUES (:video_id, :title, :description)"),
+            [{"video_id": entry.video_id, "title": entry.title, "description": entry.description} for entry in reindex]
+        )
+    db.commit()
@@ -1,68 +1,88 @@
+import asyncio
 from sqlalchemy.orm import Session
-from app.models.questionnaire import Questionnaire
-from app.utils.get_relevant_videos import get_videos, extract_youtube_search_terms
-from app.utils.get_roadmap import get_roadmap
+from app.core.config import settings
+from app.crud.roadmap import get_roadmap, get_search_terms, index_search_terms
+from app.crud.video_catalog import add_to_catalog, search_catalog
+from app.utils.get_relevant_videos import get_videos
 
-def get_questionnaire_for_videos(db: Session, user_id: str):
+def _from_catalog(db: Session, query: str, duration: str, language: str, num_videos: int) -> list:
+    if not settings.VIDEO_CATALOG_ENABLED:
+        return []
+    return search_catalog(db, query, duration, language, num_videos)
+
+def get_videos_by_query(db: Session, query: str, duration: str = "any", language: str = "en", num_videos: int = 1):
     """
-    Get questionnaire data for video recommendations
+    Get videos based on search query
+
+    Answered from the local catalog when it has enough matches; otherwise
+    YouTube is searched and the results are added to the catalog.
     """
-    questionnaire = db.query(Questionnaire).filter(Questionnaire.user_id == user_id).first()
-    
-    if not questionnaire:
-        return None
-    
-    # Convert to dict format with safe parsing
-    questionnaire_data = {
-        "career_goal": questionnaire.career_goal or "",
-        "major": questionnaire.major or "",
-        "education_level": questionnaire.education_level or "",
-        "passions": questionnaire.passions.split(",") if questionnaire.passions else [],
-        "institution": questionnaire.institution or "",
-        "target_companies": questionnaire.target_companies.split(",") if questionnaire.target_companies else [],
-        "skills": questionnaire.skills.split(",") if questionnaire.skills else [],
-        "certifications": questionnaire.certifications.split(",") if questionnaire.certifications else [],
-        "projects": questionnaire.projects or "",
-        "experience": questionnaire.experience or "",
-        "timeline": questionnaire.timeline or "",
-        "learning_preference": questionnaire.learning_preference or "",
-        "available_hours_per_week": questionnaire.available_hours_per_week or "",
-    }
-    
-    return questionnaire_data
+    cataloged = _from_catalog(db, query, duration, language, num_videos)
+    if len(cataloged) >= num_videos:
+        return cataloged
+    videos = get_videos(query, duration, language, num_videos)
+    if settings.VIDEO_CATALOG_ENABLED:
+        add_to_catalog(db, query, duration, language, videos)
+    # A partial catalog answer beats nothing when YouTube returns no results or is over quota
+    return videos or cataloged
+
+async def _search_all(terms: list, per_term: int) -> list:
+    """Run one search per term concurrently, at most VIDEO_SEARCH_CONCURRENCY at a time."""
+    limit = asyncio.Semaphore(settings.VIDEO_SEARCH_CONCURRENCY)
+
+    async def search(term):
+        async with limit:
+            return await asyncio.to_thread(get_videos, term, "any", "en", per_term)
+
+    return await asyncio.gather(*(search(term) for term in terms))
 
-def get_videos_by_query(query: str, duration: str = "any", language: str = "en", num_videos: int = 1):
+def group_roadmap_videos(terms: list, results: list):
     """
-    Get videos based on search query
+    Merge search results into one playlist, grouped by roadmap phase.
+
+    A video found by several terms appears once, in the phase of the first
+    term that found it, with every matching term in its "search_terms".
     """
-    return get_videos(query, duration, language, num_videos)
+    merged, phases = {}, {}
+    for (phase, term), videos in zip(terms, results):
+        group = phases.setdefault(phase, {"phase": phase, "search_terms": [], "videos": []})
+        group["search_terms"].append(term)
+        for video in videos:
+            if video["video_id"] in merged:
+                merged[video["video_id"]]["search_terms"].append(term)
+                continue
+            video = {**video, "search_terms": [term]}
+            merged[video["video_id"]] = video
+            group["videos"].append(video)
+    return list(merged.values()), list(phases.values())
 
-def get_roadmap_videos(db: Session, user_id: str):
+async def get_roadmap_videos(db: Session, user_id: int):
     """
     Get videos based on user's roadmap
     """
-    questionnaire_data = get_questionnaire_for_videos(db, user_id)
-    
-    if not questionnaire_data:
-        return None, None, None, "Questionnaire not found"
-    
-    # Generate roadmap to get search terms
-    roadmap_response = get_roadmap(questionnaire_data)
-    
-    # Handle different response types
-    if hasattr(roadmap_response, 'text'):
-        roadmap_text = roadmap_response.text
-    elif isinstance(roadmap_response, str):
-        roadmap_text = roadmap_response
-    else:
-        roadmap_text = str(roadmap_response)
-    
-    search_terms = extract_youtube_search_terms(roadmap_text)
-    
-    if not search_terms:
-        return [], [], "", "No video search terms found in roadmap"
-    
-    # Get videos for first search term
-    videos = get_videos(search_terms[0], "any", "en", 5)
-    
-    return videos, search_terms, search_terms[0], None 
\ No newline at end of file
+    # Terms are indexed when the roadmap is stored, so no roadmap is generated or parsed here
+    terms = [(row.phase, row.term) for row in get_search_terms(db, user_id)]
+
+    if not terms:
+        roadmap = get_roadmap(db, user_id)
+        if not roadmap:
+            return None, None, None, None, "Roadmap not found"
+        # Roadmaps stored before the index existed are indexed on first use
+        terms = index_search_terms(db, user_id, roadmap.roadmap_json)
+        db.commit()
+
+    if not terms:
+        return [], [], "", [], "No video search terms found in roadmap"
+
+    search_terms = [term for _, term in terms]
+    per_term = settings.ROADMAP_VIDEOS_PER_TERM
+    results = [_from_catalog(db, term, "any", "en", per_term) for term in search_terms]
+    missing = [i for i, videos in enumerate(results) if len(videos) < per_term]
+    fetched = await _search_all([search_terms[i] for i in missing], per_term)
+    for i, videos in zip(missing, fetched):
+        if settings.VIDEO_CATALOG_ENABLED:
+            add_to_catalog(db, search_terms[i], "any", "en", videos)
+        results[i] = videos or results[i]
+    videos, phases = group_roadmap_videos(terms, results)
+
+    return videos, search_terms, search_terms[0], phases, None
@@ -0,0 +1,40 @@
+"""Import Blind 75 problems: `python -m app.import_blind75 problems.jsonl [--prune] [--dry-run]`.
+
+Accepts a JSON list, the GET /blind75/problems response, or JSONL with one
+problem per line. Problems are matched on title; see crud.blind75_problem.import_problems.
+"""
+import argparse
+import os
+import time
+from app.core.database import Base, SessionLocal, engine
+from app.crud.blind75_problem import IMPORT_BATCH_SIZE, import_problems, load_problem_records
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="JSON or JSONL file of problems")
+    parser.add_argument("--prune", action="store_true", help="delete problems that are not in the file")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing them")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    records = load_problem_records(args.path)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        stats = import_problems(
+            db, records, prune=args.prune, dry_run=args.dry_run,
+            source=os.path.basename(args.path), batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
+    prefix = "Dry run: " if args.dry_run else ""
+    print(
+        f"{prefix}{stats['inserted']} inserted, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+        f"{stats['deleted']} deleted, {stats['test_cases_replaced']} test case sets replaced "
+        f"in {elapsed:.2f}s (bank version {stats['version']})"
+    )
+
+if __name__ == "__main__":
+    main()
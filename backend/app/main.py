@@ -4,8 +4,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import firebase_admin
 from firebase_admin import credentials
-from app.api import behavioral_prep, blind_75, daily_stats, interview, job_application, job_description_roadmap, questionnaire, resume, roadmap, user, videos, friendship, leaderboard
-from app.core.database import Base, engine
+from app.api import behavioral_prep, blind_75, daily_stats, interview, job_application, job_description_roadmap, jobs, questionnaire, resume, roadmap, user, videos, friendship, leaderboard
+from app.core import jobs as job_queue, llm_cache
+from app.core.body_limit import BodyLimitMiddleware
+from app.core.problem_index import problem_bank, problem_index
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.core.schema import upgrade_schema
+from app.crud.daily_stats import backfill_user_streaks, user_streaks_behind
 
 load_dotenv()
 
@@ -30,6 +36,8 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Added first so it sits inside CORS and its 413s still carry CORS headers
+app.add_middleware(BodyLimitMiddleware, max_bytes=settings.MAX_REQUEST_BODY_BYTES)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -56,10 +64,30 @@ app.include_router(resume.router, prefix="/api", tags=["Resume"])
 app.include_router(user.router, prefix="/api", tags=["User"])
 app.include_router(videos.router, prefix="/api", tags=["Videos"])
 app.include_router(friendship.router, prefix="/api", tags=["Friendship"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
 
 @app.on_event("startup")
 def on_startup():
+    upgrade_schema(engine)
     Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        # Only rebuild when some user with history lacks streak state; EXISTS stops at the first one
+        if user_streaks_behind(db):
+            backfill_user_streaks(db)
+        problem_index.load(db)
+        problem_bank.load(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+async def start_job_worker():
+    if settings.JOB_WORKERS_IN_PROCESS:
+        await job_queue.start_worker()
+
+@app.on_event("shutdown")
+async def stop_job_worker():
+    await job_queue.stop_worker()
 
 @app.get("/")
 async def root():
@@ -67,4 +95,8 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/health/llm-cache")
+async def llm_cache_stats():
+    return llm_cache.stats()
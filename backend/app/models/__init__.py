@@ -5,3 +5,13 @@ from .blind75_problem import *
 from .resume import Resume
 from .daily_stats import DailyStat
 from .friendship import *
+from .user_streak import UserStreak
+from .llm_cache_entry import LLMCacheEntry
+from .job import Job
+from .pooled_question import PooledQuestion
+from .seen_question import SeenQuestion
+from .problem_test_case import ProblemTestCase
+from .problem_bank_version import ProblemBankVersion
+from .roadmap_cache_entry import RoadmapCacheEntry
+from .roadmap_search_term import RoadmapSearchTerm
+from .video_catalog_entry import VideoCatalogEntry
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer, Text, JSON, DateTime, func
+from app.core.database import Base
+import uuid
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id          = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind        = Column(String, nullable=False)
+    dedup_key   = Column(String(64), nullable=False, index=True)  # sha256 of kind + payload
+    user_id     = Column(Integer, nullable=True, index=True)
+    status      = Column(String, nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    progress    = Column(String, nullable=True)
+    payload     = Column(JSON, nullable=False)
+    result      = Column(JSON, nullable=True)
+    error       = Column(Text, nullable=True)
+    created_at  = Column(DateTime(timezone=True), server_default=func.now())
+    started_at  = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True, index=True)  # refreshed while running; the lease
+    finished_at = Column(DateTime(timezone=True), nullable=True)
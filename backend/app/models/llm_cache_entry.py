@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, func
+from app.core.database import Base
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key         = Column(String(64), primary_key=True)  # sha256 of the request
+    model       = Column(String, nullable=False)
+    response    = Column(Text, nullable=False)          # GenerateContentResponse as JSON
+    token_count = Column(Integer, default=0, nullable=False)
+    created_at  = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at  = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,18 @@
+import uuid
+from sqlalchemy import Column, String, JSON, DateTime, Index, func
+from app.core.database import Base
+
+class PooledQuestion(Base):
+    __tablename__ = "question_pool"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    company = Column(String, nullable=False)     # lower-cased target company
+    difficulty = Column(String, nullable=False)
+    category = Column(String, nullable=False)    # lower-cased, e.g. "arrays"
+    title_key = Column(String, nullable=False)   # lower-cased title, used to skip repeats
+    question = Column(JSON, nullable=False)      # LeetCodeQuestion fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_question_pool_bucket", "company", "difficulty", "category"),
+    )
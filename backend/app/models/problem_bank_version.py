@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.core.database import Base
+
+class ProblemBankVersion(Base):
+    __tablename__ = "problem_bank_version"
+
+    version    = Column(Integer, primary_key=True)  # one row per Blind 75 import that changed the bank
+    source     = Column(String, nullable=True)
+    inserted   = Column(Integer, nullable=False, default=0)
+    updated    = Column(Integer, nullable=False, default=0)
+    deleted    = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
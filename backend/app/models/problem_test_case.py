@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, JSON
+from app.core.database import Base
+
+class ProblemTestCase(Base):
+    __tablename__ = "problem_test_case"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    problem_id = Column(String, nullable=False, index=True)  # Blind75Problem.id or PooledQuestion.id
+    position = Column(Integer, nullable=False, default=0)
+    entry_point = Column(String, nullable=False)             # function, or method of class Solution
+    args = Column(JSON, nullable=False)                      # positional arguments
+    expected = Column(JSON, nullable=True)
+    compare = Column(String, nullable=False, default="exact")  # "exact" or "unordered"
+    size = Column(Integer, nullable=True)                    # input size n, for runtime reporting
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, LargeBinary, JSON, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, String, LargeBinary, JSON, DateTime, Text
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.core.database import Base
 import uuid
@@ -10,8 +10,12 @@ class Resume(Base):
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False, unique=True)
     file_name = Column(String, nullable=False)
-    file_data = Column(LargeBinary, nullable=False)  # Store PDF as binary
+    file_data = deferred(Column(LargeBinary, nullable=True))  # PDF bytes when stored in the database
     parsed_data = Column(JSON, nullable=False)       # Store parsed fields as JSON
+    content_hash = Column(String(64), nullable=True)  # sha256 of the PDF, also its blob store key
+    file_size = Column(Integer, nullable=True)
+    storage_backend = Column(String, nullable=True)   # None or "database" means file_data holds the PDF
+    extracted_text = Column(Text, nullable=True)      # PDF text extracted for content_hash
     uploaded_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", backref="resume", uselist=False) 
\ No newline at end of file
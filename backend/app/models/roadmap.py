@@ -8,5 +8,6 @@ class Roadmap(Base):
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4())) 
     user_id = Column(Integer, ForeignKey("user.id"), unique=True, nullable=False)
     roadmap_json = Column(JSON, nullable=False)
+    questionnaire_fingerprint = Column(String(64), nullable=True)  # profile the roadmap was generated from
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, JSON, DateTime, func
+from app.core.database import Base
+
+class RoadmapCacheEntry(Base):
+    __tablename__ = "roadmap_cache"
+
+    fingerprint  = Column(String(64), primary_key=True)  # questionnaire_fingerprint of the profile it was generated for
+    roadmap_json = Column(JSON, nullable=False)
+    created_at   = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
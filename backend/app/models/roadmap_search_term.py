@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.core.database import Base
+
+class RoadmapSearchTerm(Base):
+    __tablename__ = "roadmap_search_term"
+
+    id       = Column(Integer, primary_key=True, index=True)
+    user_id  = Column(Integer, ForeignKey("user.id"), index=True, nullable=False)
+    position = Column(Integer, nullable=False)  # order the roadmap lists the term in
+    phase    = Column(String, nullable=True)  # title of the roadmap phase the term came from, if any
+    term     = Column(String, nullable=False)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from app.core.database import Base
+
+class SeenQuestion(Base):
+    __tablename__ = "seen_question"
+
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    question_id = Column(String, ForeignKey("question_pool.id"), primary_key=True)
+    seen_at = Column(DateTime(timezone=True), server_default=func.now())
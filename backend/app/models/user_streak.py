@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, func
+from app.core.database import Base
+
+class UserStreak(Base):
+    __tablename__ = "user_streaks"
+
+    user_id             = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    current_streak      = Column(Integer, default=0, nullable=False, index=True)
+    last_completed_date = Column(Date, nullable=True)
+    last_stat_date      = Column(Date, nullable=True)
+    updated_at          = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Text, JSON, DateTime, DDL, Index, event, func
+from app.core.database import Base
+
+class VideoCatalogEntry(Base):
+    __tablename__ = "video_catalog"
+
+    video_id     = Column(String, primary_key=True)
+    title        = Column(String, nullable=False)
+    description  = Column(Text, nullable=False, default="")
+    thumbnail    = Column(String, nullable=True)
+    url          = Column(String, nullable=False)
+    language     = Column(String, nullable=False)  # relevanceLanguage of the searches that returned it
+    duration     = Column(String, nullable=True)   # videoDuration filter it matched, None if only seen under "any"
+    queries      = Column(JSON, nullable=False, default=list)  # normalized searches that returned it
+    created_at   = Column(DateTime(timezone=True), server_default=func.now())
+    last_seen_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_video_catalog_language_seen", "language", "last_seen_at"),
+    )
+
+# Full-text index over title and description: an FTS5 table kept in sync by
+# app/crud/video_catalog.py on SQLite, an expression GIN index on Postgres
+FTS_TABLE = "video_catalog_fts"
+TSVECTOR = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+event.listen(VideoCatalogEntry.__table__, "after_create", DDL(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(video_id UNINDEXED, title, description, tokenize='porter unicode61')"
+).execute_if(dialect="sqlite"))
+event.listen(VideoCatalogEntry.__table__, "before_drop", DDL(
+    f"DROP TABLE IF EXISTS {FTS_TABLE}"
+).execute_if(dialect="sqlite"))
+event.listen(VideoCatalogEntry.__table__, "after_create", DDL(
+    f"CREATE INDEX IF NOT EXISTS ix_video_catalog_tsv ON video_catalog USING GIN ({TSVECTOR})"
+).execute_if(dialect="postgresql"))
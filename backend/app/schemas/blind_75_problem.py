@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 class Line(BaseModel):
@@ -6,6 +6,7 @@ class Line(BaseModel):
     indentLevel: int
 
 class Problem(BaseModel):
+    id: Optional[str] = None
     title: str
     type: str
     difficulty: str
@@ -14,8 +15,43 @@ class Problem(BaseModel):
     prompt: str
     solution: List[Line]
 
+class ProblemBankResponse(BaseModel):
+    version: str
+    problems: List[Problem]
+
 class WrongSubmission(BaseModel):
     user_id: int
     title: str
     problem_type: str
     difficulty: str
+
+
+class RunRequest(BaseModel):
+    code: str
+
+class TestCaseResult(BaseModel):
+    passed: bool
+    runtime_ms: Optional[float] = None
+    error: Optional[str] = None
+    size: Optional[int] = None
+
+class TestRunResult(BaseModel):
+    passed: int
+    failed: int
+    total: int
+    error: Optional[str] = None
+    cases: List[TestCaseResult]
+    runtimes_by_size: Dict[int, float]
+
+class ComplexityPoint(BaseModel):
+    size: int
+    runtime_ms: float
+
+class ComplexityEstimate(BaseModel):
+    category: str
+    complexity: Optional[str] = None
+    confidence: float
+    points: List[ComplexityPoint]
+    expected: Optional[str] = None
+    matches_expected: Optional[bool] = None
+    error: Optional[str] = None
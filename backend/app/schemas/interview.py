@@ -31,6 +31,7 @@ class TechnicalInterviewRequest(BaseModel):
     target_company: str
     difficulty: DifficultyLevel
     num_questions: int
+    category: Optional[str] = None
 
 class LeetCodeQuestion(BaseModel):
     id: str
@@ -53,6 +54,7 @@ class UserAnswer(BaseModel):
     user_answer: str
     target_company: str
     difficulty: DifficultyLevel
+    measure_complexity: bool = False  # also time the answer at growing input sizes once every test passes
 
 class AnswerFeedback(BaseModel):
     question_id: str
@@ -60,4 +62,24 @@ class AnswerFeedback(BaseModel):
     score: int 
     suggestions: List[str]
     time_complexity: str
-    space_complexity: str 
\ No newline at end of file
+    space_complexity: str
+    tests_passed: Optional[int] = None  # set when the question has stored test cases
+    tests_total: Optional[int] = None
+    measured_time_complexity: Optional[str] = None  # fitted from runtimes when every test passes
+    complexity_confidence: Optional[float] = None
+
+class BatchEvaluationRequest(BaseModel):
+    session_id: Optional[str] = None
+    answers: List[UserAnswer]
+
+class AnswerEvaluationResult(BaseModel):
+    question_id: str
+    feedback: Optional[AnswerFeedback] = None
+    error: Optional[str] = None
+
+class BatchEvaluationResponse(BaseModel):
+    session_id: Optional[str] = None
+    results: List[AnswerEvaluationResult]
+    average_score: Optional[float] = None  # over the answers that were graded
+    evaluated: int
+    failed: int
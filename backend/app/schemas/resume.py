@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Any
 from datetime import datetime
 
@@ -29,7 +29,7 @@ class ResumeFeedbackItem(BaseModel):
     original: str
     grade: str
     feedback: str
-    options: list[str]
+    options: list[str] = Field(min_length=2, max_length=2)
 
 class ResumeFeedbackResponse(BaseModel):
     feedback: str
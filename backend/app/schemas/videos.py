@@ -7,10 +7,16 @@ class VideoResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RoadmapVideoPhase(BaseModel):
+    phase: Optional[str] = None  # None for terms not tied to a roadmap phase
+    search_terms: List[str]
+    videos: List[Dict[str, Any]]
+
 class RoadmapVideoResponse(BaseModel):
     videos: List[Dict[str, Any]]
     search_terms: List[str]
     selected_term: str
+    phases: List[RoadmapVideoPhase] = []
     message: Optional[str] = None
 
     class Config:
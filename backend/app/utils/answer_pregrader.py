@@ -0,0 +1,119 @@
+import ast
+import re
+
+# Line the Blind 75 editor leaves in place of each removed line
+PLACEHOLDER_RE = re.compile(r"^\s*(#|//)\s*(type (your )?answer here|your code here)\b.*$", re.IGNORECASE)
+PYTHON_LINE_RE = re.compile(r"^\s*(def|class|elif|else|for|while|if|try|except|with)\b.*:\s*(#.*)?$")
+BRACE_FUNCTION_RE = re.compile(r"\)\s*(const\s*)?(->\s*[\w<>\[\], ]+\s*)?\{(?P<body>[^{}]*)\}", re.DOTALL)
+TRIVIAL_BRACE_BODY_RE = re.compile(r"^\s*(return\s*(0|null|nullptr|None|false|true|-1|\"\"|\[\]|\{\}|new \w+(<[^>]*>)?\(\))?\s*;\s*)?$")
+
+# An answer with at least this share of its lines still placeholders is not graded by the LLM
+PLACEHOLDER_INSTANT_RATIO = 0.5
+# Correctness is 40% of the rubric, so an unfinished answer scores at most this much
+MAX_INCOMPLETE_SCORE = 40
+STUB_SCORE = 5
+SYNTAX_ERROR_SCORE = 10
+
+def _result(feedback, score, suggestions):
+    return {
+        "feedback": feedback,
+        "score": score,
+        "suggestions": suggestions,
+        "time_complexity": "Unknown",
+        "space_complexity": "Unknown"
+    }
+
+def _is_docstring(node) -> bool:
+    return isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+
+def _is_trivial_statement(node) -> bool:
+    if isinstance(node, ast.Pass) or _is_docstring(node):
+        return True
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+        return True  # `...`
+    if isinstance(node, ast.Return):
+        return node.value is None or isinstance(node.value, ast.Constant)
+    if isinstance(node, ast.Raise) and node.exc is not None:
+        exc = node.exc.func if isinstance(node.exc, ast.Call) else node.exc
+        return isinstance(exc, ast.Name) and exc.id == "NotImplementedError"
+    return False
+
+def _is_python_stub(tree: ast.Module) -> bool:
+    """True when the code only declares classes/functions whose bodies do nothing."""
+    functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+    if functions:
+        return all(all(_is_trivial_statement(statement) for statement in function.body) for function in functions) and all(
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Import, ast.ImportFrom))
+            or _is_trivial_statement(node)
+            for node in _top_level_statements(tree)
+        )
+    # Without functions only an empty module or bare `pass`/`...` counts; a lone string may be a prose answer
+    return all(
+        isinstance(node, ast.Pass) or (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and node.value.value is Ellipsis)
+        for node in tree.body
+    )
+
+def _top_level_statements(tree: ast.Module):
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            yield from (child for child in node.body if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)))
+        else:
+            yield node
+
+def _looks_like_python(lines) -> bool:
+    return any(PYTHON_LINE_RE.match(line) for line in lines) and not any(line.rstrip().endswith(("{", ";")) for line in lines)
+
+def _is_brace_stub(code: str) -> bool:
+    bodies = [match.group("body") for match in BRACE_FUNCTION_RE.finditer(code)]
+    return bool(bodies) and all(TRIVIAL_BRACE_BODY_RE.match(_strip_comments(body)) for body in bodies)
+
+def _strip_comments(code: str) -> str:
+    code = re.sub(r"/\*.*?\*/", "", code, flags=re.DOTALL)
+    return "\n".join(line.split("//", 1)[0] for line in code.splitlines()).strip()
+
+def pregrade_answer(user_answer: str):
+    """Score clearly incomplete answers without calling the LLM.
+
+    Returns an evaluation dict (same shape as evaluate_answer) for empty
+    answers, placeholder-heavy or stub code, and Python with syntax errors.
+    Returns None when the answer is worth sending to the LLM.
+    """
+    lines = [line for line in (user_answer or "").splitlines() if line.strip()]
+    if not lines:
+        return _result("No answer was submitted.", 0, ["Write a solution before submitting."])
+
+    placeholders = [line for line in lines if PLACEHOLDER_RE.match(line)]
+    ratio = len(placeholders) / len(lines)
+    if ratio >= PLACEHOLDER_INSTANT_RATIO:
+        return _result(
+            f"{len(placeholders)} of {len(lines)} lines are still placeholders, so the solution is incomplete.",
+            round(MAX_INCOMPLETE_SCORE * (1 - ratio)),
+            ["Replace every \"# Type answer here\" line with working code."]
+        )
+
+    code = "\n".join(line for line in (user_answer or "").splitlines() if not PLACEHOLDER_RE.match(line))
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        # Placeholders often break indentation, so leave those answers to the LLM
+        if _looks_like_python(lines) and not placeholders:
+            return _result(
+                f"The code does not parse: {e.msg} on line {e.lineno}.",
+                SYNTAX_ERROR_SCORE,
+                ["Fix the syntax error so the solution can run."]
+            )
+        if _is_brace_stub(code):
+            return _result(
+                "The functions are declared but have empty bodies.",
+                STUB_SCORE,
+                ["Implement the function body."]
+            )
+        return None
+
+    if _is_python_stub(tree):
+        return _result(
+            "The code only declares the function signature; there is no implementation.",
+            STUB_SCORE,
+            ["Implement the function body."]
+        )
+    return None
@@ -1,20 +1,12 @@
-import os
 import json
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+from app.core.llm import generate_content, build_config, stream_text
 from app.core.prompts import behavioral_questions_prompt, behavioral_feedback_prompt
 
-load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-genai.api_key = api_key
-client = genai.Client(api_key=api_key)
-
-def generate_behavioral_questions(target_role, seniority, company, num_questions, difficulty):
+async def generate_behavioral_questions(target_role, seniority, company, num_questions, difficulty):
     prompt = behavioral_questions_prompt(target_role, seniority, company, num_questions, difficulty)
-    res = client.models.generate_content(
+    res = await generate_content(
         model="gemini-2.5-flash",
-        config=types.GenerateContentConfig(
+        config=build_config(
             system_instruction="You are a professional behavioral interview assistant.",
             temperature=1.2
         ),
@@ -29,16 +21,10 @@ def generate_behavioral_questions(target_role, seniority, company, num_questions
         questions = [q.strip("0123456789. ").strip() for q in text.strip().split("\n") if q.strip()]
     return questions
 
-def generate_behavioral_feedback(target_role, seniority, company, question, answer, difficulty, pause_analysis=None):
-    prompt = behavioral_feedback_prompt(target_role, seniority, company, question, answer, difficulty, pause_analysis)
-    res = client.models.generate_content(
-        model="gemini-2.5-flash",
-        config=types.GenerateContentConfig(
-            system_instruction="You are a professional behavioral interview assistant."
-        ),
-        contents=prompt
-    )
-    feedback = res.text if hasattr(res, "text") else str(res)
+FEEDBACK_SYSTEM_INSTRUCTION = "You are a professional behavioral interview assistant."
+
+def normalize_behavioral_feedback(feedback):
+    """Return the feedback if it is valid JSON, otherwise an empty feedback document."""
     try:
         json.loads(feedback)
         return feedback
@@ -49,4 +35,21 @@ def generate_behavioral_feedback(target_role, seniority, company, question, answ
             "tone": {"confident": False, "issues": [], "pauses": "No speech analysis available", "notes": ""},
             "overall_assessment": "",
             "suggestions": []
-        })
\ No newline at end of file
+        })
+
+async def generate_behavioral_feedback(target_role, seniority, company, question, answer, difficulty, pause_analysis=None):
+    prompt = behavioral_feedback_prompt(target_role, seniority, company, question, answer, difficulty, pause_analysis)
+    res = await generate_content(
+        model="gemini-2.5-flash",
+        config=build_config(
+            system_instruction=FEEDBACK_SYSTEM_INSTRUCTION
+        ),
+        contents=prompt
+    )
+    feedback = res.text if hasattr(res, "text") else str(res)
+    return normalize_behavioral_feedback(feedback)
+
+def stream_behavioral_feedback(target_role, seniority, company, question, answer, difficulty, pause_analysis=None):
+    """Streaming form of generate_behavioral_feedback; pass the joined text to normalize_behavioral_feedback."""
+    prompt = behavioral_feedback_prompt(target_role, seniority, company, question, answer, difficulty, pause_analysis)
+    return stream_text("gemini-2.5-flash", prompt, system_instruction=FEEDBACK_SYSTEM_INSTRUCTION)
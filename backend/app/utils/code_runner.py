@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.utils import sandbox_isolation
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits; submissions only run with SANDBOX_ISOLATION=false
+    resource = None
+
+HARNESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_harness.py")
+# Both scripts are passed with -c because the sandbox root does not contain the app's files
+with open(HARNESS_PATH, encoding="utf-8") as _harness:
+    HARNESS_SOURCE = _harness.read()
+with open(sandbox_isolation.__file__, encoding="utf-8") as _isolation:
+    ISOLATION_SOURCE = _isolation.read()
+MAX_RESULT_BYTES = 16 * 1024 * 1024
+MAX_ERROR_CHARS = 200
+
+_executor = ThreadPoolExecutor(max_workers=settings.SANDBOX_MAX_WORKERS, thread_name_prefix="sandbox")
+
+if not settings.SANDBOX_ISOLATION:
+    logging.warning("SANDBOX_ISOLATION is off: submitted code runs with the app's user, filesystem and network")
+
+def _sandbox_command(root: str, result_fd: int) -> list:
+    """Start the harness through sandbox_isolation.main, which isolates and rlimits it first.
+
+    This happens in the new interpreter rather than in a preexec_fn, which is
+    not safe to run from the sandbox pool's threads.
+    """
+    if resource is None:
+        return [sandbox_isolation.INTERPRETER, "-I", "-S", "-c", HARNESS_SOURCE, str(result_fd)]
+    cpu = settings.SANDBOX_CPU_SECONDS
+    memory = settings.SANDBOX_MEMORY_MB * 1024 * 1024
+    config = {
+        "isolate": settings.SANDBOX_ISOLATION,
+        "root": root,
+        "uid": settings.SANDBOX_UID,
+        "gid": settings.SANDBOX_GID,
+        "limits": {
+            "RLIMIT_CPU": (cpu, cpu + 1),
+            "RLIMIT_AS": (memory, memory),
+            "RLIMIT_FSIZE": (0, 0),
+            "RLIMIT_CORE": (0, 0),
+        },
+        "max_processes": settings.SANDBOX_MAX_PROCESSES,
+        "harness": HARNESS_SOURCE,
+    }
+    return [sandbox_isolation.INTERPRETER, "-I", "-S", "-c", ISOLATION_SOURCE, json.dumps(config), str(result_fd)]
+
+def _kill_session(proc):
+    # The child leads its own session; this reaches whatever it forked that is still in it
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+def _case_size(case: dict):
+    if case.get("size") is not None:
+        return case["size"]
+    args = case.get("args") or []
+    if args and hasattr(args[0], "__len__"):
+        return len(args[0])
+    return None
+
+def _summary(cases, results, error=None):
+    runtimes = {}
+    for case, result in zip(cases, results):
+        size = _case_size(case)
+        if size is not None and result["error"] is None:
+            runtimes.setdefault(size, []).append(result["runtime_ms"])
+    passed = sum(1 for result in results if result["passed"])
+    return {
+        "passed": passed,
+        "failed": len(cases) - passed,
+        "total": len(cases),
+        "error": error,
+        "cases": [{**result, "size": _case_size(case)} for case, result in zip(cases, results)],
+        "runtimes_by_size": {size: round(statistics.median(times), 4) for size, times in sorted(runtimes.items())}
+    }
+
+def _failed_run(cases, error):
+    return _summary(cases, [{"passed": False, "runtime_ms": None, "error": error} for _ in cases], error)
+
+def _clip(error) -> str:
+    return str(error).splitlines()[0][:MAX_ERROR_CHARS] if error else None
+
+def _normalize(value):
+    # Compare as JSON so tuples match lists and sets are ordered deterministically
+    return json.loads(json.dumps(value))
+
+def _matches(actual, expected, compare):
+    if compare == "none":
+        return True
+    expected = _normalize(expected)
+    if compare == "unordered" and isinstance(actual, list) and isinstance(expected, list):
+        return sorted(map(json.dumps, actual)) == sorted(map(json.dumps, expected))
+    return actual == expected
+
+def _grade(cases, results):
+    """Check the sandbox's return values against the expected outputs, which never enter the sandbox."""
+    if not isinstance(results, list) or len(results) != len(cases):
+        return None
+    graded = []
+    for case, result in zip(cases, results):
+        if not isinstance(result, dict) or not isinstance(result.get("runtime_ms"), (int, float)):
+            return None
+        error = _clip(result.get("error"))
+        passed = error is None and _matches(result.get("actual"), case.get("expected"), case.get("compare", "exact"))
+        graded.append({"passed": passed, "runtime_ms": float(result["runtime_ms"]), "error": error})
+    return graded
+
+def _read_all(fd, chunks):
+    with os.fdopen(fd, "rb") as pipe:
+        chunks.append(pipe.read(MAX_RESULT_BYTES + 1))
+
+def run_test_cases(code: str, entry_point: str, cases: list, timeout: float = None) -> dict:
+    """Run a Python submission against test cases in an isolated, resource-limited subprocess.
+
+    Each case is {"args": [...], "expected": ..., "compare": "exact" | "unordered" | "none",
+    "size": n}. Returns pass/fail counts, per-case results and the median
+    runtime in ms for each input size.
+
+    The sandbox only gets the arguments and returns the values the submission
+    produced, over a pipe separate from its stdout; grading happens here. If
+    the child cannot be isolated, nothing runs and every case fails.
+    """
+    if timeout is None:
+        timeout = settings.SANDBOX_TIMEOUT_SECONDS
+    if settings.SANDBOX_ISOLATION and (resource is None or not sandbox_isolation.available()):
+        return _failed_run(cases, "The code sandbox is unavailable on this server")
+    request = json.dumps({
+        "code": code,
+        "entry_point": entry_point,
+        "cases": [
+            {"args": case["args"], "repeat": case.get("repeat", 1), "report": case.get("compare") != "none"}
+            for case in cases
+        ],
+    })
+    read_fd, write_fd = os.pipe()
+    chunks = []
+    reader = threading.Thread(target=_read_all, args=(read_fd, chunks), daemon=True)
+    reader.start()
+    with tempfile.TemporaryDirectory(prefix="sandbox-") as workdir:
+        root = os.path.join(workdir, "root")
+        os.mkdir(root)
+        timed_out = False
+        try:
+            with subprocess.Popen(
+                _sandbox_command(root, write_fd),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                cwd=workdir,
+                env={"PATH": os.defpath, "PYTHONHASHSEED": "0"},
+                pass_fds=(write_fd,),
+                start_new_session=True
+            ) as proc:
+                try:
+                    _, stderr = proc.communicate(request, timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                finally:
+                    _kill_session(proc)
+                if timed_out:
+                    try:
+                        _, stderr = proc.communicate(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        stderr = ""
+        finally:
+            os.close(write_fd)
+            reader.join(timeout=5)
+    if timed_out:
+        return _failed_run(cases, f"Time limit exceeded ({timeout:g}s)")
+
+    try:
+        output = json.loads(chunks[0]) if chunks and 0 < len(chunks[0]) <= MAX_RESULT_BYTES else None
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        output = None
+    if not isinstance(output, dict):
+        if proc.returncode == sandbox_isolation.ISOLATION_FAILED:
+            # The child could not be isolated, so the submission never ran
+            logging.error(stderr.strip()[-500:])
+            return _failed_run(cases, "The code sandbox is unavailable on this server")
+        if proc.returncode < 0:
+            return _failed_run(cases, f"Submission was killed (signal {-proc.returncode}); it likely exceeded the CPU or memory limit")
+        if "MemoryError" in stderr:
+            return _failed_run(cases, "Memory limit exceeded")
+        logging.warning(f"Sandbox returned no result: {stderr[-500:]}")
+        return _failed_run(cases, "Submission crashed before producing a result")
+    if output.get("error"):
+        return _failed_run(cases, _clip(output["error"]))
+    results = _grade(cases, output.get("results"))
+    if results is None:
+        return _failed_run(cases, "Submission produced an invalid result")
+    return _summary(cases, results)
+
+async def run_test_cases_async(code: str, entry_point: str, cases: list, timeout: float = None) -> dict:
+    """run_test_cases on the sandbox pool, which caps how many submissions run at once."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, run_test_cases, code, entry_point, cases, timeout)
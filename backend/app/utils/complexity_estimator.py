@@ -0,0 +1,195 @@
+import math
+import random
+import re
+import statistics
+from app.utils.code_runner import run_test_cases_async
+
+# Input sizes double from MIN_SIZE until a size takes longer than MAX_SIZE_RUNTIME_MS
+MIN_SIZE = 64
+MAX_SIZE = 16384
+MAX_SIZE_RUNTIME_MS = 250
+REPEATS = 5
+# Calls faster than this are repeated inside one timing so the timer's resolution does not dominate
+MIN_TIMED_MS = 2
+MAX_CALLS_PER_TIMING = 200
+MIN_POINTS = 4
+# A simpler model wins unless a more complex one fits this much better
+SIMPLER_MODEL_TOLERANCE = 0.15
+# A fit predicting less growth than this across the measured sizes is a constant fit in disguise
+MIN_GROWTH = 0.1
+
+MODELS = [
+    ("O(1)", lambda n: 0.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n^2)", lambda n: float(n * n)),
+]
+
+def _ints(n, rng):
+    return [rng.randint(-10 ** 6, 10 ** 6) for _ in range(n)]
+
+def _letters(n, rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(n))
+
+def _tree_edges(n, rng):
+    # A random tree is a valid input for most graph problems (acyclic, connected)
+    return [[rng.randrange(node), node] for node in range(1, n)]
+
+# Argument generators for input size n, by problem category
+INPUT_GENERATORS = {
+    "array": lambda n, rng: [_ints(n, rng)],
+    "array_target": lambda n, rng: [_ints(n, rng), rng.randint(-10 ** 6, 10 ** 6)],
+    "string": lambda n, rng: [_letters(n, rng)],
+    "two_strings": lambda n, rng: [_letters(n, rng), _letters(n, rng)],
+    "graph": lambda n, rng: [n, _tree_edges(n, rng)],
+}
+
+def infer_category(args):
+    """Pick an input generator from the shape of a stored test case's arguments."""
+    def kind(value):
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return "int"
+        if isinstance(value, str):
+            return "str"
+        if isinstance(value, list):
+            if value and all(isinstance(item, list) for item in value):
+                return "pairs"
+            if all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+                return "ints"
+        return None
+
+    shapes = {
+        ("ints",): "array",
+        ("ints", "int"): "array_target",
+        ("str",): "string",
+        ("str", "str"): "two_strings",
+        ("int", "pairs"): "graph",
+    }
+    return shapes.get(tuple(kind(arg) for arg in args or []))
+
+def normalize_complexity(text: str):
+    """Map a complexity string such as "O(N log N)" or "O(n²)" to a model label, or None."""
+    if not text:
+        return None
+    key = re.sub(r"[\s*·\\]", "", text.lower()).replace("²", "^2")
+    key = key.replace("lg", "log").replace("(n)", "n")
+    aliases = {
+        "o(1)": "O(1)",
+        "o(logn)": "O(log n)",
+        "o(n)": "O(n)",
+        "o(nlogn)": "O(n log n)",
+        "o(n^2)": "O(n^2)",
+        "o(n2)": "O(n^2)",
+        "o(nn)": "O(n^2)",
+    }
+    return aliases.get(key)
+
+def _fit(points, f):
+    """Least squares fit of t = a + b*f(n), weighted by 1/t^2 so every size counts equally.
+
+    Returns the residual and the relative growth the fit predicts from the
+    smallest to the largest size.
+    """
+    xs = [f(n) for n, _ in points]
+    ts = [t for _, t in points]
+    ws = [1 / max(t, 1e-6) ** 2 for t in ts]
+    total = sum(ws)
+    sx = sum(w * x for w, x in zip(ws, xs))
+    sy = sum(w * t for w, t in zip(ws, ts))
+    sxx = sum(w * x * x for w, x in zip(ws, xs))
+    sxy = sum(w * x * t for w, x, t in zip(ws, xs, ts))
+    det = total * sxx - sx * sx
+    a, b = sy / total, 0.0
+    if det > 0:
+        b = (total * sxy - sx * sy) / det
+        a = (sy - b * sx) / total
+        if b < 0:
+            a, b = sy / total, 0.0
+        elif a < 0:
+            a, b = 0.0, sxy / sxx
+    rss = sum(w * (t - a - b * x) ** 2 for w, x, t in zip(ws, xs, ts))
+    start = a + b * min(xs)
+    growth = b * (max(xs) - min(xs)) / start if start > 0 else float("inf")
+    return rss, growth
+
+def fit_complexity(points):
+    """Fit (size, runtime_ms) points against each model.
+
+    Returns (label, confidence, residuals). Confidence is how much better the
+    chosen model fits than the runner-up, from 0 (indistinguishable) to 1.
+    """
+    fits = {label: _fit(points, f) for label, f in MODELS}
+    residuals = {label: rss for label, (rss, _) in fits.items()}
+    # Growth models that fit with (almost) no growth are the constant model again
+    distinct = {label: rss for label, (rss, growth) in fits.items() if label == "O(1)" or growth >= MIN_GROWTH}
+    best = min(distinct.values())
+    # Models are ordered simplest first, so the first one within tolerance wins
+    label = next(label for label, _ in MODELS if label in distinct and distinct[label] <= best * (1 + SIMPLER_MODEL_TOLERANCE) + 1e-12)
+    others = [rss for other, rss in distinct.items() if other != label]
+    if others:
+        runner_up = min(others)
+        confidence = 1 - distinct[label] / runner_up if runner_up > 0 else 0.0
+    else:
+        # Nothing grows: confidence is how flat the measurements are
+        runtimes = [t for _, t in points]
+        confidence = min(runtimes) / max(runtimes) if max(runtimes) > 0 else 0.0
+    return label, round(max(0.0, min(1.0, confidence)), 3), residuals
+
+def _size_cases(category, n, rng, calls):
+    generate = INPUT_GENERATORS[category]
+    return [{"args": generate(n, rng), "compare": "none", "size": n, "repeat": calls} for _ in range(REPEATS)]
+
+def _calls_for(previous_runtime):
+    if previous_runtime is None:
+        return MAX_CALLS_PER_TIMING // 4
+    # The next size is at least as slow, so this is an upper bound on the calls needed
+    return max(1, min(MAX_CALLS_PER_TIMING, math.ceil(MIN_TIMED_MS / max(previous_runtime, 1e-6))))
+
+async def estimate_time_complexity(code: str, entry_point: str, category: str, expected: str = None, seed: int = 0) -> dict:
+    """Time a submission on doubling generated inputs and fit its growth.
+
+    Each size runs in the sandbox pool. Returns the best-fitting model
+    (e.g. "O(n log n)") with a confidence, the measured points, and whether it
+    matches `expected` when given.
+    """
+    if category not in INPUT_GENERATORS:
+        raise ValueError(f"Unknown input category: {category}")
+    rng = random.Random(seed)
+    points = []
+    error = None
+    n = MIN_SIZE
+    while n <= MAX_SIZE:
+        calls = _calls_for(points[-1][1] if points else None)
+        run = await run_test_cases_async(code, entry_point, _size_cases(category, n, rng, calls))
+        failure = run["error"] or next((case["error"] for case in run["cases"] if case["error"]), None)
+        if failure:
+            # A failure at a large size (e.g. the time limit) still leaves the smaller sizes to fit
+            error = failure
+            break
+        runtime = statistics.median(case["runtime_ms"] for case in run["cases"])
+        points.append((n, runtime))
+        if runtime > MAX_SIZE_RUNTIME_MS:
+            break
+        n *= 2
+
+    result = {
+        "category": category,
+        "complexity": None,
+        "confidence": 0.0,
+        "points": [{"size": size, "runtime_ms": round(runtime, 6)} for size, runtime in points],
+        "expected": expected,
+        "matches_expected": None,
+        "error": error,
+    }
+    if len(points) < MIN_POINTS:
+        result["error"] = error or "Not enough input sizes completed to estimate complexity"
+        return result
+
+    result["complexity"], result["confidence"], _ = fit_complexity(points)
+    expected_label = normalize_complexity(expected)
+    if expected_label:
+        result["matches_expected"] = expected_label == result["complexity"]
+    return result
@@ -1,29 +1,13 @@
 import datetime
-from google import genai
+from app.core.llm import generate_content, build_config, stream_text
 from app.core.prompts import job_description_roadmap_prompt
 import json
-from dotenv import load_dotenv
-import os
-from google.genai import types
 
-load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-genai.api_key = api_key
-
-client = genai.Client(api_key=api_key)
-
-def generate_job_description_roadmap(profile, education, skills, job_description, current_date = datetime.datetime.now().strftime("%B %d, %Y")):
-    prompt = job_description_roadmap_prompt(profile, education, skills, job_description, current_date)
-    res = client.models.generate_content(
-        model="gemini-2.5-flash",
-        config=types.GenerateContentConfig(
-            system_instruction="You are a professional career roadmap assistant"
-        ),
-        contents=prompt
-    )
-
-    text = res.candidates[0].content.parts[0].text
+ROADMAP_CACHE_TTL = 24 * 60 * 60
+ROADMAP_MODEL = "gemini-2.5-flash"
+ROADMAP_SYSTEM_INSTRUCTION = "You are a professional career roadmap assistant"
 
+def parse_job_description_roadmap(text):
     start = text.find('{')
     end = text.rfind('}')
     if start == -1 or end == -1 or end <= start:
@@ -33,4 +17,28 @@ def generate_job_description_roadmap(profile, education, skills, job_description
         job_description_roadmap_json = json.loads(json_str)
     except Exception as e:
         raise ValueError(f"Failed to parse Gemini output as JSON. Error: {e}\nRaw output:\n{text}")
-    return job_description_roadmap_json
\ No newline at end of file
+    return job_description_roadmap_json
+
+async def generate_job_description_roadmap(profile, education, skills, job_description, current_date = datetime.datetime.now().strftime("%B %d, %Y")):
+    prompt = job_description_roadmap_prompt(profile, education, skills, job_description, current_date)
+    res = await generate_content(
+        model=ROADMAP_MODEL,
+        config=build_config(
+            system_instruction=ROADMAP_SYSTEM_INSTRUCTION
+        ),
+        contents=prompt,
+        cache_ttl=ROADMAP_CACHE_TTL
+    )
+
+    text = res.candidates[0].content.parts[0].text
+    return parse_job_description_roadmap(text)
+
+def stream_job_description_roadmap(profile, education, skills, job_description, current_date = datetime.datetime.now().strftime("%B %d, %Y")):
+    """Streaming form of generate_job_description_roadmap; pass the joined text to parse_job_description_roadmap."""
+    prompt = job_description_roadmap_prompt(profile, education, skills, job_description, current_date)
+    return stream_text(
+        ROADMAP_MODEL,
+        prompt,
+        cache_ttl=ROADMAP_CACHE_TTL,
+        system_instruction=ROADMAP_SYSTEM_INSTRUCTION
+    )
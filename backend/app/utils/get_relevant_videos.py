@@ -1,43 +1,45 @@
-import os
-from dotenv import load_dotenv
-import requests
 import re
-
-load_dotenv()
-url = 'https://www.googleapis.com/youtube/v3/search'
-api_key = os.getenv('YOUTUBE_API_KEY')
+from app.core.youtube import youtube_client
 
 def extract_youtube_search_terms(gemini_output):
     pattern = re.compile(r'^\s*-\s*\[YouTube\]\s*(.+)$', re.MULTILINE | re.IGNORECASE)
     return pattern.findall(gemini_output)
 
+PHASE_KEYS = ("phase", "title", "name")
+
+def extract_roadmap_search_terms(roadmap_json):
+    """
+    Collect (phase, term) pairs from a stored roadmap in document order.
+
+    Terms come from every "youtube_search_terms" list, tagged with the title of
+    the object holding it when that object is a roadmap phase, and from any
+    "- [YouTube] ..." lines in text values. Repeated terms are kept once.
+    """
+    found, seen = [], set()
+
+    def add(phase, term):
+        term = " ".join(term.split()) if isinstance(term, str) else ""
+        if term and term.lower() not in seen:
+            seen.add(term.lower())
+            found.append((phase, term))
+
+    def walk(node, phase):
+        if isinstance(node, dict):
+            title = next((node[key] for key in PHASE_KEYS if isinstance(node.get(key), str)), None)
+            for term in node.get("youtube_search_terms") or []:
+                add(title or phase, term)
+            for key, value in node.items():
+                if key != "youtube_search_terms":
+                    walk(value, title or phase)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, phase)
+        elif isinstance(node, str):
+            for term in extract_youtube_search_terms(node):
+                add(phase, term)
+
+    walk(roadmap_json, None)
+    return found
+
 def get_videos(query, vid_duration, language='en', num_videos=1):
-    params = {
-        'part': 'snippet',
-        'q': query,
-        'type': 'video',
-        'safeSearch': 'moderate',
-        'videoDuration': vid_duration,
-        'relevanceLanguage': language,
-        'maxResults': num_videos,
-        'key': api_key
-    }
-
-    response = requests.get(url, params=params)
-    data = response.json()
-
-    videos = data.get('items', [])
-    if not videos:
-        return []
-
-    video_list = []
-    for video in videos:
-        video_list.append({
-            "title": video['snippet']['title'],
-            "video_id": video['id']['videoId'],
-            "url": f"https://www.youtube.com/watch?v={video['id']['videoId']}",
-            "description": video['snippet']['description'],
-            "thumbnail": video['snippet']['thumbnails']['default']['url']
-        })
-    
-    return video_list
\ No newline at end of file
+    return youtube_client.search(query, vid_duration, language, num_videos)
@@ -1,39 +1,50 @@
 import datetime
-from google import genai
 import json
-from dotenv import load_dotenv
-import os
+from app.core.llm import generate_content, build_config, stream_text
 from app.core.prompts import roadmap_prompt
-from google.genai import types
 
-load_dotenv()
-api_key = os.getenv('GEMINI_API_KEY')
-genai.api_key = api_key
+ROADMAP_CACHE_TTL = 24 * 60 * 60
+ROADMAP_MODEL = "gemini-2.5-flash"
+ROADMAP_SYSTEM_INSTRUCTION = "You are a professional career roadmap assistant"
 
-client = genai.Client(api_key=api_key,)
+def parse_roadmap(text):
+    start = text.find('{')
+    end = text.rfind('}')
+    if start == -1 or end == -1 or end <= start:
+        raise ValueError(f"Gemini did not return JSON. Raw output:\n{text}")
+    json_str = text[start:end + 1]
+    try:
+        roadmap_json = json.loads(json_str)
+    except Exception as e:
+        raise ValueError(f"Failed to parse Gemini output as JSON. Error: {e}\nRaw output:\n{text}")
+    return {"roadmap": roadmap_json}
 
-def get_roadmap(questionnaire_res, current_date = datetime.datetime.now().strftime("%B %d, %Y")):
+async def get_roadmap(questionnaire_res, current_date = datetime.datetime.now().strftime("%B %d, %Y")):
     formatted_prompt = roadmap_prompt(
         json.dumps(questionnaire_res, indent=2),
         current_date
     )
-    res = client.models.generate_content(
-        model="gemini-2.5-flash",
-        config=types.GenerateContentConfig(
-          system_instruction="You are a professional career roadmap assistant"
+    res = await generate_content(
+        model=ROADMAP_MODEL,
+        config=build_config(
+          system_instruction=ROADMAP_SYSTEM_INSTRUCTION
         ),
-        contents=formatted_prompt
+        contents=formatted_prompt,
+        cache_ttl=ROADMAP_CACHE_TTL
     )
 
     text = res.candidates[0].content.parts[0].text
+    return parse_roadmap(text)
 
-    start = text.find('{')
-    end = text.rfind('}')
-    if start == -1 or end == -1 or end <= start:
-        raise ValueError(f"Gemini did not return JSON. Raw output:\n{text}")
-    json_str = text[start:end + 1]
-    try:
-        roadmap_json = json.loads(json_str)
-    except Exception as e:
-        raise ValueError(f"Failed to parse Gemini output as JSON. Error: {e}\nRaw output:\n{text}")
-    return {"roadmap": roadmap_json}
\ No newline at end of file
+def stream_roadmap(questionnaire_res, current_date = datetime.datetime.now().strftime("%B %d, %Y")):
+    """Streaming form of get_roadmap; pass the joined text to parse_roadmap."""
+    formatted_prompt = roadmap_prompt(
+        json.dumps(questionnaire_res, indent=2),
+        current_date
+    )
+    return stream_text(
+        ROADMAP_MODEL,
+        formatted_prompt,
+        cache_ttl=ROADMAP_CACHE_TTL,
+        system_instruction=ROADMAP_SYSTEM_INSTRUCTION
+    )
@@ -1,54 +1,99 @@
 import re
 from typing import List, Dict, Any
 
-# Constants for feedback parsing
-FEEDBACK_PATTERN = r'Original:\s*([^\n]+)\s*Grade:\s*([^\n]+)\s*Feedback:\s*([^\n]+(?:\n(?!- Option)[^\n]+)*)\s*(- Option 1:[^\n]+(?:\n(?!- Option)[^\n]+)*)\s*(- Option 2:[^\n]+(?:\n(?!Original:)[^\n]+)*)'
+# Constants for feedback parsing. Labels are matched one stripped line at a
+# time, so parsing is linear in the length of the model output.
+FEEDBACK_LABEL = re.compile(r'(?:[-•*] ?)?(Original|Grade|Feedback|Option ([12])):(.*)', re.IGNORECASE)
+LEADING_BULLETS = re.compile(r'[•\-]? *[•\-]? *')
+FEEDBACK_FIELDS = ("original", "grade", "feedback", "option1", "option2")
+MULTILINE_FIELDS = {"feedback", "option1", "option2"}
+LABEL_STARTS = frozenset("OoGgFf-•*")  # first characters a labelled line can have
+INTRO_MARKERS = ("detailed analysis", "here's", "analysis of")
+INCOMPLETE_ENDINGS = ("...", "..", "etc", "etc.")
+
+def _build_item(fields: Dict[str, List[str]]):
+    """Turn one parsed Original/Grade/Feedback/Option block into a feedback item, or None to skip it."""
+    if any(field not in fields for field in FEEDBACK_FIELDS):
+        return None
+    fields = {name: "\n".join(lines) for name, lines in fields.items()}
+
+    # Remove bullet points from original text
+    original_text = LEADING_BULLETS.sub('', fields["original"].strip(), count=1).strip()
+
+    # Skip items that are just intro text
+    original_lower = original_text.lower()
+    if any(marker in original_lower for marker in INTRO_MARKERS):
+        return None
+
+    # Clean up options
+    complete_options = [
+        option.strip() for option in (fields["option1"], fields["option2"])
+        if len(option.strip()) > 15 and not option.strip().endswith(INCOMPLETE_ENDINGS)
+    ]
+    if len(complete_options) < 2:
+        return None
+
+    return {
+        "original": original_text,
+        "grade": fields["grade"].strip(),
+        "feedback": fields["feedback"].strip(),
+        "options": complete_options
+    }
 
 def parse_feedback_response(feedback_text: str) -> List[Dict[str, Any]]:
-    """Parse the AI feedback response to extract structured feedback items."""
+    """Parse the AI feedback response to extract structured feedback items.
+
+    A single pass over the lines: an "Original:" label starts a new block, the
+    other labels fill in its fields, and unlabelled lines continue the
+    feedback or option they follow until a blank line. Blocks missing a field
+    are dropped.
+    """
     
     if not feedback_text:
         return []
     
-    matches = re.findall(FEEDBACK_PATTERN, feedback_text, re.DOTALL)
     items = []
+    fields, current = None, None
     
-    for match in matches:
-        original_text = match[0].strip()
-        grade = match[1].strip()
-        feedback = match[2].strip()
-        option1 = match[3].replace('- Option 1:', '').strip()
-        option2 = match[4].replace('- Option 2:', '').strip()
-        
-        # Remove bullet points from original text
-        original_text = re.sub(r'^[•\-]\s*', '', original_text)
-        original_text = re.sub(r'^\s*[•\-]\s*', '', original_text)
-        original_text = original_text.strip()
-        
-        # Skip items that are just intro text
-        original_lower = original_text.lower()
-        if ('detailed analysis' in original_lower or 
-            'here\'s' in original_lower or
-            'analysis of' in original_lower):
-            continue
-        
-        # Clean up options
-        complete_options = []
-        for option in [option1, option2]:
-            option_text = option.strip()
-            if (len(option_text) > 15 and 
-                not option_text.endswith('...') and 
-                not option_text.endswith('..') and
-                not option_text.endswith('etc') and
-                not option_text.endswith('etc.')):
-                complete_options.append(option_text)
-        
-        if len(complete_options) >= 2:
-            items.append({
-                "original": original_text,
-                "grade": grade,
-                "feedback": feedback,
-                "options": complete_options
-            })
+    for line in feedback_text.splitlines():
+        line = line.strip()
+        label = FEEDBACK_LABEL.match(line) if line[:1] in LABEL_STARTS else None
+        if label:
+            name = label.group(1).lower()
+            name = f"option{label.group(2)}" if name.startswith("option") else name
+            if name == "original":
+                if fields:
+                    item = _build_item(fields)
+                    if item:
+                        items.append(item)
+                fields = {}
+            elif fields is None or name in fields:
+                # A field outside a block, or repeated within one, is ignored
+                current = None
+                continue
+            fields[name] = [label.group(3).strip()]
+            current = name
+        elif not line:
+            # A blank line ends a field once it has a value
+            if current and fields[current][0]:
+                current = None
+        elif current and (not fields[current][0] or current in MULTILINE_FIELDS):
+            if fields[current][0]:
+                fields[current].append(line)
+            else:
+                fields[current] = [line]
     
-    return items 
\ No newline at end of file
+    if fields:
+        item = _build_item(fields)
+        if item:
+            items.append(item)
+    
+    return items 
+
+def format_feedback_items(items) -> str:
+    """Render feedback items in the text format parse_feedback_response reads."""
+    return "\n\n".join(
+        f"Original: {item.original}\nGrade: {item.grade}\nFeedback: {item.feedback}\n"
+        + "\n".join(f"- Option {i}: {option}" for i, option in enumerate(item.options, 1))
+        for item in items
+    )
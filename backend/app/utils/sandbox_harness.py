@@ -0,0 +1,98 @@
+"""Runs inside the sandbox subprocess started by code_runner; do not import app modules here.
+
+Reads {"code", "entry_point", "cases"} as JSON on stdin and writes one JSON
+object with the value, runtime and error of each case to the file descriptor
+given as its argument. Expected outputs are not sent here; code_runner grades.
+"""
+import copy
+import gc
+import io
+import json
+import os
+import sys
+import time
+
+MAX_ERROR_CHARS = 200
+
+PRELUDE = (
+    "from typing import *\n"
+    "import collections, heapq, math, bisect, itertools, functools, string, re\n"
+    "from collections import Counter, defaultdict, deque, OrderedDict\n"
+)
+
+def _block_network():
+    import socket
+
+    def blocked(*args, **kwargs):
+        raise PermissionError("Network access is disabled in the sandbox")
+
+    # Patch rather than replace socket.socket so modules that subclass it still import
+    socket.socket.__init__ = blocked
+    for name in ("create_connection", "create_server", "socketpair", "getaddrinfo", "fromfd"):
+        setattr(socket, name, blocked)
+
+def _normalize(value):
+    # Report as JSON so tuples match lists and sets are ordered deterministically
+    if isinstance(value, (set, frozenset)):
+        value = sorted(value, key=repr)
+    return json.loads(json.dumps(value, default=repr))
+
+def _describe(error):
+    # Only the exception type and the start of its message leave the sandbox
+    try:
+        message = (str(error).splitlines() or [""])[0]
+    except Exception:
+        message = ""
+    return f"{type(error).__name__}: {message}"[:MAX_ERROR_CHARS]
+
+def _resolve(namespace, entry_point):
+    if "Solution" in namespace and hasattr(namespace["Solution"], entry_point):
+        return getattr(namespace["Solution"](), entry_point)
+    return namespace[entry_point]
+
+def main():
+    results_out = os.fdopen(int(sys.argv[1]), "w")
+    request = json.loads(sys.stdin.read())
+    # Anything the submission prints is discarded
+    sys.stdout = io.StringIO()
+    _block_network()
+
+    namespace = {"__name__": "__submission__"}
+    try:
+        exec(PRELUDE, namespace)
+        exec(compile(request["code"], "<submission>", "exec"), namespace)
+        func = _resolve(namespace, request["entry_point"])
+    except BaseException as e:
+        results_out.write(json.dumps({"error": _describe(e)}))
+        results_out.close()
+        return
+
+    results = []
+    for case in request["cases"]:
+        # "repeat" times several calls and reports the mean, for calls too fast to time once.
+        # Each call gets a fresh copy of the arguments, made outside the timed region, so a
+        # solution that sorts or consumes its input in place is timed on the real input every time
+        repeat = max(1, case.get("repeat", 1))
+        elapsed = 0.0
+        try:
+            for _ in range(repeat):
+                args = copy.deepcopy(case["args"])
+                # As in timeit, keep garbage collection pauses out of the measurement
+                gc.disable()
+                start = time.perf_counter()
+                try:
+                    actual = func(*args)
+                finally:
+                    elapsed += time.perf_counter() - start
+                    gc.enable()
+            result = {"runtime_ms": elapsed / repeat * 1000, "error": None}
+            if case.get("report", True):
+                result["actual"] = _normalize(actual)
+            results.append(result)
+        except Exception as e:
+            results.append({"runtime_ms": elapsed * 1000, "error": _describe(e)})
+    results_out.write(json.dumps({"results": results}))
+    results_out.close()
+
+if __name__ == "__main__":
+    main()
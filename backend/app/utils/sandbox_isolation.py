@@ -0,0 +1,170 @@
+"""Process isolation for the code runner's sandbox children (Linux only).
+
+code_runner starts a fresh interpreter with this file's source as `-c` code
+(see `main`), so the isolation runs single-threaded, before any submission
+code exists, and then execs the harness. `isolate_child` moves the process into
+new mount, network, IPC and UTS namespaces, mounts an empty read-only root
+holding only the Python installation and system libraries, chroots into it
+and gives up every privilege:
+
+- started as root, it switches to SANDBOX_UID/SANDBOX_GID;
+- otherwise it enters a user namespace in which it is the unprivileged
+  SANDBOX_UID, so exec drops the capabilities the namespace granted.
+
+Any failure exits with ISOLATION_FAILED instead of starting the harness.
+Only the standard library may be imported here.
+"""
+import ctypes
+import ctypes.util
+import errno
+import json
+import os
+import signal
+import sys
+
+CLONE_NEWNS = 0x00020000
+CLONE_NEWPID = 0x20000000
+CLONE_NEWUTS = 0x04000000
+CLONE_NEWIPC = 0x08000000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+MS_RDONLY = 0x1
+MS_NOSUID = 0x2
+MS_NODEV = 0x4
+MS_REMOUNT = 0x20
+MS_BIND = 0x1000
+MS_REC = 0x4000
+MS_PRIVATE = 0x40000
+PR_SET_PDEATHSIG = 1
+PR_SET_NO_NEW_PRIVS = 38
+ISOLATION_FAILED = 125
+
+# Host paths visible (read-only) inside the sandbox root; symlinks such as /lib -> usr/lib are recreated
+SYSTEM_PATHS = ("/usr", "/lib", "/lib32", "/lib64", "/bin")
+DEVICES = ("null", "zero", "urandom")
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+except OSError:  # not a glibc/musl system; isolation is unavailable
+    _libc = None
+
+class IsolationError(OSError):
+    pass
+
+def _visible_paths():
+    """Paths the interpreter needs, resolved in the parent so the child only mounts them."""
+    paths = [path for path in SYSTEM_PATHS if os.path.lexists(path)]
+    for path in {sys.base_prefix, os.path.dirname(os.path.realpath(sys.executable))}:
+        if not any(path == p or path.startswith(p + "/") for p in paths if not os.path.islink(p)):
+            paths.append(path)
+    return paths
+
+VISIBLE_PATHS = _visible_paths()
+INTERPRETER = os.path.realpath(sys.executable)
+
+def available() -> bool:
+    return sys.platform.startswith("linux") and _libc is not None
+
+def _check(result, what):
+    if result != 0:
+        code = ctypes.get_errno()
+        raise IsolationError(code, f"{what}: {os.strerror(code)}")
+
+def _mount(source, target, fstype, flags, data=None):
+    _check(_libc.mount(
+        source.encode() if source else None, target.encode(), fstype.encode() if fstype else None,
+        ctypes.c_ulong(flags), data.encode() if data else None
+    ), f"mount {target}")
+
+def _write(path, text):
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.write(fd, text.encode())
+    finally:
+        os.close(fd)
+
+def _bind_read_only(source, target):
+    _mount(source, target, None, MS_BIND | MS_REC)
+    _mount(None, target, None, MS_BIND | MS_REMOUNT | MS_RDONLY | MS_NOSUID | MS_NODEV)
+
+def _build_root(root):
+    _mount("tmpfs", root, "tmpfs", MS_NOSUID | MS_NODEV, "size=64k,mode=0755")
+    for path in VISIBLE_PATHS:
+        target = root + path
+        if os.path.islink(path):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.symlink(os.readlink(path), target)
+            continue
+        os.makedirs(target, exist_ok=True)
+        _bind_read_only(path, target)
+    os.makedirs(root + "/dev")
+    for name in DEVICES:
+        target = f"{root}/dev/{name}"
+        open(target, "w").close()
+        _mount(f"/dev/{name}", target, None, MS_BIND)
+    _mount(None, root, None, MS_REMOUNT | MS_RDONLY | MS_NOSUID | MS_NODEV)
+
+def isolate_child(root: str, uid: int, gid: int):
+    """Confine the current process; see the module docstring."""
+    if not available():
+        raise IsolationError(errno.ENOSYS, "process isolation needs Linux namespaces")
+    privileged = os.geteuid() == 0
+    outer_uid, outer_gid = os.geteuid(), os.getegid()
+    # CLONE_NEWPID applies to the next child: main forks the harness into it
+    flags = CLONE_NEWNS | CLONE_NEWPID | CLONE_NEWNET | CLONE_NEWIPC | CLONE_NEWUTS
+    _check(_libc.unshare(flags if privileged else flags | CLONE_NEWUSER), "unshare")
+    if not privileged:
+        _write("/proc/self/setgroups", "deny")
+        _write("/proc/self/uid_map", f"{uid} {outer_uid} 1")
+        _write("/proc/self/gid_map", f"{gid} {outer_gid} 1")
+    # Keep the sandbox's mounts out of the host's mount namespace
+    _mount(None, "/", None, MS_REC | MS_PRIVATE)
+    _build_root(root)
+    os.chroot(root)
+    os.chdir("/")
+    if privileged:
+        os.setgroups([])
+        os.setgid(gid)
+        os.setuid(uid)
+    _check(_libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "prctl(PR_SET_NO_NEW_PRIVS)")
+
+def _exit_like(pid):
+    """Wait for `pid` and exit the same way, so code_runner sees the harness's status."""
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        sig = os.WTERMSIG(status)
+        signal.signal(sig, signal.SIG_DFL)
+        os.kill(os.getpid(), sig)
+        os._exit(128 + sig)
+    os._exit(os.WEXITSTATUS(status))
+
+def main():
+    """`python -I -S -c <this file> <config json> <result fd>`: confine, limit, then exec the harness.
+
+    With isolation the harness is forked into the new PID namespace as its
+    init: when it exits, or is killed because this process was, the kernel
+    kills every process the submission started.
+    """
+    config = json.loads(sys.argv[1])
+    try:
+        if config["isolate"]:
+            isolate_child(config["root"], config["uid"], config["gid"])
+        import resource
+        for name, (soft, hard) in config["limits"].items():
+            resource.setrlimit(getattr(resource, name), (soft, hard))
+        if config["isolate"]:
+            pid = os.fork()
+            if pid:
+                os.close(int(sys.argv[2]))
+                _exit_like(pid)
+            _check(_libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL, 0, 0, 0), "prctl(PR_SET_PDEATHSIG)")
+        # Counted per user, so set only once this process exists; caps fork bombs
+        resource.setrlimit(resource.RLIMIT_NPROC, (config["max_processes"], config["max_processes"]))
+    except Exception as e:
+        sys.stderr.write(f"Sandbox isolation failed: {e}\n")
+        sys.stderr.flush()
+        os._exit(ISOLATION_FAILED)
+    os.execv(INTERPRETER, [INTERPRETER, "-I", "-S", "-c", config["harness"], sys.argv[2]])
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,24 @@
-import os
 import json
 import uuid
 import random
-from google import genai
-from google.genai import types
 import logging
+from app.core.llm import generate_content, build_config
+from app.utils.answer_pregrader import pregrade_answer
 
-genai.api_key = os.getenv('GEMINI_API_KEY')
-client = genai.Client(api_key=genai.api_key)
+# Response cache lifetimes (seconds) for deterministic prompts; question and hint
+# generation are meant to vary and are never cached
+EVALUATION_CACHE_TTL = 24 * 60 * 60
+EXPLANATION_CACHE_TTL = 7 * 24 * 60 * 60
 
-def generate_leetcode_questions(user_profile, target_company, difficulty, num_questions):
+async def request_leetcode_questions(target_company, difficulty, num_questions, category=None):
     """
-    Generate LeetCode questions using Gemini API based on user profile and preferences
+    Ask Gemini for LeetCode-style questions. Raises when the call fails or returns invalid JSON.
     """
     import time
     import datetime
     random_seed = int(time.time() * 1000) % 10000
     current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    category_line = f"All questions must be in the {category} category.\n" if category else ""
     
     prompt = f"""
 Generate {num_questions} unique and random LeetCode-style coding questions for a {difficulty} level interview.
@@ -24,7 +26,7 @@ RANDOM SEED: {random_seed}
 TIMESTAMP: {current_time}
 Use this seed to ensure the questions are different each time and not repeated.
 Make the questions in the style of company {target_company} interviews.
-Return ONLY a valid JSON array of question objects, with each object containing:
+{category_line}Return ONLY a valid JSON array of question objects, with each object containing:
 - id (string)
 - title (string)
 - description (string)
@@ -36,60 +38,51 @@ Return ONLY a valid JSON array of question objects, with each object containing:
 - space_complexity (string)
 No explanations, no markdown, no extra text.
 """
-    
-    # Convert user profile to string format
-    profile_str = f"""
-    Career Goal: {user_profile.career_goal or 'Not specified'}
-    Major: {user_profile.major or 'Not specified'}
-    Education Level: {user_profile.education_level or 'Not specified'}
-    Skills: {user_profile.skills or 'Not specified'}
-    Experience: {user_profile.experience or 'Not specified'}
-    Projects: {user_profile.projects or 'Not specified'}
+
+    response = await generate_content(
+        model="gemini-2.0-flash-exp",
+        config=build_config(
+            temperature=0.9,
+            max_output_tokens=4000
+        ),
+        contents=prompt
+    )
+    questions_text = response.text.strip()
+    if questions_text.startswith('```json'):
+        questions_text = questions_text[7:-3]
+    elif questions_text.startswith('```'):
+        questions_text = questions_text[3:-3]
+    try:
+        questions_data = json.loads(questions_text)
+    except json.JSONDecodeError as json_err:
+        logging.error(f"Gemini returned invalid JSON: {json_err} | Partial response: {questions_text[:500]}")
+        raise
+    for question in questions_data:
+        if 'id' not in question or not question['id']:
+            question['id'] = str(uuid.uuid4())
+        if 'difficulty' in question:
+            difficulty_val = question['difficulty']
+            if isinstance(difficulty_val, str):
+                difficulty_val = difficulty_val.replace('DifficultyLevel.', '').lower()
+                question['difficulty'] = difficulty_val
+    return questions_data
+
+async def generate_leetcode_questions(user_profile, target_company, difficulty, num_questions, category=None):
+    """
+    Generate LeetCode questions using Gemini API based on user profile and preferences
     """
-    
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-exp",
-            config=types.GenerateContentConfig(
-                temperature=0.9,
-                max_output_tokens=4000
-            ),
-            contents=prompt
-        )
-        questions_text = response.text.strip()
-        if questions_text.startswith('```json'):
-            questions_text = questions_text[7:-3]
-        elif questions_text.startswith('```'):
-            questions_text = questions_text[3:-3]
-        try:
-            questions_data = json.loads(questions_text)
-        except json.JSONDecodeError as json_err:
-            logging.error(f"Gemini returned invalid JSON: {json_err} | Partial response: {questions_text[:500]}")
-            return get_fallback_questions(difficulty, num_questions)
-        for question in questions_data:
-            if 'id' not in question or not question['id']:
-                question['id'] = str(uuid.uuid4())
-            if 'difficulty' in question:
-                difficulty_val = question['difficulty']
-                if isinstance(difficulty_val, str):
-                    difficulty_val = difficulty_val.replace('DifficultyLevel.', '').lower()
-                    question['difficulty'] = difficulty_val
-        return questions_data
+        return await request_leetcode_questions(target_company, difficulty, num_questions, category)
     except Exception as e:
         # Check for Gemini 503 error (model overloaded)
         if hasattr(e, 'args') and e.args and '503' in str(e.args[0]):
             logging.error(f"Gemini model overloaded (503): {e}")
-            return get_fallback_questions(difficulty, num_questions)
-        logging.error(f"Error generating questions: {e}")
-        print(f"Response text: {response.text if 'response' in locals() and hasattr(response, 'text') else 'No response text'}")
+        else:
+            logging.error(f"Error generating questions: {e}")
         return get_fallback_questions(difficulty, num_questions)
 
-def evaluate_answer(question, user_answer, target_company, difficulty):
-    """
-    Evaluate user's answer to a LeetCode question using Gemini API
-    """
-    
-    prompt = f"""
+def evaluation_prompt(question, user_answer, target_company, difficulty):
+    return f"""
 You are a senior software engineer evaluating a coding interview answer.
 
 Question: {question}
@@ -132,39 +125,58 @@ Evaluation criteria:
 
 Score should be 0-100  Be constructive and specific.
 """
+
+async def request_answer_evaluation(question, user_answer, target_company, difficulty, test_summary=None):
+    """
+    Grade one answer with Gemini. Raises when the call fails or returns invalid JSON.
+    Clearly incomplete answers are scored locally without an LLM call.
+    """
+    pregraded = pregrade_answer(user_answer)
+    if pregraded is not None:
+        return pregraded
+
+    prompt = evaluation_prompt(question, user_answer, target_company, difficulty)
+    if test_summary:
+        prompt += f"\nThe answer was executed against the stored test cases: {test_summary}. Use this for correctness.\n"
+
+    response = await generate_content(
+        model="gemini-2.0-flash-exp",
+        config=build_config(
+            temperature=0.2,
+            max_output_tokens=2000
+        ),
+        contents=prompt,
+        cache_ttl=EVALUATION_CACHE_TTL
+    )
+    
+    feedback_text = response.text.strip()
+    
+    # Clean up the response
+    if feedback_text.startswith('```json'):
+        feedback_text = feedback_text[7:-3]
+    elif feedback_text.startswith('```'):
+        feedback_text = feedback_text[3:-3]
     
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-exp",
-            config=types.GenerateContentConfig(
-                temperature=0.2,
-                max_output_tokens=2000
-            ),
-            contents=prompt
-        )
-        
-        feedback_text = response.text.strip()
-        
-        # Clean up the response
-        if feedback_text.startswith('```json'):
-            feedback_text = feedback_text[7:-3]
-        elif feedback_text.startswith('```'):
-            feedback_text = feedback_text[3:-3]
-        
-        try:
-            feedback_data = json.loads(feedback_text)
-        except json.JSONDecodeError as json_err:
-            logging.error(f"Gemini returned invalid JSON: {json_err} | Partial response: {feedback_text[:500]}")
-            return {
-                "feedback": "Unable to evaluate answer due to invalid response from AI. Please try again.",
-                "score": 0.0,
-                "suggestions": ["Please provide a more detailed solution"],
-                "time_complexity": "Unknown",
-                "space_complexity": "Unknown"
-            }
-        
-        return feedback_data
-        
+        return json.loads(feedback_text)
+    except json.JSONDecodeError as json_err:
+        logging.error(f"Gemini returned invalid JSON: {json_err} | Partial response: {feedback_text[:500]}")
+        raise
+
+async def evaluate_answer(question, user_answer, target_company, difficulty, test_summary=None):
+    """
+    Evaluate user's answer to a LeetCode question using Gemini API
+    """
+    try:
+        return await request_answer_evaluation(question, user_answer, target_company, difficulty, test_summary)
+    except json.JSONDecodeError:
+        return {
+            "feedback": "Unable to evaluate answer due to invalid response from AI. Please try again.",
+            "score": 0.0,
+            "suggestions": ["Please provide a more detailed solution"],
+            "time_complexity": "Unknown",
+            "space_complexity": "Unknown"
+        }
     except Exception as e:
         logging.error(f"Error evaluating answer: {e}")
         return {
@@ -175,7 +187,7 @@ Score should be 0-100  Be constructive and specific.
             "space_complexity": "Unknown"
         }
 
-def generate_single_hint(question: str,
+async def generate_single_hint(question: str,
                          user_answer: str,
                          target_company: str,
                          difficulty: str) -> dict:
@@ -207,9 +219,9 @@ Return ONLY valid JSON:
 """
 
     try:
-        response = client.models.generate_content(
+        response = await generate_content(
             model="gemini-2.0-flash-exp",
-            config=types.GenerateContentConfig(
+            config=build_config(
                 temperature=0.6,
                 max_output_tokens=200
             ),
@@ -230,7 +242,7 @@ Return ONLY valid JSON:
         logging.error(f"Hint‑generation error: {e}")
         return {"hint": "Think about a different data‑structure or edge‑case you may be missing."}
 
-def generate_explanation(
+async def generate_explanation(
     question: str,
     correct_answer: str,
     answer_type: str,      # "complexity" | "approach" | "indent"
@@ -268,10 +280,11 @@ Return ONLY valid JSON:
 """
 
     try:
-        response = client.models.generate_content(
+        response = await generate_content(
             model="gemini-2.0-flash-exp",
-            config=types.GenerateContentConfig(temperature=0.5, max_output_tokens=250),
-            contents=prompt
+            config=build_config(temperature=0.5, max_output_tokens=250),
+            contents=prompt,
+            cache_ttl=EXPLANATION_CACHE_TTL
         )
 
         text = response.text.strip()
@@ -0,0 +1,18 @@
+"""Standalone job worker: `python -m app.worker`.
+
+Run it alongside the API with JOB_WORKERS_IN_PROCESS=false to keep LLM work out of the web processes.
+"""
+import asyncio
+from app.main import app  # noqa: F401  (registers the job handlers)
+from app.core import jobs
+from app.core.database import Base, engine
+from app.core.schema import upgrade_schema
+
+async def main():
+    upgrade_schema(engine)
+    Base.metadata.create_all(bind=engine)
+    await jobs.start_worker()
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Benchmark the materialized streak leaderboard on synthetic users.
+
+Run from the backend directory:
+    python -m benchmarks.leaderboard_streaks --users 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.api.leaderboard import get_leaderboard_by_streaks
+from app.crud.daily_stats import calculate_current_streak
+from app.models.daily_stats import DailyStat
+from app.models.friendship import Friendship
+from app.models.user import User
+from app.models.user_streak import UserStreak
+
+CAREER_GOALS = ["Software Engineer", "Data Scientist", "Product Manager", "ML Engineer",
+                "DevOps Engineer", "Security Engineer", "Frontend Engineer", "Backend Engineer"]
+CHUNK = 10000
+
+def seed(db, num_users, legacy_sample, rng):
+    for start in range(1, num_users + 1, CHUNK):
+        ids = range(start, min(start + CHUNK, num_users + 1))
+        db.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com",
+             "login_method": "email", "career_goal": rng.choice(CAREER_GOALS)}
+            for i in ids
+        ])
+        db.execute(insert(UserStreak), [
+            {"user_id": i, "current_streak": rng.choice([0, 0, 0, rng.randint(1, 365)])}
+            for i in ids
+        ])
+    db.execute(insert(Friendship), [
+        {"follower_id": 1, "following_id": i} for i in rng.sample(range(2, num_users + 1), 200)
+    ])
+
+    # A slice of users gets a month of history so the old per-user loop can be timed
+    today = date.today()
+    db.execute(insert(DailyStat), [
+        {"id": f"{i}-{d}", "user_id": i, "date": today - timedelta(days=d), "goal": 3,
+         "answered": rng.randint(0, 4), "score": 0, "streak": 0}
+        for i in range(1, legacy_sample + 1) for d in range(30)
+    ])
+    db.commit()
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--legacy-sample", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        seed(db, args.users, args.legacy_sample, random.Random(42))
+
+        cases = {
+            "top 10": {},
+            "top 10 by career goal": {"career_goal": CAREER_GOALS[0]},
+            "top 10 among friends": {"friends_of": 1},
+        }
+        print(f"{args.users} users, median of {args.repeat} runs")
+        for label, filters in cases.items():
+            params = {"career_goal": None, "friends_of": None, **filters}
+            ms = time_calls(lambda: get_leaderboard_by_streaks(limit=10, db=db, **params), args.repeat)
+            print(f"  materialized {label:<24} {ms:8.2f} ms")
+
+        legacy_ms = time_calls(
+            lambda: [calculate_current_streak(db, i) for i in range(1, args.legacy_sample + 1)], 1
+        )
+        projected = legacy_ms * args.users / args.legacy_sample
+        print(f"  per-user loop over {args.legacy_sample} users  {legacy_ms:8.2f} ms "
+              f"(~{projected / 1000:.1f} s projected for {args.users})")
+        db.close()
+
+if __name__ == "__main__":
+    main()
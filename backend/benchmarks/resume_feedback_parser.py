@@ -0,0 +1,81 @@
+"""Benchmark parse_feedback_response on well-formed and adversarial feedback texts.
+
+Run from the backend directory:
+    python -m benchmarks.resume_feedback_parser --max-items 16000
+"""
+import argparse
+import re
+import statistics
+import time
+
+from app.utils.resume_parser import parse_feedback_response
+
+# The single DOTALL findall the line parser replaced, kept to show the difference
+LEGACY_PATTERN = re.compile(
+    r'Original:\s*([^\n]+)\s*Grade:\s*([^\n]+)\s*Feedback:\s*([^\n]+(?:\n(?!- Option)[^\n]+)*)\s*'
+    r'(- Option 1:[^\n]+(?:\n(?!- Option)[^\n]+)*)\s*(- Option 2:[^\n]+(?:\n(?!Original:)[^\n]+)*)',
+    re.DOTALL
+)
+
+def well_formed(items):
+    return "".join(
+        f"Original: • Built feature {i} for the platform\n"
+        f"Grade: {i % 10}/10\n"
+        f"Feedback: Add scope and impact.\nMention the stack.\n"
+        f"- Option 1: Built feature {i}, used by 5,000 weekly users across three teams\n"
+        f"- Option 2: Shipped feature {i} in Python, cutting support tickets by 30%\n\n"
+        for i in range(items)
+    )
+
+def missing_options(items):
+    # Every block's feedback runs on into the next block, which made the old pattern quadratic
+    return "Original: Led a team\nGrade: 4/10\nFeedback: Too vague\n" * items
+
+def one_long_line(items):
+    return "Original: " + "x" * (items * 40)
+
+def unterminated_options(items):
+    return "- Option 1: " + "- Option 1: word " * (items * 4)
+
+TEXTS = {
+    "well formed": well_formed,
+    "missing options": missing_options,
+    "one long line": one_long_line,
+    "unterminated options": unterminated_options,
+}
+
+def time_calls(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--min-items", type=int, default=250)
+    parser.add_argument("--max-items", type=int, default=16000)
+    parser.add_argument("--legacy-max-items", type=int, default=1000, help="the old regex is quadratic; keep this small")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"median of {args.repeat} runs; growth is the time ratio per doubling (2.0 = linear)")
+    for label, make_text in TEXTS.items():
+        print(f"{label}:")
+        previous = None
+        items = args.min_items
+        while items <= args.max_items:
+            text = make_text(items)
+            ms = time_calls(lambda: parse_feedback_response(text), args.repeat)
+            growth = f"x{ms / previous:4.2f}" if previous else "     "
+            line = f"  {items:>6} items {len(text):>9} chars  parser {ms:9.2f} ms {growth}"
+            if items <= args.legacy_max_items:
+                legacy_ms = time_calls(lambda: LEGACY_PATTERN.findall(text), 1)
+                line += f"  old regex {legacy_ms:10.2f} ms"
+            print(line)
+            previous = ms
+            items *= 2
+
+if __name__ == "__main__":
+    main()
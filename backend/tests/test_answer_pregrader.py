@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from app.utils.answer_pregrader import pregrade_answer
+from app.utils.technical_interview import request_answer_evaluation
+
+SOLUTION = """class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, n in enumerate(nums):
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+"""
+
+class TestAnswerPregrader(unittest.TestCase):
+    def test_empty_answer(self):
+        self.assertEqual(pregrade_answer("  \n\n")["score"], 0)
+
+    def test_mostly_placeholders(self):
+        answer = "class Solution:\n    def twoSum(self, nums, target):\n" + "# Type answer here\n" * 4
+        result = pregrade_answer(answer)
+        self.assertEqual(result["score"], 13)
+        self.assertIn("4 of 6 lines", result["feedback"])
+
+    def test_python_stubs(self):
+        for stub in [
+            "class Solution:\n    def twoSum(self, nums, target):\n        pass",
+            "def solve(nums):\n    \"\"\"Return the answer.\"\"\"\n    ...",
+            "def solve(nums):\n    raise NotImplementedError()",
+            "def solve(nums):\n    return None\n# Type answer here",
+        ]:
+            self.assertEqual(pregrade_answer(stub)["score"], 5, stub)
+
+    def test_python_syntax_error(self):
+        result = pregrade_answer("def solve(nums):\n    for n in nums\n        print(n)")
+        self.assertEqual(result["score"], 10)
+        self.assertIn("line 2", result["feedback"])
+
+    def test_brace_language_stub(self):
+        java = "class Solution {\n    public int[] twoSum(int[] nums, int target) {\n        // TODO\n        return null;\n    }\n}"
+        self.assertEqual(pregrade_answer(java)["score"], 5)
+
+    def test_real_answers_go_to_the_llm(self):
+        self.assertIsNone(pregrade_answer(SOLUTION))
+        self.assertIsNone(pregrade_answer(SOLUTION + "# Type answer here"))
+        self.assertIsNone(pregrade_answer("I would use a hash map from value to index."))
+        java = "class Solution {\n    public int add(int a, int b) {\n        return a + b;\n    }\n}"
+        self.assertIsNone(pregrade_answer(java))
+
+    def test_stub_skips_the_llm_call(self):
+        with patch('app.utils.technical_interview.generate_content') as mock_generate:
+            result = asyncio.run(request_answer_evaluation("Two Sum", "def f():\n    pass", "Google", "easy"))
+        self.assertEqual(result["score"], 5)
+        mock_generate.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.core.problem_index import ProblemBank, current_bank_version
+from app.crud.blind75_problem import import_problems, load_problem_records
+from app.crud.problem_test_case import get_test_cases
+from app.models.blind75_problem import Blind75Problem
+
+def make_record(title, prompt="Solve it", **extra):
+    return {
+        "title": title, "type": "Array", "difficulty": "Easy", "time": "O(n)", "space": "O(1)",
+        "prompt": prompt, "solution": [{"text": "def solve(nums):", "indentLevel": 0}], **extra
+    }
+
+class TestBlind75Import(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        self.db = self.Session()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_only_changed_problems_are_written(self):
+        records = [make_record("Two Sum"), make_record("Contains Duplicate")]
+        first = import_problems(self.db, records)
+        two_sum_id = self.db.query(Blind75Problem).filter_by(title="Two Sum").one().id
+
+        unchanged = import_problems(self.db, records)
+        changed = import_problems(self.db, [make_record("Two Sum", prompt="New prompt"), make_record("Contains Duplicate")])
+
+        self.assertEqual((first["inserted"], first["version"]), (2, 1))
+        self.assertEqual((unchanged["unchanged"], unchanged["version"]), (2, 1))
+        self.assertEqual((changed["updated"], changed["unchanged"], changed["version"]), (1, 1, 2))
+        row = self.db.query(Blind75Problem).filter_by(title="Two Sum").one()
+        self.assertEqual((row.id, row.prompt, row.time_complexity), (two_sum_id, "New prompt", "O(n)"))
+
+    def test_test_cases_prune_and_dry_run(self):
+        cases = [{"entry_point": "solve", "args": [[1, 2]], "expected": 3}]
+        import_problems(self.db, [make_record("Two Sum", id="two-sum", test_cases=cases), make_record("Old")])
+
+        self.assertEqual([case.args for case in get_test_cases(self.db, "two-sum")], [[[1, 2]]])
+        dry = import_problems(self.db, [make_record("Two Sum")], prune=True, dry_run=True)
+        self.assertEqual((dry["deleted"], dry["version"]), (1, 1))
+        self.assertEqual(self.db.query(Blind75Problem).count(), 2)
+
+        pruned = import_problems(self.db, [make_record("Two Sum", test_cases=cases)], prune=True)
+        self.assertEqual((pruned["deleted"], pruned["test_cases_replaced"]), (1, 0))
+        self.assertEqual([row.title for row in self.db.query(Blind75Problem)], ["Two Sum"])
+
+    def test_invalid_records_are_rejected_before_writing(self):
+        with self.assertRaisesRegex(ValueError, "#2 .*prompt"):
+            import_problems(self.db, [make_record("Two Sum"), make_record("Broken", prompt="")])
+        self.assertEqual(self.db.query(Blind75Problem).count(), 0)
+
+    def test_views_in_other_processes_reload_on_a_new_version(self):
+        # This bank is not the module-level one the import invalidates, like a view in another process
+        bank = ProblemBank(session_factory=self.Session, refresh_seconds=3600, version_check_seconds=0)
+        import_problems(self.db, [make_record("Two Sum")])
+        before = json.loads(bank.list_body()[0])
+
+        import_problems(self.db, [make_record("Two Sum"), make_record("Valid Anagram")])
+        after = json.loads(bank.list_body()[0])
+
+        self.assertEqual(current_bank_version(self.db), 2)
+        self.assertEqual(len(before["problems"]), 1)
+        self.assertEqual(len(after["problems"]), 2)
+        self.assertNotEqual(after["version"], before["version"])
+
+    def test_load_json_and_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "bank.json")
+            jsonl_path = os.path.join(tmp, "bank.jsonl")
+            with open(json_path, "w") as f:
+                json.dump({"version": "abc", "problems": [make_record("Two Sum")]}, f)
+            with open(jsonl_path, "w") as f:
+                f.write(json.dumps(make_record("Two Sum")) + "\n\n" + json.dumps(make_record("Valid Anagram")) + "\n")
+
+            self.assertEqual(len(load_problem_records(json_path)), 1)
+            self.assertEqual(len(load_problem_records(jsonl_path)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
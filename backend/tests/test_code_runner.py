@@ -0,0 +1,179 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.core.database import Base
+from app.crud.problem_test_case import replace_test_cases, run_problem_tests, summarize_test_run
+from app.utils.code_runner import run_test_cases
+
+TWO_SUM = """
+class Solution:
+    def twoSum(self, nums: List[int], target: int) -> List[int]:
+        seen = {}
+        for i, n in enumerate(nums):
+            print("debug", i)
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+"""
+
+TWO_SUM_CASES = [
+    {"args": [[2, 7, 11, 15], 9], "expected": [0, 1]},
+    {"args": [[3, 2, 4], 6], "expected": [1, 2]},
+    {"args": [[3, 3], 6], "expected": [0, 1]},
+]
+
+class TestCodeRunner(unittest.TestCase):
+    def test_counts_passing_and_failing_cases(self):
+        cases = TWO_SUM_CASES + [{"args": [[1, 2], 3], "expected": [1, 0]}]
+
+        result = run_test_cases(TWO_SUM, "twoSum", cases)
+
+        self.assertEqual((result["passed"], result["failed"], result["total"]), (3, 1, 4))
+        self.assertIsNone(result["error"])
+        self.assertFalse(result["cases"][3]["passed"])
+        self.assertTrue(all(case["runtime_ms"] is not None for case in result["cases"]))
+
+    def test_unordered_comparison_and_module_level_functions(self):
+        code = "def subsets(nums):\n    return [[], [nums[0]]]\n"
+
+        result = run_test_cases(code, "subsets", [{"args": [[1]], "expected": [[1], []], "compare": "unordered"}])
+
+        self.assertEqual(result["passed"], 1)
+
+    def test_runtimes_are_grouped_by_input_size(self):
+        cases = [{"args": [list(range(n)), -1], "expected": None} for n in (10, 10, 100)]
+
+        result = run_test_cases(TWO_SUM, "twoSum", cases)
+
+        self.assertEqual(set(result["runtimes_by_size"]), {10, 100})
+        self.assertEqual(result["passed"], 3)
+
+    def test_repeated_calls_get_fresh_arguments(self):
+        code = "def f(nums):\n    nums.append(0)\n    return len(nums)\n"
+
+        result = run_test_cases(code, "f", [{"args": [[1, 2]], "expected": 3, "repeat": 5}])
+
+        self.assertEqual(result["passed"], 1)
+
+    def test_infinite_loop_hits_the_time_limit(self):
+        result = run_test_cases("def f(x):\n    while True:\n        pass\n", "f", [{"args": [1], "expected": 1}], timeout=2)
+
+        self.assertEqual(result["passed"], 0)
+        self.assertIn("Time limit exceeded", result["error"])
+
+    def test_forked_processes_do_not_outlive_the_run(self):
+        # The forked child renames itself so it can be found in /proc, then tries to escape the session
+        code = (
+            "import ctypes, os, time\n"
+            "def f(wait):\n"
+            "    if os.fork() == 0:\n"
+            "        ctypes.CDLL(None).prctl(15, b'sbxforkprobe', 0, 0, 0)\n"
+            "        os.setsid()\n"
+            "        time.sleep(60)\n"
+            "    time.sleep(wait)\n"
+            "    return 1\n"
+        )
+
+        def survivors():
+            found = []
+            for pid in filter(str.isdigit, os.listdir("/proc")):
+                try:
+                    with open(f"/proc/{pid}/comm") as comm:
+                        found += [pid] if comm.read().strip() == "sbxforkprobe" else []
+                except OSError:
+                    pass
+            return found
+
+        started = time.monotonic()
+        finished = run_test_cases(code, "f", [{"args": [0], "expected": 1}], timeout=2)
+        timed_out = run_test_cases(code, "f", [{"args": [60], "expected": 1}], timeout=2)
+
+        self.assertEqual(finished["passed"], 1)
+        self.assertIn("Time limit exceeded", timed_out["error"])
+        self.assertLess(time.monotonic() - started, 5)
+        time.sleep(0.2)
+        self.assertEqual(survivors(), [])
+
+    def test_network_access_is_blocked(self):
+        code = "import socket\ndef f():\n    socket.create_connection(('example.com', 80), timeout=1)\n    return 1\n"
+
+        result = run_test_cases(code, "f", [{"args": [], "expected": 1}])
+
+        self.assertFalse(result["cases"][0]["passed"])
+        self.assertIn("PermissionError", result["cases"][0]["error"])
+
+    def test_syntax_error_fails_every_case(self):
+        result = run_test_cases("def f(:\n", "f", TWO_SUM_CASES)
+
+        self.assertEqual(result["failed"], 3)
+        self.assertIn("SyntaxError", result["error"])
+
+    def test_host_files_are_not_visible(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".env", delete=False) as secret:
+            secret.write("API_KEY=hunter2")
+        self.addCleanup(os.unlink, secret.name)
+        code = f"def f():\n    raise Exception(open({secret.name!r}).read())\n"
+
+        result = run_test_cases(code, "f", [{"args": [], "expected": 1}])
+
+        self.assertIn("FileNotFoundError", result["cases"][0]["error"])
+        self.assertNotIn("hunter2", str(result))
+
+    def test_stdout_cannot_forge_a_verdict(self):
+        forged = '{"results": [{"runtime_ms": 1, "error": null, "actual": 1}], "passed": 1}'
+        code = (
+            "import os, sys\n"
+            f"def f():\n    sys.__stdout__.write({forged!r} + '\\n')\n    sys.__stdout__.flush()\n    os._exit(0)\n"
+        )
+
+        result = run_test_cases(code, "f", [{"args": [], "expected": 1}])
+
+        self.assertEqual(result["passed"], 0)
+
+    def test_errors_are_reduced_to_a_truncated_first_line(self):
+        code = "def f():\n    raise ValueError('x' * 1000 + '\\nsecond line')\n"
+
+        error = run_test_cases(code, "f", [{"args": [], "expected": 1}])["cases"][0]["error"]
+
+        self.assertTrue(error.startswith("ValueError: x"))
+        self.assertLessEqual(len(error), 200)
+        self.assertNotIn("second line", error)
+
+    def test_refuses_to_run_without_isolation(self):
+        with patch('app.utils.sandbox_isolation.available', return_value=False):
+            unavailable = run_test_cases(TWO_SUM, "twoSum", TWO_SUM_CASES)
+        # An invalid uid makes isolation fail inside the child, before the harness starts
+        with patch.object(settings, "SANDBOX_UID", -5):
+            failed = run_test_cases(TWO_SUM, "twoSum", TWO_SUM_CASES)
+
+        for result in (unavailable, failed):
+            self.assertEqual(result["passed"], 0)
+            self.assertIn("sandbox is unavailable", result["error"])
+
+class TestProblemTestCases(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_runs_stored_cases(self):
+        replace_test_cases(self.db, "two-sum", [{**case, "entry_point": "twoSum"} for case in TWO_SUM_CASES])
+
+        result = asyncio.run(run_problem_tests(self.db, "two-sum", TWO_SUM))
+
+        self.assertEqual(result["passed"], 3)
+        self.assertEqual(summarize_test_run(result), "3/3 test cases passed")
+        self.assertIsNone(asyncio.run(run_problem_tests(self.db, "unknown", TWO_SUM)))
+
+if __name__ == '__main__':
+    unittest.main()
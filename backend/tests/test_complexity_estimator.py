@@ -0,0 +1,92 @@
+import asyncio
+import math
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.crud.problem_test_case import estimate_problem_complexity, replace_test_cases
+from app.models.blind75_problem import Blind75Problem
+from app.utils.complexity_estimator import fit_complexity, infer_category, normalize_complexity
+
+SIZES = [64 * 2 ** k for k in range(8)]
+
+def points(f):
+    return [(n, 0.002 + f(n)) for n in SIZES]
+
+CONTAINS_DUPLICATE = """
+class Solution:
+    def containsDuplicate(self, nums: List[int]) -> bool:
+        seen = set()
+        for n in nums:
+            if n in seen:
+                return True
+            seen.add(n)
+        return False
+"""
+
+class TestComplexityFit(unittest.TestCase):
+    def test_picks_the_generating_model(self):
+        cases = {
+            "O(1)": lambda n: 0.0,
+            "O(log n)": lambda n: 0.001 * math.log2(n),
+            "O(n)": lambda n: 0.0001 * n,
+            "O(n log n)": lambda n: 0.00001 * n * math.log2(n),
+            "O(n^2)": lambda n: 0.000001 * n * n,
+        }
+        for expected, f in cases.items():
+            label, confidence, _ = fit_complexity(points(f))
+            self.assertEqual(label, expected)
+            self.assertGreater(confidence, 0.5)
+
+    def test_noisy_points_lower_the_confidence(self):
+        clean = fit_complexity(points(lambda n: 0.0001 * n))
+        noisy = fit_complexity([(n, t * (1.3 if i % 2 else 0.7)) for i, (n, t) in enumerate(points(lambda n: 0.0001 * n))])
+
+        self.assertLess(noisy[1], clean[1])
+
+    def test_normalize_complexity(self):
+        self.assertEqual(normalize_complexity("O(N log N)"), "O(n log n)")
+        self.assertEqual(normalize_complexity("O(n²)"), "O(n^2)")
+        self.assertEqual(normalize_complexity("O(n * n)"), "O(n^2)")
+        self.assertEqual(normalize_complexity("O(log(n))"), "O(log n)")
+        self.assertIsNone(normalize_complexity("O(m * n)"))
+
+    def test_infer_category_from_test_case_arguments(self):
+        self.assertEqual(infer_category([[1, 2, 3]]), "array")
+        self.assertEqual(infer_category([[2, 7, 11], 9]), "array_target")
+        self.assertEqual(infer_category(["anagram", "nagaram"]), "two_strings")
+        self.assertEqual(infer_category([5, [[0, 1], [1, 2]]]), "graph")
+        self.assertIsNone(infer_category([[[1, 2], [3, 4]]]))
+
+class TestProblemComplexity(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add(Blind75Problem(
+            id="contains-duplicate", title="Contains Duplicate", problem_type="Array", difficulty="Easy",
+            time_complexity="O(n)", space_complexity="O(n)", prompt="", solution=[]
+        ))
+        self.db.commit()
+        replace_test_cases(self.db, "contains-duplicate", [
+            {"entry_point": "containsDuplicate", "args": [[1, 2, 3, 1]], "expected": True},
+        ])
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_measures_a_linear_solution(self):
+        result = asyncio.run(estimate_problem_complexity(self.db, "contains-duplicate", CONTAINS_DUPLICATE))
+
+        self.assertEqual(result["category"], "array")
+        self.assertIsNone(result["error"])
+        self.assertIn(result["complexity"], ("O(n)", "O(n log n)"))
+        self.assertEqual(result["expected"], "O(n)")
+        self.assertGreaterEqual(len(result["points"]), 4)
+
+    def test_problems_without_test_cases_are_not_measured(self):
+        self.assertIsNone(asyncio.run(estimate_problem_complexity(self.db, "unknown", CONTAINS_DUPLICATE)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import random
+import unittest
+from datetime import date, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.api.leaderboard import get_leaderboard_by_streaks
+from app.crud.daily_stats import (
+    backfill_user_streaks,
+    ensure_user_streak,
+    user_streaks_behind,
+    get_or_create_daily_stat,
+    get_daily_stat,
+    update_daily_stat,
+    calculate_current_streak,
+    calculate_streaks_bulk,
+    get_stored_streak,
+    _refresh_streak
+)
+from app.models.daily_stats import DailyStat
+from app.models.friendship import Friendship
+from app.models.user import User
+from app.models.user_streak import UserStreak
+from app.schemas.daily_stats import DailyStatUpdate
+
+class TestIncrementalStreaks(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add(User(id=1, username="streaker", email="streaker@example.com", login_method="email"))
+        self.db.commit()
+        self.start = date(2025, 1, 1)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _set_day(self, offset, goal=None, answered=None):
+        stat_date = self.start + timedelta(days=offset)
+        get_or_create_daily_stat(self.db, 1, stat_date)
+        update_daily_stat(self.db, 1, stat_date, DailyStatUpdate(goal=goal, answered=answered))
+        return _refresh_streak(self.db, 1, stat_date)
+
+    def _assert_matches_reference(self):
+        for stat in self.db.query(DailyStat).filter(DailyStat.user_id == 1).all():
+            self.assertEqual(stat.streak, calculate_current_streak(self.db, 1, stat.date), stat.date)
+        last_day = self.start + timedelta(days=60)
+        self.assertEqual(get_stored_streak(self.db, 1, last_day), calculate_current_streak(self.db, 1, last_day))
+        completed = [s.date for s in self.db.query(DailyStat).all() if s.goal > 0 and s.answered >= s.goal]
+        self.assertEqual(self.db.get(UserStreak, 1).last_completed_date, max(completed, default=None))
+
+    def test_consecutive_completed_days(self):
+        for offset in range(3):
+            stat = self._set_day(offset, goal=2, answered=2)
+        self.assertEqual(stat.streak, 3)
+        self.assertEqual(self.db.get(UserStreak, 1).last_completed_date, self.start + timedelta(days=2))
+
+    def test_missed_day_keeps_previous_streak(self):
+        self._set_day(0, goal=1, answered=1)
+        self._set_day(1, goal=1, answered=1)
+        stat = self._set_day(2, goal=3, answered=1)
+        self.assertEqual(stat.streak, 2)
+        stat = self._set_day(3, goal=1, answered=1)
+        self.assertEqual(stat.streak, 1)
+
+    def test_backdated_edit_propagates_forward(self):
+        for offset in range(4):
+            self._set_day(offset, goal=1, answered=1)
+        self._set_day(1, goal=5, answered=1)
+        self.assertEqual(get_daily_stat(self.db, 1, self.start + timedelta(days=3)).streak, 2)
+        self.assertEqual(self.db.get(UserStreak, 1).current_streak, 2)
+        self._assert_matches_reference()
+
+    def test_existing_history_is_rebuilt_on_first_read(self):
+        for offset, answered in enumerate([1, 1, 0, 1]):
+            self.db.add(DailyStat(user_id=1, date=self.start + timedelta(days=offset), goal=1, answered=answered, streak=0))
+        self.db.commit()
+        self.assertEqual(get_stored_streak(self.db, 1, self.start + timedelta(days=10)), 1)
+        self._assert_matches_reference()
+
+    def test_backfill_is_only_needed_while_streaks_lag_history(self):
+        self.assertFalse(user_streaks_behind(self.db))
+        self.db.add(User(id=2, username="other", email="other@example.com", login_method="email"))
+        for user_id in (1, 2):
+            self.db.add(DailyStat(user_id=user_id, date=self.start, goal=1, answered=1, streak=0))
+        self.db.commit()
+        self.assertTrue(user_streaks_behind(self.db))
+
+        self.assertEqual(backfill_user_streaks(self.db), 2)
+        self.assertFalse(user_streaks_behind(self.db))
+        self._set_day(1, goal=1, answered=1)
+        self.assertFalse(user_streaks_behind(self.db))
+
+    def test_streak_rows_without_history_do_not_hide_missing_users(self):
+        for user_id in (2, 3):
+            self.db.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com", login_method="email"))
+        self.db.add(DailyStat(user_id=1, date=self.start, goal=1, answered=1, streak=0))
+        self.db.commit()
+        # /streak and /history create state for users who have never practiced
+        ensure_user_streak(self.db, 2)
+        ensure_user_streak(self.db, 3)
+
+        self.assertTrue(user_streaks_behind(self.db))
+        self.assertEqual(backfill_user_streaks(self.db), 1)
+        self.assertFalse(user_streaks_behind(self.db))
+
+    def test_random_edits_match_reference(self):
+        rng = random.Random(7)
+        for _ in range(150):
+            self._set_day(rng.randint(0, 40), goal=rng.choice([0, 1, 2, 3]), answered=rng.randint(0, 3))
+        self._assert_matches_reference()
+
+class TestBulkStreaks(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.start = date(2025, 1, 1)
+        rng = random.Random(11)
+        for user_id in range(1, 41):
+            self.db.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com", login_method="email"))
+            for offset in rng.sample(range(60), rng.randint(0, 45)):
+                goal = rng.choice([0, 1, 2, 3, 3])
+                self.db.add(DailyStat(user_id=user_id, date=self.start + timedelta(days=offset),
+                                      goal=goal, answered=rng.randint(0, 4)))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _assert_equivalent(self, use_window_functions):
+        user_ids = list(range(1, 42))
+        for offset in [-1, 0, 10, 29, 45, 59, 90]:
+            target_date = self.start + timedelta(days=offset)
+            expected = {user_id: calculate_current_streak(self.db, user_id, target_date) for user_id in user_ids}
+            self.assertEqual(calculate_streaks_bulk(self.db, user_ids, target_date, use_window_functions), expected)
+            active = {user_id: streak for user_id, streak in expected.items() if streak > 0}
+            self.assertEqual(calculate_streaks_bulk(self.db, target_date=target_date,
+                                                    use_window_functions=use_window_functions), active)
+
+    def test_window_functions_match_reference(self):
+        self._assert_equivalent(use_window_functions=True)
+
+    def test_ordered_scan_fallback_matches_reference(self):
+        self._assert_equivalent(use_window_functions=False)
+
+class TestStreakLeaderboard(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for user_id, goal, streak in [(1, "SWE", 3), (2, "SWE", 7), (3, "PM", 5), (4, "PM", 0)]:
+            self.db.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com",
+                             login_method="email", career_goal=goal))
+            self.db.add(UserStreak(user_id=user_id, current_streak=streak))
+        self.db.add(Friendship(follower_id=1, following_id=3))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def _leaderboard(self, **filters):
+        params = {"limit": 10, "career_goal": None, "friends_of": None, **filters}
+        return [(row["user_id"], row["streak"]) for row in get_leaderboard_by_streaks(db=self.db, **params)]
+
+    def test_orders_active_streaks(self):
+        self.assertEqual(self._leaderboard(), [(2, 7), (3, 5), (1, 3)])
+        self.assertEqual(self._leaderboard(limit=1), [(2, 7)])
+
+    def test_filters(self):
+        self.assertEqual(self._leaderboard(career_goal="PM"), [(3, 5)])
+        self.assertEqual(self._leaderboard(friends_of=1), [(3, 5), (1, 3)])
+
+    def test_updates_when_stats_change(self):
+        stat_date = date(2025, 1, 1)
+        get_or_create_daily_stat(self.db, 4, stat_date)
+        update_daily_stat(self.db, 4, stat_date, DailyStatUpdate(goal=1, answered=1))
+        _refresh_streak(self.db, 4, stat_date)
+        self.assertIn((4, 1), self._leaderboard())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core import jobs
+from app.core.config import settings
+from app.core.database import Base
+from app.crud.job import get_job, purge_finished_jobs, requeue_stale_jobs, set_job_progress
+from app.models.job import Job
+from app.models.llm_cache_entry import LLMCacheEntry
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        # A file database gives each worker thread its own connection; a shared in-memory
+        # connection lets one session's rollback undo another's uncommitted claim or finish
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        engine = create_engine(f"sqlite:///{os.path.join(tmp.name, 'jobs.db')}", connect_args={"check_same_thread": False})
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        self.db = self.Session()
+        self.calls = []
+
+        async def echo(db, job):
+            self.calls.append(job.payload)
+            if job.payload.get("fail"):
+                raise ValueError("boom")
+            return {"echo": job.payload["value"]}
+
+        patcher = patch.dict(jobs._handlers, {"echo": echo})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_identical_in_flight_jobs_are_deduplicated(self):
+        first = jobs.enqueue(self.db, "echo", {"value": 1}, user_id=1)
+        second = jobs.enqueue(self.db, "echo", {"value": 1}, user_id=1)
+        other = jobs.enqueue(self.db, "echo", {"value": 2}, user_id=1)
+
+        self.assertEqual(first.id, second.id)
+        self.assertNotEqual(first.id, other.id)
+        self.assertEqual(self.db.query(Job).count(), 2)
+
+    def test_worker_records_results_and_failures(self):
+        ok = jobs.enqueue(self.db, "echo", {"value": 1}).id
+        failed = jobs.enqueue(self.db, "echo", {"value": 2, "fail": True}).id
+
+        asyncio.run(jobs.JobWorker(concurrency=1, session_factory=self.Session).drain())
+        self.db.expire_all()
+
+        self.assertEqual((get_job(self.db, ok).status, get_job(self.db, ok).result), ("succeeded", {"echo": 1}))
+        self.assertEqual((get_job(self.db, failed).status, get_job(self.db, failed).error), ("failed", "boom"))
+        # A finished job no longer absorbs new requests
+        self.assertNotEqual(jobs.enqueue(self.db, "echo", {"value": 1}).id, ok)
+
+    def test_concurrency_is_bounded(self):
+        in_flight = 0
+        peak = 0
+
+        async def slow(db, job):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        for value in range(8):
+            jobs.enqueue(self.db, "echo", {"value": value})
+
+        async def run():
+            worker = jobs.JobWorker(concurrency=3, session_factory=self.Session, poll_seconds=0.01)
+            worker.start()
+            while self.db.query(Job).filter(Job.status != "succeeded").count():
+                self.db.expire_all()
+                await asyncio.sleep(0.01)
+            await worker.stop()
+
+        with patch.dict(jobs._handlers, {"echo": slow}):
+            asyncio.run(run())
+        self.assertEqual(peak, 3)
+
+    def test_only_jobs_with_an_expired_lease_are_requeued(self):
+        stale = jobs.enqueue(self.db, "echo", {"value": 1})
+        live = jobs.enqueue(self.db, "echo", {"value": 2})
+        now = datetime.now(timezone.utc)
+        for job, heartbeat in ((stale, now - timedelta(minutes=10)), (live, now - timedelta(seconds=10))):
+            job.status, job.started_at, job.heartbeat_at = "running", heartbeat, heartbeat
+        self.db.commit()
+
+        self.assertEqual(requeue_stale_jobs(self.db, lease_seconds=300), 1)
+        self.db.expire_all()
+        self.assertEqual(get_job(self.db, stale.id).status, "queued")
+        self.assertEqual(get_job(self.db, live.id).status, "running")
+
+    def test_running_jobs_renew_their_lease_and_report_progress(self):
+        async def slow(db, job):
+            set_job_progress(db, job, "halfway")
+            await asyncio.sleep(0.2)
+            return {}
+
+        job_id = jobs.enqueue(self.db, "echo", {"value": 1}).id
+
+        async def run():
+            worker = jobs.JobWorker(concurrency=1, session_factory=self.Session, heartbeat_seconds=0.02)
+            task = asyncio.create_task(worker.run_next())
+            await asyncio.sleep(0.1)
+            self.db.expire_all()
+            job = get_job(self.db, job_id)
+            self.assertEqual(job.progress, "halfway")
+            self.assertGreater(job.heartbeat_at, job.started_at)
+            # The renewed lease keeps a short lease timeout from requeueing it
+            self.assertEqual(requeue_stale_jobs(self.db, lease_seconds=0.08), 0)
+            await task
+
+        with patch.dict(jobs._handlers, {"echo": slow}):
+            asyncio.run(run())
+        self.db.expire_all()
+        self.assertEqual(get_job(self.db, job_id).status, "succeeded")
+
+    def test_finished_jobs_and_their_files_are_purged_after_retention(self):
+        result_path = os.path.join(self.tmp, "old.pdf")
+        open(result_path, "w").close()
+        old = jobs.enqueue(self.db, "echo", {"value": 1})
+        recent = jobs.enqueue(self.db, "echo", {"value": 2})
+        queued = jobs.enqueue(self.db, "echo", {"value": 3})
+        old.status, old.result = "succeeded", {"file_path": result_path}
+        old.finished_at = datetime.now(timezone.utc) - timedelta(hours=100)
+        recent.status, recent.finished_at = "failed", datetime.now(timezone.utc)
+        self.db.commit()
+
+        with patch.object(settings, "JOB_RESULT_DIR", self.tmp):
+            self.assertEqual(purge_finished_jobs(self.db, retention_hours=72), 1)
+
+        self.assertEqual({job.id for job in self.db.query(Job)}, {recent.id, queued.id})
+        self.assertFalse(os.path.exists(result_path))
+
+    def test_maintenance_purges_expired_llm_cache_entries(self):
+        now = datetime.now(timezone.utc)
+        for key, expires_at in [("expired", now - timedelta(seconds=1)), ("live", now + timedelta(hours=1))]:
+            self.db.add(LLMCacheEntry(key=key, model="gemini-test", response="{}", expires_at=expires_at))
+        self.db.commit()
+
+        jobs.JobWorker(concurrency=1, session_factory=self.Session)._maintain_once()
+
+        self.db.expire_all()
+        self.assertEqual([entry.key for entry in self.db.query(LLMCacheEntry)], ["live"])
+
+if __name__ == "__main__":
+    unittest.main()
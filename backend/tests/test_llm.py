@@ -0,0 +1,177 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+from google.genai import errors, types
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core import llm, llm_cache
+from app.core.database import Base
+
+def api_error(code):
+    return errors.APIError(code, {"error": {"code": code, "message": "test", "status": "TEST"}})
+
+class TestLLMGateway(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.client.aio.models.generate_content = AsyncMock()
+        patcher = patch('app.core.llm.get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        backoff = patch('app.core.llm._backoff_delay', return_value=0)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+
+    def test_retries_rate_limits_then_succeeds(self):
+        response = Mock(text="ok")
+        self.client.aio.models.generate_content.side_effect = [api_error(429), api_error(503), response]
+
+        text = asyncio.run(llm.generate_text("gemini-test", "prompt", temperature=0.1))
+
+        self.assertEqual(text, "ok")
+        self.assertEqual(self.client.aio.models.generate_content.await_count, 3)
+
+    def test_does_not_retry_client_errors(self):
+        self.client.aio.models.generate_content.side_effect = api_error(400)
+
+        with self.assertRaises(errors.APIError):
+            asyncio.run(llm.generate_text("gemini-test", "prompt"))
+        self.assertEqual(self.client.aio.models.generate_content.await_count, 1)
+
+    def test_gives_up_after_max_retries(self):
+        self.client.aio.models.generate_content.side_effect = api_error(503)
+
+        with self.assertRaises(errors.APIError):
+            asyncio.run(llm.generate_text("gemini-test", "prompt"))
+        self.assertEqual(self.client.aio.models.generate_content.await_count, llm.settings.LLM_MAX_RETRIES + 1)
+
+    def test_limits_concurrent_calls_per_model(self):
+        in_flight = 0
+        peak = 0
+
+        async def slow_generation(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Mock(text="ok")
+
+        self.client.aio.models.generate_content.side_effect = slow_generation
+
+        async def burst():
+            return await asyncio.gather(*[llm.generate_text("gemini-test", "prompt") for _ in range(10)])
+
+        with patch.object(llm.settings, "LLM_MAX_CONCURRENCY_PER_MODEL", 3):
+            results = asyncio.run(burst())
+
+        self.assertEqual(results, ["ok"] * 10)
+        self.assertEqual(peak, 3)
+
+def gemini_response(text):
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=[types.Part(text=text)]))],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=120)
+    )
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.client.aio.models.generate_content = AsyncMock(side_effect=lambda **kwargs: gemini_response("cached"))
+        patcher = patch('app.core.llm.get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        llm_cache.clear()
+        self.addCleanup(llm_cache.clear)
+
+    def _generate(self, prompt="prompt", cache_ttl=60, **config):
+        return asyncio.run(llm.generate_text("gemini-test", prompt, cache_ttl=cache_ttl, **config))
+
+    def test_identical_requests_hit_the_cache(self):
+        before = llm_cache.stats()
+        self.assertEqual(self._generate(temperature=0.2), "cached")
+        self.assertEqual(self._generate(temperature=0.2), "cached")
+        after = llm_cache.stats()
+
+        self.assertEqual(self.client.aio.models.generate_content.await_count, 1)
+        self.assertEqual(after["memory_hits"] - before["memory_hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["tokens_saved"] - before["tokens_saved"], 120)
+
+    def test_key_covers_prompt_and_settings(self):
+        self._generate(temperature=0.2)
+        self._generate(temperature=0.7)
+        self._generate(prompt="other", temperature=0.2)
+        self._generate(temperature=0.2, system_instruction="You are terse")
+        self.assertEqual(self.client.aio.models.generate_content.await_count, 4)
+
+    def test_calls_without_ttl_bypass_the_cache(self):
+        before = llm_cache.stats()["bypassed"]
+        self._generate(cache_ttl=None)
+        self._generate(cache_ttl=None)
+        self.assertEqual(self.client.aio.models.generate_content.await_count, 2)
+        self.assertEqual(llm_cache.stats()["bypassed"] - before, 2)
+
+    def test_persistent_tier_survives_memory_eviction(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        with patch('app.core.llm_cache.SessionLocal', sessionmaker(bind=engine)), \
+             patch.object(llm_cache.settings, "LLM_CACHE_PERSISTENT", True):
+            self._generate()
+            llm_cache.clear()
+            self.assertEqual(self._generate(), "cached")
+        self.assertEqual(self.client.aio.models.generate_content.await_count, 1)
+
+    def test_lru_eviction_and_expiry(self):
+        cache = llm_cache.TTLCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.set("d", 4, ttl=-1)
+        self.assertIsNone(cache.get("d"))
+
+def stream_of(*texts):
+    async def chunks():
+        for text in texts:
+            yield gemini_response(text)
+    return chunks()
+
+class TestLLMStreaming(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.client.aio.models.generate_content_stream = AsyncMock()
+        self.client.aio.models.generate_content = AsyncMock()
+        patcher = patch('app.core.llm.get_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        backoff = patch('app.core.llm._backoff_delay', return_value=0)
+        backoff.start()
+        self.addCleanup(backoff.stop)
+        llm_cache.clear()
+        self.addCleanup(llm_cache.clear)
+
+    def _collect(self, **kwargs):
+        async def collect():
+            return [delta async for delta in llm.stream_text("gemini-test", "prompt", **kwargs)]
+        return asyncio.run(collect())
+
+    def test_yields_deltas_and_caches_the_full_text(self):
+        self.client.aio.models.generate_content_stream.return_value = stream_of('{"a": ', '1}')
+
+        self.assertEqual(self._collect(cache_ttl=60), ['{"a": ', '1}'])
+        text = asyncio.run(llm.generate_text("gemini-test", "prompt", cache_ttl=60))
+
+        self.assertEqual(text, '{"a": 1}')
+        self.client.aio.models.generate_content.assert_not_awaited()
+
+    def test_retries_before_the_first_chunk(self):
+        self.client.aio.models.generate_content_stream.side_effect = [api_error(429), stream_of("ok")]
+        self.assertEqual(self._collect(), ["ok"])
+        self.assertEqual(self.client.aio.models.generate_content_stream.await_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.api.blind_75 import get_db
+from app.core.problem_index import ProblemBank, ProblemIndex
+from app.main import app
+from app.models.blind75_problem import Blind75Problem
+
+def make_problem(title, difficulty="Easy", problem_type="Array"):
+    return Blind75Problem(
+        id=title.lower().replace(" ", "-"), title=title, problem_type=problem_type, difficulty=difficulty,
+        time_complexity="O(n)", space_complexity="O(1)", prompt=title, solution=[]
+    )
+
+class TestProblemIndex(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.Session = sessionmaker(bind=engine)
+        self.db = self.Session()
+        self.db.add_all([
+            make_problem("Two Sum"),
+            make_problem("Contains Duplicate"),
+            make_problem("Valid Anagram", problem_type="String"),
+            make_problem("Group Anagrams", difficulty="Medium", problem_type="String"),
+        ])
+        self.db.commit()
+        self.index = ProblemIndex(session_factory=self.Session, refresh_seconds=3600)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_buckets_by_normalized_difficulty_and_type(self):
+        self.assertEqual(len(self.index.ids()), 4)
+        self.assertEqual(len(self.index.ids("all")), 4)
+        self.assertEqual(set(self.index.ids(" EASY ")), {"two-sum", "contains-duplicate", "valid-anagram"})
+        self.assertEqual(self.index.ids("easy", "string"), ["valid-anagram"])
+        self.assertEqual(self.index.ids(problem_type="String"), ["group-anagrams", "valid-anagram"])
+        self.assertEqual(self.index.ids("hard"), [])
+        self.assertIsNone(self.index.random_id("hard"))
+
+    def test_no_repeats_until_the_bucket_is_exhausted(self):
+        first_round = [self.index.next_unseen_id(1, "easy") for _ in range(3)]
+        second_round = [self.index.next_unseen_id(1, "easy") for _ in range(3)]
+
+        self.assertEqual(len(set(first_round)), 3)
+        self.assertEqual(set(second_round), set(first_round))
+        # Other users and other buckets have their own decks
+        self.assertEqual(len({self.index.next_unseen_id(2, "easy") for _ in range(3)}), 3)
+
+    def test_commit_invalidates_the_index_and_new_problems_join_the_deck(self):
+        served = {self.index.next_unseen_id(1, "easy") for _ in range(2)}
+
+        with patch('app.core.problem_index.problem_index', self.index):
+            self.db.add(make_problem("Missing Number"))
+            self.db.commit()
+
+        remaining = {self.index.next_unseen_id(1, "easy") for _ in range(2)}
+        self.assertIn("missing-number", self.index.ids("easy"))
+        self.assertEqual(len(served | remaining), 4)
+
+class TestProblemBankAPI(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        self.db = Session()
+        self.db.add_all([make_problem("Two Sum"), make_problem("Group Anagrams", difficulty="Medium")])
+        self.db.commit()
+        self.index = ProblemIndex(session_factory=Session, refresh_seconds=3600)
+        self.bank = ProblemBank(session_factory=Session, refresh_seconds=3600)
+        self.patches = [
+            patch('app.core.problem_index.problem_index', self.index),
+            patch('app.core.problem_index.problem_bank', self.bank),
+            patch('app.api.blind_75.problem_index', self.index),
+            patch('app.api.blind_75.problem_bank', self.bank),
+        ]
+        for p in self.patches:
+            p.start()
+        app.dependency_overrides[get_db] = lambda: self.db
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.pop(get_db, None)
+        for p in self.patches:
+            p.stop()
+        self.db.close()
+
+    def test_list_revalidates_with_etag(self):
+        response = self.client.get("/api/blind75/problems")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([p["title"] for p in data["problems"]], ["Group Anagrams", "Two Sum"])
+        self.assertEqual(response.headers["etag"], f'"{data["version"]}"')
+        self.assertIn("max-age", response.headers["cache-control"])
+
+        revalidated = self.client.get("/api/blind75/problems", headers={"If-None-Match": response.headers["etag"]})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+
+    def test_reseed_bumps_the_version(self):
+        before = self.client.get("/api/blind75/problems")
+        self.db.add(make_problem("Missing Number"))
+        self.db.commit()
+
+        after = self.client.get("/api/blind75/problems", headers={"If-None-Match": before.headers["etag"]})
+
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after.json()["version"], before.json()["version"])
+        self.assertEqual(len(after.json()["problems"]), 3)
+
+    def test_get_and_random_serve_the_snapshot(self):
+        response = self.client.get("/api/blind75/problems/two-sum")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Two Sum")
+        self.assertEqual(self.client.get("/api/blind75/problems/two-sum", headers={"If-None-Match": response.headers["etag"]}).status_code, 304)
+        self.assertEqual(self.client.get("/api/blind75/problems/unknown").status_code, 404)
+
+        random_problem = self.client.get("/api/blind75/random", params={"difficulty": "medium"})
+        self.assertEqual(random_problem.json()["title"], "Group Anagrams")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.core.database import Base
+from app.crud.question_pool import add_pool_questions, pool_size, refill_question_pool, take_unseen_questions
+from app.crud.user import delete_user
+from app.models.seen_question import SeenQuestion
+from app.models.user import User
+
+def make_questions(*titles, category="arrays"):
+    return [{
+        "id": "1", "title": title, "description": f"Solve {title}", "difficulty": "medium",
+        "category": category, "hints": [], "expected_approach": "", "time_complexity": "O(n)",
+        "space_complexity": "O(1)"
+    } for title in titles]
+
+class TestQuestionPool(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for user_id in (1, 2):
+            self.db.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com", login_method="email"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_users_are_not_served_the_same_question_twice(self):
+        add_pool_questions(self.db, "Google", "medium", make_questions("A", "B", "C"))
+
+        first = take_unseen_questions(self.db, 1, "google ", "medium", 2)
+        second = take_unseen_questions(self.db, 1, "Google", "medium", 2)
+        other_user = take_unseen_questions(self.db, 2, "Google", "medium", 3)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual({q["title"] for q in first + second}, {"A", "B", "C"})
+        self.assertEqual(len(other_user), 3)
+
+    def test_buckets_are_separated_and_titles_deduplicated(self):
+        add_pool_questions(self.db, "Google", "medium", make_questions("A", "B"))
+        add_pool_questions(self.db, "Google", "medium", make_questions("a", "D", category="graphs"))
+        add_pool_questions(self.db, "Meta", "medium", make_questions("A"))
+
+        self.assertEqual(pool_size(self.db, "Google", "medium"), 3)
+        self.assertEqual(pool_size(self.db, "Google", "medium", "graphs"), 1)
+        self.assertEqual(pool_size(self.db, "Google", "hard"), 0)
+        self.assertEqual([q["title"] for q in take_unseen_questions(self.db, 1, "Google", "medium", 5, "graphs")], ["D"])
+
+    def test_refill_tops_up_to_watermark(self):
+        batches = iter([make_questions("A", "B"), make_questions("B", "C", "D"), make_questions("E")])
+
+        async def generate(company, difficulty, num_questions, category=None):
+            return next(batches)
+
+        with patch.object(settings, "QUESTION_POOL_WATERMARK", 4), \
+             patch('app.crud.question_pool.request_leetcode_questions', side_effect=generate) as mock_generate:
+            added = asyncio.run(refill_question_pool(self.db, "Google", "medium"))
+
+        self.assertEqual(added, 4)
+        self.assertEqual(pool_size(self.db, "Google", "medium"), 4)
+        self.assertEqual(mock_generate.await_count, 2)
+
+    def test_deleting_a_user_removes_their_seen_questions(self):
+        add_pool_questions(self.db, "Google", "medium", make_questions("A", "B"))
+        take_unseen_questions(self.db, 1, "Google", "medium", 2)
+        take_unseen_questions(self.db, 2, "Google", "medium", 1)
+
+        with patch('app.crud.user.auth'):
+            self.assertTrue(delete_user(self.db, 1, "firebase-1"))
+
+        self.assertEqual([row.user_id for row in self.db.query(SeenQuestion)], [2])
+        self.assertEqual(pool_size(self.db, "Google", "medium"), 2)
+
+if __name__ == "__main__":
+    unittest.main()
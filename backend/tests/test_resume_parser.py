@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+from fastapi import HTTPException
+from app.api.resume import structured_feedback_resume
+from app.utils.resume_parser import parse_feedback_response
+
+FEEDBACK = """Here's a detailed analysis of your resume:
+
+Original: Detailed analysis of the experience section
+Grade: 5/10
+Feedback: Intro text the model sometimes emits.
+- Option 1: This block is skipped because it is intro text
+- Option 2: This block is skipped because it is intro text
+
+Original: • Built a web app using React
+Grade: 6/10
+Feedback: Lacks impact metrics.
+Also vague about scope.
+- Option 1: Built a React web app serving 5,000 monthly users
+with 99.9% uptime
+- Option 2: Developed a React dashboard that cut report time by 40%
+
+Original: - Led a team
+Grade: 4/10
+Feedback: Too short.
+- Option 1: Led a team of 5 engineers to deliver a payments API
+- Option 2: Led a team etc.
+
+Original: Wrote tests
+Grade: 7/10
+Feedback: Good.
+"""
+
+class TestParseFeedbackResponse(unittest.TestCase):
+    def test_complete_blocks_become_items(self):
+        items = parse_feedback_response(FEEDBACK)
+
+        self.assertEqual(items, [{
+            "original": "Built a web app using React",
+            "grade": "6/10",
+            "feedback": "Lacks impact metrics.\nAlso vague about scope.",
+            "options": [
+                "Built a React web app serving 5,000 monthly users\nwith 99.9% uptime",
+                "Developed a React dashboard that cut report time by 40%",
+            ],
+        }])
+
+    def test_crlf_and_empty_input(self):
+        self.assertEqual(parse_feedback_response(""), [])
+        self.assertEqual(parse_feedback_response(None), [])
+        self.assertEqual(len(parse_feedback_response(FEEDBACK.replace("\n", "\r\n"))), 1)
+
+    def test_adversarial_input_parses_in_linear_time(self):
+        # Blocks whose feedback never reaches an option made the old DOTALL pattern quadratic
+        text = "Original: Led a team\nGrade: 4/10\nFeedback: Too vague\n" * 20000
+
+        started = time.perf_counter()
+        self.assertEqual(parse_feedback_response(text), [])
+        self.assertLess(time.perf_counter() - started, 2)
+
+class TestStructuredFeedback(unittest.TestCase):
+    ITEM = {
+        "original": "Built a web app using React",
+        "grade": "6/10",
+        "feedback": "Lacks impact metrics.",
+        "options": [
+            "Built a React web app serving 5,000 monthly users",
+            "Developed a React dashboard that cut report time by 40%",
+        ],
+    }
+
+    def test_json_mode_response_is_validated_against_the_schema(self):
+        response = json.dumps({"feedback": "Solid, but add metrics.", "structured_feedback": [self.ITEM]})
+
+        with patch('app.api.resume.generate_text', return_value=response) as mock_generate:
+            result = asyncio.run(structured_feedback_resume("resume text"))
+
+        self.assertEqual(result.feedback, "Solid, but add metrics.")
+        self.assertEqual(result.structured_feedback[0].dict(), self.ITEM)
+        config = mock_generate.call_args.kwargs
+        self.assertEqual(config["response_mime_type"], "application/json")
+        options = config["response_json_schema"]["$defs"]["ResumeFeedbackItem"]["properties"]["options"]
+        self.assertEqual((options["minItems"], options["maxItems"]), (2, 2))
+
+    def test_empty_summary_is_filled_from_the_items(self):
+        response = json.dumps({"feedback": "", "structured_feedback": [self.ITEM]})
+
+        with patch('app.api.resume.generate_text', return_value=response):
+            result = asyncio.run(structured_feedback_resume("resume text"))
+
+        self.assertEqual(parse_feedback_response(result.feedback), [self.ITEM])
+
+    def test_invalid_output_is_an_error(self):
+        incomplete = json.dumps({"feedback": "x", "structured_feedback": [{**self.ITEM, "options": ["only one"]}]})
+
+        for response in (incomplete, '{"feedback": "truncated'):
+            with patch('app.api.resume.generate_text', return_value=response):
+                with self.assertRaises(HTTPException) as raised:
+                    asyncio.run(structured_feedback_resume("resume text"))
+            self.assertEqual(raised.exception.status_code, 500)
+
+if __name__ == '__main__':
+    unittest.main()
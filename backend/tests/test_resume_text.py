@@ -0,0 +1,184 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from fpdf import FPDF
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api import resume as resume_api
+from app.crud import resume as resume_crud
+from app.core.body_limit import BodyLimitMiddleware
+from app.core.config import settings
+from app.core.database import Base
+from app.models.resume import Resume
+from app.models.user import User
+
+def make_pdf(text):
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Times", size=10)
+    pdf.cell(0, 10, text)
+    return pdf.output(dest="S").encode("latin-1")
+
+class TestResumeTextCache(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add(User(id=1, username="resume", email="resume@example.com", login_method="email"))
+        self.db.commit()
+        self.pdf = make_pdf("Jane Doe Software Engineer")
+
+    def tearDown(self):
+        self.db.close()
+
+    def _upload(self, file_data):
+        file = UploadFile(file=io.BytesIO(file_data), filename="resume.pdf")
+        return asyncio.run(resume_api.upload_and_parse_resume(user_id=1, file=file, db=self.db))
+
+    def test_upload_stores_text_and_hash(self):
+        with patch('app.api.resume.call_gemini_api', return_value='{"name": "Jane Doe"}') as mock_gemini:
+            db_obj = self._upload(self.pdf)
+            self._upload(self.pdf)
+
+        self.assertIn("Jane Doe", db_obj.extracted_text)
+        self.assertEqual(db_obj.content_hash, resume_api.hash_resume_file(self.pdf))
+        self.assertEqual(mock_gemini.await_count, 1)
+
+    def test_requests_read_stored_text_without_parsing(self):
+        with patch('app.api.resume.call_gemini_api', return_value='{"name": "Jane Doe"}'):
+            db_obj = self._upload(self.pdf)
+
+        with patch('app.api.resume.PdfReader') as mock_reader:
+            text = asyncio.run(resume_api.get_resume_text(self.db, db_obj))
+        self.assertIn("Jane Doe", text)
+        mock_reader.assert_not_called()
+
+    def test_legacy_resume_is_extracted_once(self):
+        db_obj = Resume(user_id=1, file_name="resume.pdf", file_data=self.pdf, parsed_data={})
+        self.db.add(db_obj)
+        self.db.commit()
+
+        self.assertIn("Jane Doe", asyncio.run(resume_api.get_resume_text(self.db, db_obj)))
+        self.db.expire_all()
+        stored = self.db.get(Resume, db_obj.id)
+        self.assertEqual(stored.content_hash, resume_api.hash_resume_file(self.pdf))
+        self.assertIn("Jane Doe", stored.extracted_text)
+
+    def test_rejects_non_pdf_uploads(self):
+        with patch('app.api.resume.call_gemini_api') as mock_gemini:
+            with self.assertRaises(HTTPException) as ctx:
+                self._upload(b"MZ\x90\x00 not a pdf")
+        self.assertEqual(ctx.exception.status_code, 415)
+        mock_gemini.assert_not_called()
+
+    def test_rejects_uploads_over_size_cap(self):
+        with patch.object(resume_api.settings, "RESUME_MAX_UPLOAD_BYTES", 1024), \
+             patch('app.api.resume.call_gemini_api') as mock_gemini:
+            with self.assertRaises(HTTPException) as ctx:
+                self._upload(self.pdf + b"\0" * 200 * 1024)
+        self.assertEqual(ctx.exception.status_code, 413)
+        mock_gemini.assert_not_called()
+
+    def test_extraction_stops_at_page_limit(self):
+        pdf = FPDF()
+        pdf.set_font("Times", size=10)
+        for number in range(3):
+            pdf.add_page()
+            pdf.cell(0, 10, f"Page {number}")
+        text = resume_api.extract_text_from_pdf_bytes(pdf.output(dest="S").encode("latin-1"), max_pages=2)
+        self.assertIn("Page 1", text)
+        self.assertNotIn("Page 2", text)
+
+class TestBodyLimit(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(BodyLimitMiddleware, max_bytes=1024 * 1024)
+        self.read = []
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            self.read.append(file.filename)
+            return {"size": len(await file.read())}
+
+        self.client = TestClient(app)
+
+    def test_declared_length_over_the_limit_is_rejected_unread(self):
+        response = self.client.post("/upload", files={"file": ("big.pdf", b"%PDF-" + b"\0" * 2 * 1024 * 1024)})
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.read, [])
+
+    def test_chunked_body_is_cut_off_at_the_limit(self):
+        def chunks():
+            # A multipart upload sent without Content-Length
+            yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="big.pdf"\r\n\r\n%PDF-'
+            for _ in range(64):
+                yield b"\0" * 64 * 1024
+            yield b"\r\n--b--\r\n"
+
+        response = self.client.post("/upload", content=chunks(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(self.read, [])
+
+    def test_bodies_under_the_limit_pass(self):
+        response = self.client.post("/upload", files={"file": ("small.pdf", b"%PDF-1.4")})
+
+        self.assertEqual(response.json(), {"size": 8})
+
+class TestResumeBlobStore(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.db.add(User(id=1, username="resume", email="resume@example.com", login_method="email"))
+        self.db.commit()
+        blob_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(blob_dir.cleanup)
+        self.blob_dir = blob_dir.name
+        for name, value in [("RESUME_BLOB_BACKEND", "local"), ("RESUME_BLOB_DIR", self.blob_dir)]:
+            patcher = patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.db.close()
+
+    def _blob_files(self):
+        return [name for _, _, files in os.walk(self.blob_dir) for name in files]
+
+    def test_local_backend_keeps_bytes_out_of_the_row(self):
+        pdf = make_pdf("Local blob")
+        db_obj = resume_crud.upsert_resume(self.db, 1, "resume.pdf", pdf, {"name": "Local"})
+
+        self.assertEqual(db_obj.storage_backend, "local")
+        self.assertEqual(db_obj.file_size, len(pdf))
+        self.assertIsNone(db_obj.file_data)
+        self.assertEqual(resume_crud.load_resume_file(db_obj), pdf)
+
+    def test_metadata_reads_do_not_load_file_data(self):
+        with patch.object(settings, "RESUME_BLOB_BACKEND", "database"):
+            resume_crud.upsert_resume(self.db, 1, "resume.pdf", make_pdf("Row blob"), {"name": "Row"})
+        self.db.expunge_all()
+
+        db_obj = resume_crud.get_resume(self.db, 1)
+        self.assertEqual(db_obj.parsed_data, {"name": "Row"})
+        self.assertNotIn("file_data", db_obj.__dict__)
+        self.assertTrue(resume_crud.load_resume_file(db_obj).startswith(b"%PDF-"))
+
+    def test_replaced_and_deleted_blobs_are_removed(self):
+        resume_crud.upsert_resume(self.db, 1, "resume.pdf", make_pdf("First"), {})
+        resume_crud.upsert_resume(self.db, 1, "resume.pdf", make_pdf("Second"), {})
+        self.assertEqual(len(self._blob_files()), 1)
+
+        resume_crud.delete_resume(self.db, 1)
+        self.assertEqual(self._blob_files(), [])
+
+if __name__ == "__main__":
+    unittest.main()
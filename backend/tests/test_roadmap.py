@@ -1,9 +1,18 @@
+import asyncio
 import unittest
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.crud.roadmap import get_or_generate_roadmap, questionnaire_fingerprint
 from app.main import app
+from app.models.questionnaire import Questionnaire
 from app.models.roadmap import Roadmap
+from app.models.roadmap_cache_entry import RoadmapCacheEntry
+from app.models.user import User
 from app.schemas.roadmap import RoadmapResponse, RoadmapError
 
 class TestRoadmapAPI(unittest.TestCase):
@@ -60,5 +69,66 @@ class TestRoadmapAPI(unittest.TestCase):
         # Skip this test as it requires complex SQLAlchemy mocking
         self.skipTest("Skipping complex SQLAlchemy mocking test")
 
+def make_questionnaire(user_id, **overrides):
+    fields = dict(
+        career_goal="Software Engineer", major="Computer Science", education_level="Bachelor's",
+        interests="AI, Web", institution="State University", target_companies="Google, Meta",
+        skills="Python", timeline="6 months", learning_preference="Videos", available_hours_per_week="10"
+    )
+    return Questionnaire(user_id=user_id, **{**fields, **overrides})
+
+class TestRoadmapMemoization(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for user_id in (1, 2, 3):
+            self.db.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com", login_method="email"))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def generate(self, questionnaire, force=False):
+        with patch('app.crud.roadmap.genai_get_roadmap', return_value={"roadmap": {"phases": []}}) as mock_generate:
+            db_obj = asyncio.run(get_or_generate_roadmap(self.db, questionnaire, force=force))
+        return db_obj, mock_generate.call_count
+
+    def test_fingerprint_ignores_formatting_and_list_order(self):
+        base = questionnaire_fingerprint(make_questionnaire(1))
+
+        self.assertEqual(questionnaire_fingerprint(make_questionnaire(2, interests="web ,  AI", career_goal=" software  engineer")), base)
+        self.assertNotEqual(questionnaire_fingerprint(make_questionnaire(1, timeline="3 months")), base)
+
+    def test_unchanged_questionnaire_reuses_the_stored_roadmap(self):
+        questionnaire = make_questionnaire(1)
+
+        _, first_calls = self.generate(questionnaire)
+        _, repeat_calls = self.generate(questionnaire)
+        _, forced_calls = self.generate(questionnaire, force=True)
+        questionnaire.timeline = "3 months"
+        _, changed_calls = self.generate(questionnaire)
+
+        self.assertEqual((first_calls, repeat_calls, forced_calls, changed_calls), (1, 0, 1, 1))
+
+    def test_identical_profiles_share_a_roadmap_across_users(self):
+        self.generate(make_questionnaire(1))
+
+        db_obj, calls = self.generate(make_questionnaire(2, skills="python"))
+
+        self.assertEqual(calls, 0)
+        self.assertEqual(db_obj.user_id, 2)
+        self.assertEqual(db_obj.roadmap_json, {"roadmap": {"phases": []}})
+
+    def test_expired_shared_roadmaps_are_regenerated(self):
+        self.generate(make_questionnaire(1))
+        entry = self.db.query(RoadmapCacheEntry).one()
+        entry.created_at = datetime.now(timezone.utc) - timedelta(days=30)
+        self.db.commit()
+
+        _, calls = self.generate(make_questionnaire(3))
+
+        self.assertEqual(calls, 1)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
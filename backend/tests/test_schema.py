@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, LargeBinary, MetaData, String, Table, create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.core.schema import ADDED_COLUMNS, upgrade_schema
+from app.crud.resume import get_resume
+from app.crud.roadmap import get_roadmap
+from app.models.resume import Resume
+from app.models.user import User
+
+def legacy_tables(metadata):
+    """The tables as the first release created them, before columns were added."""
+    Table(
+        "resume", metadata,
+        Column("id", String, primary_key=True, index=True),
+        Column("user_id", Integer, ForeignKey("user.id"), nullable=False, unique=True),
+        Column("file_name", String, nullable=False),
+        Column("file_data", LargeBinary, nullable=False),
+        Column("parsed_data", JSON, nullable=False),
+        Column("uploaded_at", DateTime),
+    )
+    Table(
+        "roadmap", metadata,
+        Column("id", String, primary_key=True, index=True),
+        Column("user_id", Integer, ForeignKey("user.id"), unique=True, nullable=False),
+        Column("roadmap_json", JSON, nullable=False),
+        Column("created_at", DateTime(timezone=True)),
+        Column("updated_at", DateTime(timezone=True)),
+    )
+
+class TestUpgradeSchema(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.engine = create_engine(f"sqlite:///{os.path.join(tmp.name, 'legacy.db')}")
+        self.addCleanup(self.engine.dispose)
+        legacy = MetaData()
+        User.__table__.to_metadata(legacy)
+        legacy_tables(legacy)
+        legacy.create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(legacy.tables["user"].insert(), {"id": 1, "username": "old", "email": "old@example.com", "login_method": "email"})
+            conn.execute(legacy.tables["resume"].insert(), {
+                "id": "r1", "user_id": 1, "file_name": "resume.pdf", "file_data": b"%PDF-old",
+                "parsed_data": {"name": "Old"}, "uploaded_at": datetime(2024, 1, 1)
+            })
+            conn.execute(legacy.tables["roadmap"].insert(), {"id": "m1", "user_id": 1, "roadmap_json": {"title": "Old"}})
+
+    def _upgrade(self):
+        upgrade_schema(self.engine)
+        Base.metadata.create_all(bind=self.engine)
+        db = sessionmaker(bind=self.engine)()
+        self.addCleanup(db.close)
+        return db
+
+    def _columns(self, table_name):
+        return [column["name"] for column in inspect(self.engine).get_columns(table_name)]
+
+    def test_legacy_resumes_survive_the_upgrade(self):
+        db = self._upgrade()
+
+        resume = get_resume(db, 1)
+        self.assertEqual((resume.file_name, resume.file_data, resume.parsed_data), ("resume.pdf", b"%PDF-old", {"name": "Old"}))
+        self.assertIsNone(resume.storage_backend)
+        self.assertTrue(self._columns_info("resume")["file_data"]["nullable"])
+        self.assertEqual({index["name"] for index in inspect(self.engine).get_indexes("resume")}, {"ix_resume_id"})
+
+        # Blob-store uploads leave file_data empty
+        db.add(User(id=2, username="new", email="new@example.com", login_method="email"))
+        db.add(Resume(user_id=2, file_name="new.pdf", file_data=None, parsed_data={}, storage_backend="local", content_hash="h"))
+        db.commit()
+
+    def test_legacy_roadmaps_survive_the_upgrade(self):
+        db = self._upgrade()
+
+        roadmap = get_roadmap(db, 1)
+        self.assertEqual(roadmap.roadmap_json, {"title": "Old"})
+        self.assertIsNone(roadmap.questionnaire_fingerprint)
+
+    def _columns_info(self, table_name):
+        return {column["name"]: column for column in inspect(self.engine).get_columns(table_name)}
+
+    def test_added_columns_are_created_once(self):
+        self._upgrade()
+        upgrade_schema(self.engine)
+
+        columns = self._columns("resume")
+        self.assertEqual(len(columns), len(set(columns)))
+        for table_name, column_names in ADDED_COLUMNS.items():
+            self.assertTrue(set(column_names) <= set(self._columns(table_name)), table_name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import unittest
+from unittest.mock import ANY, Mock, patch
+from fastapi.testclient import TestClient
+from app.crud.roadmap import questionnaire_fingerprint
+from app.main import app
+from app.models.questionnaire import Questionnaire
+
+async def deltas(*texts):
+    for text in texts:
+        yield text
+
+def read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+class TestStreamingEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_behavioral_feedback_streams_tokens_then_result(self):
+        feedback = '{"overall_assessment": "Good"}'
+        request_data = {
+            "target_role": "SWE", "seniority": "Junior", "company": "Google",
+            "question": "Tell me about a conflict", "answer": "I listened", "difficulty": "easy"
+        }
+        with patch('app.api.behavioral_prep.stream_behavioral_feedback', return_value=deltas(feedback[:10], feedback[10:])):
+            response = self.client.post("/api/behavioral-prep/feedback/stream", json=request_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = read_events(response)
+        self.assertEqual([event for event, _ in events], ["token", "token", "done"])
+        self.assertEqual(events[-1][1], {"feedback": feedback})
+
+    def test_roadmap_is_persisted_only_after_valid_output(self):
+        questionnaire = Questionnaire(user_id=1, career_goal="SWE", major="CS", timeline="6 months")
+        fingerprint = questionnaire_fingerprint(questionnaire)
+        with patch('app.api.roadmap.get_questionnaire', return_value=questionnaire), \
+             patch('app.api.roadmap.find_memoized_roadmap', return_value=None), \
+             patch('app.api.roadmap.stream_roadmap', return_value=deltas("not ", "json")), \
+             patch('app.api.roadmap.store_roadmap') as mock_store:
+            response = self.client.post("/api/roadmap/1/stream")
+
+        events = read_events(response)
+        self.assertEqual(events[-1][0], "error")
+        mock_store.assert_not_called()
+
+        with patch('app.api.roadmap.get_questionnaire', return_value=questionnaire), \
+             patch('app.api.roadmap.find_memoized_roadmap', return_value=None), \
+             patch('app.api.roadmap.stream_roadmap', return_value=deltas('{"phases": ', '[]}')), \
+             patch('app.api.roadmap.store_roadmap', return_value=Mock(roadmap_json={"roadmap": {"phases": []}})) as mock_store:
+            response = self.client.post("/api/roadmap/1/stream")
+
+        self.assertEqual(read_events(response)[-1], ("done", {"roadmap_json": {"roadmap": {"phases": []}}}))
+        mock_store.assert_called_once_with(ANY, 1, {"roadmap": {"phases": []}}, fingerprint)
+
+    def test_memoized_roadmap_streams_only_the_result(self):
+        questionnaire = Questionnaire(user_id=1, career_goal="SWE", major="CS", timeline="6 months")
+        with patch('app.api.roadmap.get_questionnaire', return_value=questionnaire), \
+             patch('app.api.roadmap.find_memoized_roadmap', return_value=Mock(roadmap_json={"roadmap": {}})), \
+             patch('app.api.roadmap.stream_roadmap') as mock_stream:
+            response = self.client.post("/api/roadmap/1/stream")
+
+        self.assertEqual(read_events(response), [("done", {"roadmap_json": {"roadmap": {}}})])
+        mock_stream.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.crud.video_catalog import add_to_catalog, search_catalog
+from app.crud.videos import get_videos_by_query
+from app.models.video_catalog_entry import VideoCatalogEntry
+
+def make_video(video_id, title, description=""):
+    return {
+        "title": title, "video_id": video_id, "url": f"https://www.youtube.com/watch?v={video_id}",
+        "description": description, "thumbnail": f"https://i.ytimg.com/vi/{video_id}/default.jpg"
+    }
+
+class TestVideoCatalog(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_full_text_search_with_provenance(self):
+        add_to_catalog(self.db, "System Design  Interview", "medium", "en", [
+            make_video("a", "System Design Interviews Explained", "Scaling, caching and load balancers"),
+            make_video("b", "Load balancing basics"),
+        ])
+        add_to_catalog(self.db, "load balancer", "any", "en", [make_video("b", "Load balancing basics")])
+
+        self.assertEqual([v["video_id"] for v in search_catalog(self.db, "system design interview", limit=5)], ["a"])
+        self.assertEqual({v["video_id"] for v in search_catalog(self.db, "load balancer", limit=5)}, {"a", "b"})
+        self.assertEqual({v["video_id"] for v in search_catalog(self.db, "load balancer", "medium", limit=5)}, {"a", "b"})
+        self.assertEqual(search_catalog(self.db, "load balancer", "long", limit=5), [])
+        self.assertEqual(search_catalog(self.db, "load balancer", language="es", limit=5), [])
+        self.assertEqual(search_catalog(self.db, '"OR ( *', limit=5), [])
+        self.assertEqual(self.db.get(VideoCatalogEntry, "b").queries, ["system design interview", "load balancer"])
+
+    def test_changed_titles_are_reindexed_and_old_entries_expire(self):
+        add_to_catalog(self.db, "docker", "any", "en", [make_video("a", "Docker in 100 seconds")])
+        add_to_catalog(self.db, "kubernetes", "any", "en", [make_video("a", "Kubernetes in 100 seconds")])
+
+        self.assertEqual(search_catalog(self.db, "docker"), [])
+        self.assertEqual(len(search_catalog(self.db, "kubernetes")), 1)
+
+        self.db.get(VideoCatalogEntry, "a").last_seen_at = datetime.now(timezone.utc) - timedelta(days=365)
+        self.db.commit()
+        self.assertEqual(search_catalog(self.db, "kubernetes"), [])
+
+    def test_queries_fall_back_to_youtube_only_on_a_miss(self):
+        results = [make_video("a", "Python tutorial for beginners"), make_video("b", "Python tutorial: lists")]
+
+        with patch('app.crud.videos.get_videos', return_value=results) as mock_get_videos:
+            first = get_videos_by_query(self.db, "python tutorial", "any", "en", 2)
+            repeated = get_videos_by_query(self.db, "Python Tutorials", "any", "en", 2)
+            self.assertEqual(mock_get_videos.call_count, 1)
+
+            get_videos_by_query(self.db, "python tutorial", "any", "en", 3)
+            self.assertEqual(mock_get_videos.call_count, 2)
+
+            mock_get_videos.return_value = []
+            partial = get_videos_by_query(self.db, "python lists", "any", "en", 3)
+
+        self.assertEqual(first, results)
+        self.assertEqual({v["video_id"] for v in repeated}, {"a", "b"})
+        self.assertEqual([v["video_id"] for v in partial], ["b"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,22 @@
+import asyncio
+import threading
+import time
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.crud.roadmap import get_search_terms, upsert_roadmap
+from app.crud.videos import get_roadmap_videos
 from app.main import app
+from app.models.roadmap import Roadmap
 from app.schemas.videos import VideoResponse, RoadmapVideoResponse
 
+def make_video(video_id, title):
+    return {"title": title, "video_id": video_id, "url": f"https://www.youtube.com/watch?v={video_id}", "description": "", "thumbnail": None}
+
 class TestVideosAPI(unittest.TestCase):
     def setUp(self):
         self.client = TestClient(app)
@@ -35,7 +48,7 @@ class TestVideosAPI(unittest.TestCase):
             data = response.json()
             self.assertEqual(len(data["videos"]), 2)
             self.assertEqual(data["videos"][0]["title"], "Python Tutorial for Beginners")
-            mock_get_videos.assert_called_once_with("python tutorial", "medium", "en", 2)
+            mock_get_videos.assert_called_once_with(ANY, "python tutorial", "medium", "en", 2)
     
     def test_get_videos_invalid_duration(self):
         """Test video search with invalid duration parameter"""
@@ -65,6 +78,7 @@ class TestVideosAPI(unittest.TestCase):
                 data = response.json()
                 self.assertEqual(len(data["videos"]), 1)
                 mock_get_videos.assert_called_with(
+                    ANY,
                     test_case["query"],
                     test_case["duration"],
                     test_case["language"],
@@ -86,7 +100,7 @@ class TestVideosAPI(unittest.TestCase):
             mock_search_terms = ["python", "data science", "machine learning"]
             mock_selected_term = "python"
             
-            mock_get_roadmap_videos.return_value = (mock_videos, mock_search_terms, mock_selected_term, None)
+            mock_get_roadmap_videos.return_value = (mock_videos, mock_search_terms, mock_selected_term, [], None)
             
             response = self.client.get("/api/videos/roadmap/1")
             
@@ -100,21 +114,21 @@ class TestVideosAPI(unittest.TestCase):
                 self.assertIsNone(data["message"])
             mock_get_roadmap_videos.assert_called_once()
     
-    def test_get_roadmap_videos_questionnaire_not_found(self):
-        """Test roadmap video retrieval when questionnaire doesn't exist"""
+    def test_get_roadmap_videos_roadmap_not_found(self):
+        """Test roadmap video retrieval when the user has no roadmap"""
         with patch('app.api.videos.get_roadmap_videos') as mock_get_roadmap_videos:
-            mock_get_roadmap_videos.return_value = ([], [], "", "Questionnaire not found")
+            mock_get_roadmap_videos.return_value = (None, None, None, None, "Roadmap not found")
             
             response = self.client.get("/api/videos/roadmap/999")
             
             self.assertEqual(response.status_code, 404)
             data = response.json()
-            self.assertEqual(data["detail"], "Questionnaire not found")
+            self.assertEqual(data["detail"], "Roadmap not found")
     
     def test_get_roadmap_videos_with_error_message(self):
         """Test roadmap video retrieval with error message"""
         with patch('app.api.videos.get_roadmap_videos') as mock_get_roadmap_videos:
-            mock_get_roadmap_videos.return_value = ([], [], "", "Failed to generate search terms")
+            mock_get_roadmap_videos.return_value = ([], [], "", [], "Failed to generate search terms")
             
             response = self.client.get("/api/videos/roadmap/1")
             
@@ -154,7 +168,7 @@ class TestVideosAPI(unittest.TestCase):
             mock_search_terms = ["python", "data structures", "algorithms"]
             mock_selected_term = "data structures"
             
-            mock_get_roadmap_videos.return_value = (mock_videos, mock_search_terms, mock_selected_term, None)
+            mock_get_roadmap_videos.return_value = (mock_videos, mock_search_terms, mock_selected_term, [], None)
             
             response = self.client.get("/api/videos/roadmap/1")
             
@@ -185,5 +199,85 @@ class TestVideosAPI(unittest.TestCase):
             response = self.client.get("/api/videos?query=&num_videos=1")
             self.assertEqual(response.status_code, 200)
 
+class TestRoadmapSearchTermIndex(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_terms_are_indexed_when_the_roadmap_is_stored(self):
+        roadmap_json = {"roadmap": {
+            "roadmap": [{"phase": "Foundations", "youtube_search_terms": ["Python basics", "python  BASICS"]}],
+            "youtube_search_terms": ["Docker tutorial"],
+            "notes": "- [YouTube] System design interview",
+        }}
+        upsert_roadmap(self.db, 1, roadmap_json)
+
+        rows = get_search_terms(self.db, 1)
+        self.assertEqual(
+            [(row.phase, row.term) for row in rows],
+            [(None, "Docker tutorial"), ("Foundations", "Python basics"), (None, "System design interview")]
+        )
+
+        upsert_roadmap(self.db, 1, {"roadmap": {"youtube_search_terms": ["SQL joins"]}})
+        self.assertEqual([row.term for row in get_search_terms(self.db, 1)], ["SQL joins"])
+
+    def test_roadmap_videos_read_the_index_without_the_llm(self):
+        upsert_roadmap(self.db, 1, {"roadmap": {
+            "youtube_search_terms": ["Docker tutorial"],
+            "roadmap": [{"phase": "Data", "youtube_search_terms": ["SQL joins", "SQL indexes"]}],
+        }})
+        found = {
+            "Docker tutorial": [make_video("a", "Docker")],
+            "SQL joins": [make_video("b", "Joins"), make_video("a", "Docker")],
+            "SQL indexes": [],
+        }
+
+        with patch('app.crud.roadmap.genai_get_roadmap') as mock_llm, \
+             patch('app.crud.videos.get_videos', side_effect=lambda term, *args: found[term]) as mock_get_videos:
+            videos, search_terms, selected_term, phases, message = asyncio.run(get_roadmap_videos(self.db, 1))
+
+        self.assertIsNone(message)
+        self.assertEqual((search_terms, selected_term), (["Docker tutorial", "SQL joins", "SQL indexes"], "Docker tutorial"))
+        self.assertEqual([(video["video_id"], video["search_terms"]) for video in videos],
+                         [("a", ["Docker tutorial", "SQL joins"]), ("b", ["SQL joins"])])
+        self.assertEqual([(phase["phase"], phase["search_terms"], [v["video_id"] for v in phase["videos"]]) for phase in phases],
+                         [(None, ["Docker tutorial"], ["a"]), ("Data", ["SQL joins", "SQL indexes"], ["b"])])
+        self.assertEqual(mock_get_videos.call_count, 3)
+        mock_llm.assert_not_called()
+
+    def test_searches_run_concurrently_up_to_the_limit(self):
+        upsert_roadmap(self.db, 1, {"roadmap": {"youtube_search_terms": [f"term {i}" for i in range(6)]}})
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def slow_search(term, *args):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return [make_video(term, term)]
+
+        with patch('app.crud.videos.settings.VIDEO_SEARCH_CONCURRENCY', 3), \
+             patch('app.crud.videos.get_videos', side_effect=slow_search):
+            videos = asyncio.run(get_roadmap_videos(self.db, 1))[0]
+
+        self.assertEqual(len(videos), 6)
+        self.assertEqual(state["peak"], 3)
+
+    def test_roadmaps_stored_before_the_index_are_backfilled(self):
+        self.db.add(Roadmap(user_id=2, roadmap_json={"roadmap": {"youtube_search_terms": ["Git branching"]}}))
+        self.db.commit()
+
+        with patch('app.crud.videos.get_videos', return_value=[]):
+            self.assertEqual(asyncio.run(get_roadmap_videos(self.db, 2))[1], ["Git branching"])
+            self.assertEqual(asyncio.run(get_roadmap_videos(self.db, 3))[4], "Roadmap not found")
+        self.assertEqual([row.term for row in get_search_terms(self.db, 2)], ["Git branching"])
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
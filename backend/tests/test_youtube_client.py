@@ -0,0 +1,100 @@
+import json
+import threading
+import unittest
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from app.core.youtube import QuotaBudget, YouTubeClient
+
+class StubYouTube(BaseHTTPRequestHandler):
+    requests_seen = []
+    status = 200
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        StubYouTube.requests_seen.append((url.path, params))
+        if StubYouTube.status == 200:
+            body = {"items": [{
+                "id": {"videoId": f"vid{len(StubYouTube.requests_seen)}"},
+                "snippet": {"title": params["q"], "description": "", "thumbnails": {"default": {"url": "thumb"}}}
+            }]}
+        else:
+            body = {"error": {"errors": [{"reason": "quotaExceeded"}]}}
+        payload = json.dumps(body).encode()
+        self.send_response(StubYouTube.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+class TestYouTubeClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubYouTube)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/youtube/v3"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubYouTube.requests_seen = []
+        StubYouTube.status = 200
+
+    def make_client(self, **options):
+        return YouTubeClient(api_key="test-key", base_url=self.base_url, **options)
+
+    def test_normalized_queries_share_a_cache_entry(self):
+        client = self.make_client(cache_ttl=60, daily_quota=1000)
+
+        first = client.search("System Design Interview", "any", "en", 5)
+        second = client.search("  system design   interview ", "ANY", "EN", 5)
+        client.search("system design interview", "any", "en", 3)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]["video_id"], "vid1")
+        self.assertEqual(len(StubYouTube.requests_seen), 2)
+        path, params = StubYouTube.requests_seen[0]
+        self.assertEqual((path, params["key"], params["maxResults"]), ("/youtube/v3/search", "test-key", "5"))
+        self.assertEqual(client.stats()["hits"], 1)
+        self.assertEqual(client.budget.remaining, 800)
+
+    def test_stale_entries_are_served_once_the_budget_is_spent(self):
+        client = self.make_client(cache_ttl=0, daily_quota=100)
+
+        fetched = client.search("docker tutorial")
+        stale = client.search("docker tutorial")
+        uncached = client.search("kubernetes tutorial")
+
+        self.assertEqual(stale, fetched)
+        self.assertEqual(uncached, [])
+        self.assertEqual(len(StubYouTube.requests_seen), 1)
+        self.assertEqual(client.stats()["stale_hits"], 1)
+
+    def test_quota_exceeded_response_exhausts_the_budget(self):
+        client = self.make_client(cache_ttl=0, daily_quota=1000)
+        fetched = client.search("sql joins")
+        StubYouTube.status = 403
+
+        self.assertEqual(client.search("sql joins"), fetched)
+        self.assertEqual(client.budget.remaining, 0)
+        client.search("sql joins")
+        self.assertEqual(len(StubYouTube.requests_seen), 2)
+
+    def test_budget_resets_each_day(self):
+        today = [date(2025, 1, 1)]
+        budget = QuotaBudget(100, clock=lambda: datetime.combine(today[0], datetime.min.time()))
+
+        self.assertTrue(budget.try_spend(100))
+        self.assertFalse(budget.try_spend(100))
+        today[0] = date(2025, 1, 2)
+        self.assertTrue(budget.try_spend(100))
+
+if __name__ == '__main__':
+    unittest.main()